@@ -12,7 +12,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import Base
 from app.config import settings
-from app.models import Project, Document, Config, Chunk, Query, Experiment, Result
+from app.models import (
+    Project, Document, Config, Chunk, Query, Experiment, Result, Settings, ExperimentWorkItem,
+    EmbeddingCacheEntry,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
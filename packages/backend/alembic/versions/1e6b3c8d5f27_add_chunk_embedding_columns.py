@@ -0,0 +1,73 @@
+"""add_chunk_embedding_columns
+
+Revision ID: 1e6b3c8d5f27
+Revises: 9b2d4f6a8c13
+Create Date: 2025-10-08 14:03:51.772604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6b3c8d5f27'
+down_revision: Union[str, None] = '9b2d4f6a8c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Promote embedding_dim / embedding_model from chunk_metadata to columns.
+
+    Changes:
+    - Add chunks.embedding_model and chunks.embedding_dim, backfilled from existing rows
+    - Add composite index on (config_id, embedding_dim)
+    - Rebuild the per-dimension HNSW indexes with an embedding_dim predicate
+    """
+    op.add_column('chunks', sa.Column('embedding_model', sa.String(length=100), nullable=True))
+    op.add_column('chunks', sa.Column('embedding_dim', sa.Integer(), nullable=True))
+
+    op.execute('''
+        UPDATE chunks
+        SET embedding_dim = vector_dims(embedding),
+            embedding_model = chunk_metadata->>'embedding_model'
+        WHERE embedding IS NOT NULL
+    ''')
+
+    op.create_index('idx_chunks_config_id_embedding_dim', 'chunks', ['config_id', 'embedding_dim'])
+
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_1536_hnsw')
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_3072_hnsw')
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_1536_hnsw ON chunks
+        USING hnsw ((embedding::vector(1536)) vector_cosine_ops)
+        WHERE embedding_dim = 1536
+    ''')
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_3072_hnsw ON chunks
+        USING hnsw ((embedding::halfvec(3072)) halfvec_cosine_ops)
+        WHERE embedding_dim = 3072
+    ''')
+
+
+def downgrade() -> None:
+    """Restore vector_dims-based HNSW indexes and drop the embedding columns."""
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_1536_hnsw')
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_3072_hnsw')
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_1536_hnsw ON chunks
+        USING hnsw ((embedding::vector(1536)) vector_cosine_ops)
+        WHERE vector_dims(embedding) = 1536
+    ''')
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_3072_hnsw ON chunks
+        USING hnsw ((embedding::halfvec(3072)) halfvec_cosine_ops)
+        WHERE vector_dims(embedding) = 3072
+    ''')
+
+    op.drop_index('idx_chunks_config_id_embedding_dim', table_name='chunks')
+    op.drop_column('chunks', 'embedding_dim')
+    op.drop_column('chunks', 'embedding_model')
@@ -0,0 +1,52 @@
+"""add_experiment_progress
+
+Revision ID: 5c7e2a9d41b3
+Revises: 2cff95d83840
+Create Date: 2025-10-06 10:12:44.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e2a9d41b3'
+down_revision: Union[str, None] = '2cff95d83840'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add progress tracking to experiments and make results unique per cell."""
+
+    # Progress counters for background experiment jobs
+    op.add_column('experiments',
+        sa.Column('progress_done', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column('experiments',
+        sa.Column('progress_total', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # Backfill finished experiments so progress reads 100%
+    op.execute("""
+        UPDATE experiments
+        SET progress_total = cardinality(config_ids) * cardinality(query_ids),
+            progress_done = (
+                SELECT count(*) FROM results WHERE results.experiment_id = experiments.id
+            )
+    """)
+
+    # One result per (experiment, config, query) cell so resumed runs can
+    # checkpoint idempotently
+    op.create_unique_constraint(
+        'uq_results_cell', 'results', ['experiment_id', 'config_id', 'query_id']
+    )
+
+
+def downgrade() -> None:
+    """Remove experiment progress tracking."""
+    op.drop_constraint('uq_results_cell', 'results', type_='unique')
+    op.drop_column('experiments', 'progress_total')
+    op.drop_column('experiments', 'progress_done')
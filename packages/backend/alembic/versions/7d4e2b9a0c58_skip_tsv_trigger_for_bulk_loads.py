@@ -0,0 +1,50 @@
+"""skip_tsv_trigger_for_bulk_loads
+
+Revision ID: 7d4e2b9a0c58
+Revises: 1e6b3c8d5f27
+Create Date: 2025-10-09 09:27:13.640158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4e2b9a0c58'
+down_revision: Union[str, None] = '1e6b3c8d5f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Let bulk loads supply content_tsv themselves.
+
+    ChunkWriter computes content_tsv set-wise in its INSERT ... SELECT, so the
+    trigger only fills it in for inserts that leave it empty (and on updates).
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION chunks_content_tsv_trigger() RETURNS trigger AS $$
+        begin
+          if tg_op = 'INSERT' and new.content_tsv is not null then
+            return new;
+          end if;
+          new.content_tsv := to_tsvector('english', coalesce(new.content, ''));
+          return new;
+        end
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    """Always compute content_tsv in the trigger."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION chunks_content_tsv_trigger() RETURNS trigger AS $$
+        begin
+          new.content_tsv := to_tsvector('english', coalesce(new.content, ''));
+          return new;
+        end
+        $$ LANGUAGE plpgsql;
+    """)
@@ -0,0 +1,65 @@
+"""add_experiment_work_items
+
+Revision ID: 8f3d61c0b7a2
+Revises: 5c7e2a9d41b3
+Create Date: 2025-10-07 09:31:05.774102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3d61c0b7a2'
+down_revision: Union[str, None] = '5c7e2a9d41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the experiment work queue table."""
+    op.create_table('experiment_work_items',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('experiment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('config_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('query_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('claimed_by', sa.String(length=255), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('experiment_id', 'config_id', 'query_id',
+                            name='uq_experiment_work_items_cell'),
+    )
+    op.create_index('idx_experiment_work_items_status', 'experiment_work_items',
+                    ['status', 'heartbeat_at'])
+
+    # Queue the missing cells of experiments that were pending or running
+    # before the upgrade so workers pick them up
+    op.execute("""
+        INSERT INTO experiment_work_items (id, experiment_id, config_id, query_id)
+        SELECT gen_random_uuid(), e.id, c.config_id, q.query_id
+        FROM experiments e
+        CROSS JOIN LATERAL unnest(e.config_ids) AS c(config_id)
+        CROSS JOIN LATERAL unnest(e.query_ids) AS q(query_id)
+        WHERE e.status IN ('pending', 'running')
+          AND NOT EXISTS (
+              SELECT 1 FROM results r
+              WHERE r.experiment_id = e.id
+                AND r.config_id = c.config_id
+                AND r.query_id = q.query_id
+          )
+    """)
+
+
+def downgrade() -> None:
+    """Remove the experiment work queue table."""
+    op.drop_index('idx_experiment_work_items_status', table_name='experiment_work_items')
+    op.drop_table('experiment_work_items')
@@ -0,0 +1,46 @@
+"""add_hnsw_indexes
+
+Revision ID: 9b2d4f6a8c13
+Revises: c4a9e7f21d06
+Create Date: 2025-10-08 10:12:44.183920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d4f6a8c13'
+down_revision: Union[str, None] = 'c4a9e7f21d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add per-dimension HNSW indexes for dense retrieval.
+
+    chunks.embedding is an untyped vector, which pgvector cannot index, so each
+    supported dimension gets a partial expression index on the typed cast.
+    pgvector indexes at most 2,000 dimensions for vector, so 3072-dim
+    embeddings are indexed as halfvec. RetrievalService.search_dense emits the
+    same expressions and predicate so the planner can use these indexes.
+    """
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_1536_hnsw ON chunks
+        USING hnsw ((embedding::vector(1536)) vector_cosine_ops)
+        WHERE vector_dims(embedding) = 1536
+    ''')
+    op.execute('''
+        CREATE INDEX idx_chunks_embedding_3072_hnsw ON chunks
+        USING hnsw ((embedding::halfvec(3072)) halfvec_cosine_ops)
+        WHERE vector_dims(embedding) = 3072
+    ''')
+
+
+def downgrade() -> None:
+    """Remove per-dimension HNSW indexes."""
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_3072_hnsw')
+    op.execute('DROP INDEX IF EXISTS idx_chunks_embedding_1536_hnsw')
@@ -0,0 +1,36 @@
+"""add_bm25_indexes
+
+Revision ID: a3c8e1d6f204
+Revises: e5a1f7c3b942
+Create Date: 2025-10-10 11:24:37.618402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e1d6f204'
+down_revision: Union[str, None] = 'e5a1f7c3b942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add persisted per-config Okapi BM25 inverted indexes."""
+    op.create_table('bm25_indexes',
+        sa.Column('config_id', sa.UUID(), nullable=False),
+        sa.Column('num_chunks', sa.Integer(), nullable=False),
+        sa.Column('num_terms', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['config_id'], ['configs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('config_id'),
+    )
+
+
+def downgrade() -> None:
+    """Remove BM25 indexes."""
+    op.drop_table('bm25_indexes')
@@ -0,0 +1,36 @@
+"""add_generation_cache
+
+Revision ID: b8e3f5a1c927
+Revises: f2b7d9e4a615
+Create Date: 2025-10-12 14:05:51.377290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f5a1c927'
+down_revision: Union[str, None] = 'f2b7d9e4a615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add deterministic answer generation cache keyed by sha256 of the request."""
+    op.create_table('generation_cache',
+        sa.Column('prompt_hash', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('answer', sa.Text(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('prompt_hash'),
+    )
+
+
+def downgrade() -> None:
+    """Remove generation cache."""
+    op.drop_table('generation_cache')
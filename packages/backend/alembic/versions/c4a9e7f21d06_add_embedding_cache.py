@@ -0,0 +1,35 @@
+"""add_embedding_cache
+
+Revision ID: c4a9e7f21d06
+Revises: 8f3d61c0b7a2
+Create Date: 2025-10-07 15:48:19.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9e7f21d06'
+down_revision: Union[str, None] = '8f3d61c0b7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add content-addressed embedding cache keyed by (model, sha256 of text)."""
+    op.create_table('embedding_cache',
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('embedding', Vector(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('model', 'text_hash'),
+    )
+
+
+def downgrade() -> None:
+    """Remove embedding cache."""
+    op.drop_table('embedding_cache')
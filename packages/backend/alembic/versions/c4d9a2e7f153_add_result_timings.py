@@ -0,0 +1,29 @@
+"""add_result_timings
+
+Revision ID: c4d9a2e7f153
+Revises: b8e3f5a1c927
+Create Date: 2025-10-13 09:42:17.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9a2e7f153'
+down_revision: Union[str, None] = 'b8e3f5a1c927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store the per-stage latency breakdown of each result."""
+    op.add_column('results', sa.Column('timings', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove per-stage latency breakdown."""
+    op.drop_column('results', 'timings')
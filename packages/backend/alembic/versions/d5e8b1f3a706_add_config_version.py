@@ -0,0 +1,28 @@
+"""add_config_version
+
+Revision ID: d5e8b1f3a706
+Revises: c4d9a2e7f153
+Create Date: 2025-10-14 10:18:32.915407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8b1f3a706'
+down_revision: Union[str, None] = 'c4d9a2e7f153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a persisted config version checked by per-process caches."""
+    op.add_column('configs', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Remove config version."""
+    op.drop_column('configs', 'version')
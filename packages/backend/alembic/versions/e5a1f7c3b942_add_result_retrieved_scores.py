@@ -0,0 +1,28 @@
+"""add_result_retrieved_scores
+
+Revision ID: e5a1f7c3b942
+Revises: 7d4e2b9a0c58
+Create Date: 2025-10-09 16:51:08.224317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1f7c3b942'
+down_revision: Union[str, None] = '7d4e2b9a0c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store per-chunk retrieval scores alongside retrieved_chunk_ids."""
+    op.add_column('results', sa.Column('retrieved_scores', sa.ARRAY(sa.Float()), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove per-chunk retrieval scores."""
+    op.drop_column('results', 'retrieved_scores')
@@ -0,0 +1,28 @@
+"""add_config_results_version
+
+Revision ID: e9c2f4a7b318
+Revises: d5e8b1f3a706
+Create Date: 2025-10-15 11:27:04.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c2f4a7b318'
+down_revision: Union[str, None] = 'd5e8b1f3a706'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a config version for changes that only affect query-time results."""
+    op.add_column('configs', sa.Column('results_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Remove config results version."""
+    op.drop_column('configs', 'results_version')
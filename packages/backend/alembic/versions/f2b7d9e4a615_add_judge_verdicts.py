@@ -0,0 +1,37 @@
+"""add_judge_verdicts
+
+Revision ID: f2b7d9e4a615
+Revises: a3c8e1d6f204
+Create Date: 2025-10-11 09:42:15.204871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d9e4a615'
+down_revision: Union[str, None] = 'a3c8e1d6f204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add LLM judge verdict cache keyed by (model, prompt version, query hash, chunk hash)."""
+    op.create_table('judge_verdicts',
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('prompt_version', sa.String(length=20), nullable=False),
+        sa.Column('query_hash', sa.String(length=64), nullable=False),
+        sa.Column('chunk_hash', sa.String(length=64), nullable=False),
+        sa.Column('verdict', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('model', 'prompt_version', 'query_hash', 'chunk_hash'),
+    )
+
+
+def downgrade() -> None:
+    """Remove judge verdict cache."""
+    op.drop_table('judge_verdicts')
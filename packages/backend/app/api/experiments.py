@@ -9,15 +9,19 @@ from app.schemas.experiment import (
     ExperimentCreate,
     ExperimentResponse,
     ExperimentResultsResponse,
+    ExperimentProgressResponse,
     CostEstimateRequest,
     CostEstimateResponse,
 )
 from app.schemas.query_time import (
     QueryTimeExperimentRequest,
     QueryTimeExperimentResponse,
+    QueryTimeSweepRequest,
+    QueryTimeSweepResponse,
 )
 from app.schemas.document_context import DocumentContextResponse
 from app.services.experiment_service import ExperimentService
+from app.services.experiment_runner import experiment_runner
 from app.core.evaluation.llm_evaluator import LLMJudgeEvaluator
 
 router = APIRouter(tags=["experiments"])
@@ -41,9 +45,15 @@ async def create_experiment(
     experiment: ExperimentCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    """Create and run a new experiment."""
+    """
+    Create a new experiment and enqueue its cells for the experiment workers.
+
+    Returns immediately with status 'pending'; poll
+    /experiments/{experiment_id}/progress to follow the run.
+    """
     service = ExperimentService(db)
     created_experiment = await service.create_experiment(project_id, experiment)
+    experiment_runner.notify()
     return created_experiment
 
 
@@ -62,6 +72,23 @@ async def get_experiment(experiment_id: UUID, db: AsyncSession = Depends(get_db)
     return experiment
 
 
+@router.get(
+    "/experiments/{experiment_id}/progress", response_model=ExperimentProgressResponse
+)
+async def get_experiment_progress(experiment_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Get experiment progress (cells done/total and ETA)."""
+    service = ExperimentService(db)
+    progress = await service.get_experiment_progress(experiment_id)
+
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Experiment {experiment_id} not found",
+        )
+
+    return progress
+
+
 @router.get(
     "/experiments/{experiment_id}/results", response_model=ExperimentResultsResponse
 )
@@ -91,7 +118,8 @@ async def estimate_cost(request: CostEstimateRequest):
         llm_cost = LLMJudgeEvaluator.estimate_cost(
             num_queries=request.num_queries,
             chunks_per_query=request.chunks_per_query,
-            model=request.llm_judge_model
+            model=request.llm_judge_model,
+            mode=request.llm_judge_mode,
         )
         breakdown["llm_judge"] = llm_cost
         total_cost += llm_cost
@@ -104,7 +132,10 @@ async def estimate_cost(request: CostEstimateRequest):
     # Calculate number of API calls
     num_api_calls = 0
     if request.use_llm_judge:
-        num_api_calls += request.num_queries * request.chunks_per_query
+        if request.llm_judge_mode == "listwise":
+            num_api_calls += request.num_queries
+        else:
+            num_api_calls += request.num_queries * request.chunks_per_query
 
     return CostEstimateResponse(
         estimated_cost_usd=round(total_cost, 4),
@@ -149,6 +180,35 @@ async def run_query_time_experiment(
         )
 
 
+@router.post("/experiments/query-time/sweep", response_model=QueryTimeSweepResponse)
+async def run_query_time_sweep(
+    request: QueryTimeSweepRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Evaluate a grid of top_k and hybrid weight combinations in one go.
+
+    Candidates are retrieved once (at the largest top_k) and every
+    combination is re-ranked and evaluated in memory, so sweeping a
+    10x10 grid costs a single retrieval. For hybrid configs the sparse
+    weight of each point is 1 - dense weight.
+    """
+    service = ExperimentService(db)
+
+    try:
+        return await service.run_query_time_sweep(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to run query-time sweep: {str(e)}"
+        )
+
+
 @router.get("/results/{result_id}/document-context", response_model=DocumentContextResponse)
 async def get_document_context_for_result(
     result_id: UUID,
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    OPENAI_MAX_RETRIES: int = 6  # Retries for rate limits and transient errors
+    OPENAI_DEFAULT_RPM: int = 500  # Budget for models without a specific limit
+    OPENAI_DEFAULT_TPM: int = 200000
+    # Per-model overrides, e.g. {"gpt-4o": {"rpm": 500, "tpm": 30000}}
+    OPENAI_RATE_LIMITS: dict[str, dict[str, int]] = {}
 
     # Server
     BACKEND_HOST: str = "0.0.0.0"
@@ -28,6 +33,50 @@ class Settings(BaseSettings):
         """Parse CORS_ORIGINS string into list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    # Experiments
+    EXPERIMENT_MAX_CONCURRENCY: int = 8  # Max config/query cells evaluated in parallel
+    # Worker pools of the experiment pipeline stages; unset LLM stages
+    # (judging, generation, answer evaluation) use EXPERIMENT_MAX_CONCURRENCY
+    EXPERIMENT_RETRIEVAL_CONCURRENCY: int = 4  # Config retrieval batches in flight
+    EXPERIMENT_JUDGE_CONCURRENCY: int | None = None
+    EXPERIMENT_GENERATION_CONCURRENCY: int | None = None
+    EXPERIMENT_ANSWER_EVAL_CONCURRENCY: int | None = None
+    EXPERIMENT_CHECKPOINT_CONCURRENCY: int = 4  # Result commits in flight
+    EXPERIMENT_IN_PROCESS_WORKERS: int = 1  # Workers inside the API process (0 = external only)
+    # Max work items claimed at once; a claim covers one experiment config, so
+    # this only splits query sets larger than it into several retrieval batches
+    EXPERIMENT_WORKER_BATCH_SIZE: int = 1000
+    # Claims executing at once per worker, each with its own stage pools
+    EXPERIMENT_WORKER_MAX_CLAIMS: int = 4
+    EXPERIMENT_WORKER_POLL_SECONDS: float = 2.0
+    EXPERIMENT_WORKER_HEARTBEAT_SECONDS: float = 15.0
+    EXPERIMENT_WORKER_STALE_SECONDS: float = 120.0  # Reclaim claims without a heartbeat
+
+    # Embedding batching (OpenAI allows 2048 inputs / 300k tokens per request)
+    EMBEDDING_BATCH_MAX_INPUTS: int = 2048
+    EMBEDDING_BATCH_MAX_TOKENS: int = 250000
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+
+    # In-memory vector index for query-time dense retrieval
+    VECTOR_INDEX_ENABLED: bool = True
+    VECTOR_INDEX_MAX_BYTES: int = 1024 * 1024 * 1024  # Memory budget across all cached configs
+
+    # In-memory Okapi BM25 indexes (loaded from bm25_indexes)
+    BM25_INDEX_MAX_BYTES: int = 256 * 1024 * 1024  # Memory budget across all cached configs
+
+    # Query-time experiment result cache (0 entries disables it)
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL_SECONDS: float = 300.0
+
+    # Cutoffs for @k retrieval metrics (besides each config's top_k);
+    # a config can override them with evaluation_settings["cutoffs"]
+    EVALUATION_CUTOFFS: list[int] = [1, 3, 5, 10]
+
+    # Token budget for the retrieved chunks packed into generation and answer
+    # evaluation prompts; a config can override it with
+    # generation_settings["context_token_budget"]
+    GENERATION_CONTEXT_TOKEN_BUDGET: int = 4000
+
     # Upload settings
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "uploads"
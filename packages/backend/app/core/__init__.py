@@ -1,13 +1,17 @@
 """Core RAG logic package."""
 
 from app.core.chunking import ChunkingService
+from app.core.chunk_writer import ChunkWriter
 from app.core.embedding import EmbeddingService
+from app.core.embedding_cache import EmbeddingCache
 from app.core.retrieval import RetrievalService
 from app.core.document_parser import DocumentParser
 
 __all__ = [
     "ChunkingService",
+    "ChunkWriter",
     "EmbeddingService",
+    "EmbeddingCache",
     "RetrievalService",
     "DocumentParser",
 ]
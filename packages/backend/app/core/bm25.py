@@ -0,0 +1,444 @@
+"""Okapi BM25 retrieval over a per-config inverted index."""
+
+import asyncio
+import io
+import re
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.bm25_index import BM25IndexRecord
+from app.models.chunk import Chunk
+
+
+# Standard Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequencies are stored as uint16
+MAX_TERM_FREQUENCY = np.iinfo(np.uint16).max
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for
+from further had has have having he her here hers herself him himself his how i if in
+into is it its itself just me more most my myself no nor not now of off on once only or
+other our ours ourselves out over own same she should so some such than that the their
+theirs them themselves then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours
+yourself yourselves
+""".split())
+
+
+def _stem(token: str) -> str:
+    """Harman's S-stemmer: conflates plural forms only (cheap and predictable)."""
+    if len(token) > 3 and token.endswith("ies") and not token.endswith(("eies", "aies")):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and not token.endswith(("aes", "ees", "oes")):
+        return token[:-1]
+    if len(token) > 2 and token.endswith("s") and not token.endswith(("us", "ss")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Lowercases, splits on non-word characters, drops English stopwords and
+    strips plural suffixes. Used for both chunks and queries.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in document order (with repeats)
+    """
+    return [
+        _stem(token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    Inverted index over a config's chunks, scored with Okapi BM25.
+
+    Postings are stored CSR-style: for term t, postings[offsets[t]:offsets[t+1]]
+    are the (ascending) positions of the chunks containing it and tfs the
+    matching term frequencies. Per-posting BM25 impacts and per-term upper
+    bounds are derived on load, so a query only sums precomputed floats.
+    """
+
+    def __init__(
+        self,
+        chunk_ids: Sequence[UUID],
+        vocabulary: Sequence[str],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+    ):
+        """
+        Initialize from index arrays (see build() / from_bytes()).
+
+        Args:
+            chunk_ids: Chunk ID at each chunk position
+            vocabulary: Terms, indexed by term ID
+            offsets: Start of each term's postings (len(vocabulary) + 1 entries)
+            postings: Chunk positions, ascending within each term
+            tfs: Term frequency of each posting
+            doc_lengths: Number of terms in each chunk
+        """
+        # Config version the index was loaded at (set by BM25IndexRegistry)
+        self.version = 0
+        self.chunk_ids = list(chunk_ids)
+        self.vocabulary = list(vocabulary)
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.vocabulary)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.postings = np.asarray(postings, dtype=np.int32)
+        self.tfs = np.asarray(tfs, dtype=np.uint16)
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.int32)
+
+        num_docs = len(self.chunk_ids)
+        document_frequency = np.diff(self.offsets).astype(np.float64)
+        avg_length = float(self.doc_lengths.mean()) if num_docs and self.doc_lengths.any() else 1.0
+
+        # Lucene's non-negative IDF variant
+        self.idf = np.log1p((num_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        tf = self.tfs.astype(np.float64)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[self.postings] / avg_length)
+        term_of_posting = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.offsets))
+        self.impacts = (self.idf[term_of_posting] * tf * (BM25_K1 + 1) / (tf + length_norm)).astype(np.float32)
+
+        # Upper bound of each term's contribution, for MaxScore pruning
+        self.max_impacts = np.zeros(len(self.vocabulary), dtype=np.float32)
+        if len(self.impacts):
+            non_empty = np.flatnonzero(np.diff(self.offsets))
+            self.max_impacts[non_empty] = np.maximum.reduceat(self.impacts, self.offsets[non_empty])
+
+    @classmethod
+    def build(cls, chunk_ids: Sequence[UUID], contents: Sequence[str]) -> "BM25Index":
+        """
+        Build an index from chunk texts.
+
+        Args:
+            chunk_ids: Chunk IDs
+            contents: Chunk texts, aligned with chunk_ids
+
+        Returns:
+            The index
+        """
+        term_ids: Dict[str, int] = {}
+        doc_lengths = np.zeros(len(contents), dtype=np.int32)
+        term_column: List[int] = []
+        doc_column: List[int] = []
+        tf_column: List[int] = []
+
+        for position, content in enumerate(contents):
+            terms = tokenize(content)
+            doc_lengths[position] = len(terms)
+            counts: Dict[int, int] = {}
+            for term in terms:
+                term_id = term_ids.setdefault(term, len(term_ids))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            term_column.extend(counts)
+            doc_column.extend([position] * len(counts))
+            tf_column.extend(counts.values())
+
+        vocabulary = sorted(term_ids)
+        # Renumber terms alphabetically and group postings by term (stable keeps positions ascending)
+        renumber = np.empty(len(vocabulary), dtype=np.int64)
+        renumber[[term_ids[term] for term in vocabulary]] = np.arange(len(vocabulary))
+        terms = renumber[np.asarray(term_column, dtype=np.int64)]
+        order = np.argsort(terms, kind="stable")
+
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=offsets[1:])
+
+        return cls(
+            chunk_ids=chunk_ids,
+            vocabulary=vocabulary,
+            offsets=offsets,
+            postings=np.asarray(doc_column, dtype=np.int32)[order],
+            tfs=np.minimum(np.asarray(tf_column, dtype=np.int64), MAX_TERM_FREQUENCY)[order],
+            doc_lengths=doc_lengths,
+        )
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index arrays."""
+        return int(
+            self.offsets.nbytes + self.postings.nbytes + self.tfs.nbytes
+            + self.impacts.nbytes + self.doc_lengths.nbytes + self.idf.nbytes
+        )
+
+    def top_k(self, query_text: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k highest-scoring chunks for a query.
+
+        Terms are processed term-at-a-time in decreasing order of their upper
+        bound (MaxScore). Once the remaining terms can no longer lift an
+        unseen chunk past the current k-th score, only the surviving
+        candidates are scored, via binary search into the remaining (usually
+        long, low-IDF) posting lists.
+
+        Args:
+            query_text: Query text
+            k: Number of results
+
+        Returns:
+            (chunk positions, scores), best first; ties broken by position
+        """
+        term_ids = sorted({self.term_ids[t] for t in tokenize(query_text) if t in self.term_ids})
+        if k <= 0 or not term_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        term_ids.sort(key=lambda term_id: -self.max_impacts[term_id])
+        bounds = self.max_impacts[term_ids]
+        # remaining[i] = best possible contribution of the terms after term i
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1][1:], 0.0)
+
+        scores = np.zeros(len(self.chunk_ids), dtype=np.float32)
+        candidates = None
+        for term_id, rest in zip(term_ids, remaining):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            postings = self.postings[start:end]
+            impacts = self.impacts[start:end]
+
+            if candidates is None:
+                scores[postings] += impacts
+                matched = np.flatnonzero(scores)
+                if len(matched) >= k:
+                    threshold = np.partition(scores[matched], len(matched) - k)[len(matched) - k]
+                    if rest < threshold:
+                        # Unseen chunks can't reach the top k any more
+                        candidates = matched[scores[matched] + rest >= threshold]
+            else:
+                positions = np.minimum(np.searchsorted(postings, candidates), len(postings) - 1)
+                hit = postings[positions] == candidates
+                scores[candidates[hit]] += impacts[positions[hit]]
+
+        if candidates is None:
+            candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        candidates = np.sort(candidates)
+        order = np.argsort(-scores[candidates], kind="stable")
+        best = candidates[order]
+        return best, scores[best]
+
+    def search(self, query_text: str, k: int) -> List[Tuple[UUID, float]]:
+        """
+        Top-k chunk IDs and BM25 scores for a query (chunks matching no query term are omitted).
+
+        Args:
+            query_text: Query text
+            k: Number of results
+
+        Returns:
+            (chunk ID, score) pairs, best first
+        """
+        positions, scores = self.top_k(query_text, k)
+        return [(self.chunk_ids[p], float(s)) for p, s in zip(positions, scores)]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index arrays (impacts are recomputed on load)."""
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            chunk_ids=np.frombuffer(b"".join(c.bytes for c in self.chunk_ids), dtype=np.uint8),
+            vocabulary=np.frombuffer("\n".join(self.vocabulary).encode("utf-8"), dtype=np.uint8),
+            offsets=self.offsets,
+            postings=self.postings,
+            tfs=self.tfs,
+            doc_lengths=self.doc_lengths,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BM25Index":
+        """Load an index serialized with to_bytes()."""
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            raw_ids = arrays["chunk_ids"].tobytes()
+            vocabulary = arrays["vocabulary"].tobytes().decode("utf-8")
+            return cls(
+                chunk_ids=[UUID(bytes=raw_ids[i:i + 16]) for i in range(0, len(raw_ids), 16)],
+                vocabulary=vocabulary.split("\n") if vocabulary else [],
+                offsets=arrays["offsets"],
+                postings=arrays["postings"],
+                tfs=arrays["tfs"],
+                doc_lengths=arrays["doc_lengths"],
+            )
+
+
+async def _build_from_chunks(db: AsyncSession, config_id: UUID) -> BM25Index:
+    query = (
+        select(Chunk.id, Chunk.content)
+        .where(Chunk.config_id == config_id)
+        .order_by(Chunk.document_id, Chunk.chunk_index)
+    )
+    result = await db.execute(query)
+    rows = result.all()
+    chunk_ids = [row.id for row in rows]
+    contents = [row.content for row in rows]
+    return await asyncio.to_thread(BM25Index.build, chunk_ids, contents)
+
+
+async def save_bm25_index(db: AsyncSession, config_id: UUID) -> BM25Index:
+    """
+    (Re)build a config's index from its chunks and persist it.
+
+    The caller commits (bumping Config.version in the same transaction).
+
+    Args:
+        db: Database session
+        config_id: Config whose chunks to index
+
+    Returns:
+        The new index
+    """
+    index = await _build_from_chunks(db, config_id)
+    data = index.to_bytes()
+    statement = insert(BM25IndexRecord).values(
+        config_id=config_id,
+        num_chunks=len(index),
+        num_terms=len(index.vocabulary),
+        data=data,
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["config_id"],
+            set_={
+                "num_chunks": statement.excluded.num_chunks,
+                "num_terms": statement.excluded.num_terms,
+                "data": statement.excluded.data,
+                "created_at": statement.excluded.created_at,
+            },
+        )
+    )
+    return index
+
+
+class BM25IndexRegistry:
+    """
+    Process-wide cache of BM25Index objects keyed by config ID.
+
+    Indexes are loaded from bm25_indexes on first use (or built from the
+    chunks for configs processed before indexes were persisted) and evicted
+    least-recently-used once the memory budget is exceeded. Every lookup
+    passes the config's persisted version (Config.version, bumped by
+    whatever changes its chunks), and an index loaded at an older version is
+    reloaded, so a change made by any API or worker process is seen by all
+    of them. invalidate() only frees this process's memory early.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            max_bytes: Memory budget for all indexes (uses settings if not provided)
+        """
+        self.max_bytes = settings.BM25_INDEX_MAX_BYTES if max_bytes is None else max_bytes
+        self._indexes: "OrderedDict[UUID, BM25Index]" = OrderedDict()
+        self._loading: Dict[Tuple[UUID, int], asyncio.Future] = {}
+
+    async def get(self, db: AsyncSession, config_id: UUID, version: int) -> BM25Index:
+        """
+        Get a config's index, loading it if needed.
+
+        Concurrent callers share a single load.
+
+        Args:
+            db: Database session used for loading
+            config_id: Config ID
+            version: The config's current version (Config.version)
+
+        Returns:
+            The config's index (possibly empty)
+        """
+        index = self._indexes.get(config_id)
+        if index is not None:
+            # An index newer than the caller's view of the config is fine to serve
+            if index.version >= version:
+                self._indexes.move_to_end(config_id)
+                return index
+            # The chunks changed (possibly in another process)
+            del self._indexes[config_id]
+
+        loading_key = (config_id, version)
+        pending = self._loading.get(loading_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[loading_key] = future
+        try:
+            index = await self._load(db, config_id)
+            index.version = version
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(loading_key, None)
+
+        future.set_result(index)
+        current = self._indexes.get(config_id)
+        # Don't replace an index a concurrent lookup loaded at a newer version
+        if current is None or current.version < version:
+            self._store(config_id, index)
+        return index
+
+    def invalidate(self, config_id: UUID | None = None) -> None:
+        """
+        Free cached indexes of this process early.
+
+        Not needed for correctness: lookups at a newer config version reload.
+
+        Args:
+            config_id: Config whose chunks changed (None drops everything)
+        """
+        if config_id is None:
+            self._indexes.clear()
+            return
+
+        self._indexes.pop(config_id, None)
+
+    def _store(self, config_id: UUID, index: BM25Index) -> None:
+        self._indexes[config_id] = index
+        self._indexes.move_to_end(config_id)
+        # Evict least recently used, but always keep the newest index
+        while len(self._indexes) > 1 and sum(i.nbytes for i in self._indexes.values()) > self.max_bytes:
+            self._indexes.popitem(last=False)
+
+    @staticmethod
+    async def _load(db: AsyncSession, config_id: UUID) -> BM25Index:
+        query = select(BM25IndexRecord.data).where(BM25IndexRecord.config_id == config_id)
+        data = (await db.execute(query)).scalar_one_or_none()
+        if data is None:
+            return await _build_from_chunks(db, config_id)
+        return await asyncio.to_thread(BM25Index.from_bytes, data)
+
+
+# Process-wide registry used by Okapi BM25 retrieval
+bm25_indexes = BM25IndexRegistry()
@@ -0,0 +1,113 @@
+"""Bulk chunk writer used by config processing."""
+
+import json
+import uuid
+from typing import Any, Dict, Iterable, List, NamedTuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ChunkRow(NamedTuple):
+    """One chunk to be written."""
+
+    document_id: uuid.UUID
+    config_id: uuid.UUID
+    content: str
+    embedding: List[float] | None
+    embedding_model: str | None
+    embedding_dim: int | None
+    chunk_index: int
+    chunk_metadata: Dict[str, Any] | None
+
+
+def _vector_literal(embedding: List[float] | None) -> str | None:
+    """Format an embedding as pgvector text input ("[0.1,0.2,...]")."""
+    if embedding is None:
+        return None
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+class ChunkWriter:
+    """
+    Bulk-load chunks with COPY instead of one ORM object per chunk.
+
+    Rows are streamed into a temporary staging table with asyncpg's
+    copy_records_to_table, then moved into chunks by a single INSERT ... SELECT
+    that also computes content_tsv set-wise (the tsvector trigger skips rows
+    that already carry one). Writes join the caller's transaction; the caller
+    commits.
+    """
+
+    STAGING_TABLE = "chunk_staging"
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize chunk writer.
+
+        Args:
+            db: Database session (PostgreSQL/asyncpg)
+        """
+        self.db = db
+
+    async def write(self, rows: Iterable[ChunkRow]) -> int:
+        """
+        Write chunks.
+
+        Args:
+            rows: Chunks to write
+
+        Returns:
+            Number of chunks written
+        """
+        records = [
+            (
+                row.document_id,
+                row.config_id,
+                row.content,
+                _vector_literal(row.embedding),
+                row.embedding_model,
+                row.embedding_dim,
+                row.chunk_index,
+                json.dumps(row.chunk_metadata) if row.chunk_metadata is not None else None,
+            )
+            for row in rows
+        ]
+        if not records:
+            return 0
+
+        # Vectors and JSON travel as text so COPY needs no custom codecs
+        await self.db.execute(text(f"""
+            CREATE TEMP TABLE {self.STAGING_TABLE} (
+                document_id UUID,
+                config_id UUID,
+                content TEXT,
+                embedding TEXT,
+                embedding_model VARCHAR(100),
+                embedding_dim INTEGER,
+                chunk_index INTEGER,
+                chunk_metadata TEXT
+            ) ON COMMIT DROP
+        """))
+
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.STAGING_TABLE,
+            records=records,
+            columns=list(ChunkRow._fields),
+        )
+
+        await self.db.execute(text(f"""
+            INSERT INTO chunks (
+                document_id, config_id, content, embedding, embedding_model,
+                embedding_dim, chunk_index, chunk_metadata, content_tsv
+            )
+            SELECT
+                document_id, config_id, content, embedding::vector, embedding_model,
+                embedding_dim, chunk_index, chunk_metadata::jsonb,
+                to_tsvector('english', coalesce(content, ''))
+            FROM {self.STAGING_TABLE}
+        """))
+        await self.db.execute(text(f"DROP TABLE {self.STAGING_TABLE}"))
+
+        return len(records)
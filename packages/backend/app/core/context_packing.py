@@ -0,0 +1,134 @@
+"""Token-budgeted packing of retrieved chunks into an LLM context."""
+
+from typing import List, NamedTuple
+
+from app.core.tokens import get_encoding
+
+# Shorter shared spans are left alone (likely coincidental, e.g. a heading)
+MIN_OVERLAP_CHARS = 32
+
+# A chunk is only truncated to fit if at least this many of its tokens fit
+MIN_TRUNCATED_TOKENS = 64
+
+
+class PackedContext(NamedTuple):
+    """Chunk texts that fit the budget, in rank order, plus packing statistics."""
+
+    texts: List[str]
+    ranks: List[int]  # Position of each packed text in the input list
+    packed_tokens: int
+    dropped_tokens: int  # Cut by the budget (dropped chunks and truncated tails)
+    deduplicated_tokens: int  # Removed as duplicate/overlapping text
+    dropped_chunks: int  # Input chunks not packed (over budget or fully duplicated)
+    truncated_chunks: int
+
+    def stats(self) -> dict:
+        """Packing statistics (JSON-serializable)."""
+        return {
+            "packed_chunks": len(self.texts),
+            "packed_tokens": self.packed_tokens,
+            "dropped_tokens": self.dropped_tokens,
+            "deduplicated_tokens": self.deduplicated_tokens,
+            "dropped_chunks": self.dropped_chunks,
+            "truncated_chunks": self.truncated_chunks,
+        }
+
+
+def _overlap(previous: str, text: str) -> int:
+    """Length of the longest suffix of previous that is a prefix of text (0 if short)."""
+    probe = text[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = max(0, len(previous) - len(text))
+    while True:
+        position = previous.find(probe, start)
+        if position < 0:
+            return 0
+        if text.startswith(previous[position:]):
+            return len(previous) - position
+        start = position + 1
+
+
+def _strip_seen_text(text: str, kept: List[str]) -> str:
+    """Remove the parts of text that higher-ranked chunks already contain."""
+    for previous in kept:
+        if len(text) >= MIN_OVERLAP_CHARS and text in previous:
+            return ""
+        # Chunks overlap by chunk_overlap characters with their neighbours
+        overlap = _overlap(previous, text)
+        if overlap:
+            text = text[overlap:]
+        overlap = _overlap(text, previous)
+        if overlap:
+            text = text[:-overlap]
+        if not text.strip():
+            return ""
+    return text
+
+
+def pack_context(texts: List[str], model: str, token_budget: int | None) -> PackedContext:
+    """
+    Pack ranked chunk texts into at most token_budget tokens.
+
+    Chunks are taken in rank order. Text already covered by a higher-ranked
+    chunk (exact duplicates, contained chunks and the overlap between
+    neighbouring chunks) is removed first. The first chunk that doesn't fit
+    is truncated if a meaningful part of it fits, and every lower-ranked
+    chunk is dropped. Only chunk text counts towards the budget, not the
+    prompt's formatting.
+
+    Args:
+        texts: Chunk texts, best first
+        model: Model whose tokenizer counts the tokens
+        token_budget: Maximum number of chunk tokens (None for no limit)
+
+    Returns:
+        PackedContext
+    """
+    encoding = get_encoding(model)
+    original_tokens = sum(
+        len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=())
+    )
+
+    unique: List[str] = []
+    unique_ranks: List[int] = []
+    for rank, text in enumerate(texts):
+        text = _strip_seen_text(text, unique)
+        if text:
+            unique.append(text)
+            unique_ranks.append(rank)
+
+    encoded = encoding.encode_batch(unique, disallowed_special=())
+    deduplicated_tokens = max(0, original_tokens - sum(len(tokens) for tokens in encoded))
+
+    packed: List[str] = []
+    ranks: List[int] = []
+    packed_tokens = 0
+    dropped_tokens = 0
+    truncated_chunks = 0
+    for rank, text, tokens in zip(unique_ranks, unique, encoded):
+        remaining = None if token_budget is None else token_budget - packed_tokens
+        if remaining is None or len(tokens) <= remaining:
+            packed.append(text)
+            ranks.append(rank)
+            packed_tokens += len(tokens)
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            packed.append(encoding.decode(tokens[:remaining]))
+            ranks.append(rank)
+            packed_tokens += remaining
+            dropped_tokens += len(tokens) - remaining
+            truncated_chunks += 1
+        else:
+            # Budget exhausted: drop this chunk (and, below, everything after it)
+            token_budget = packed_tokens
+            dropped_tokens += len(tokens)
+
+    return PackedContext(
+        texts=packed,
+        ranks=ranks,
+        packed_tokens=packed_tokens,
+        dropped_tokens=dropped_tokens,
+        deduplicated_tokens=deduplicated_tokens,
+        dropped_chunks=len(texts) - len(packed),
+        truncated_chunks=truncated_chunks,
+    )
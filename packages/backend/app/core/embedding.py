@@ -1,10 +1,13 @@
 """Embedding service for generating vector embeddings."""
 
-from typing import List
+import asyncio
+from typing import Dict, Iterable, List, Tuple
 import numpy as np
-from openai import AsyncOpenAI
 
 from app.config import settings
+from app.core.embedding_cache import EmbeddingCache
+from app.core.openai_client import get_openai_client
+from app.core.tokens import count_tokens_batch
 
 
 # Embedding model registry with dimensions
@@ -48,18 +51,60 @@ def get_model_dimensions(model: str) -> int:
     return EMBEDDING_MODELS[model]["dimensions"]
 
 
+def pack_batches(
+    token_counts: List[int],
+    max_inputs: int,
+    max_tokens: int,
+) -> List[Tuple[int, int]]:
+    """
+    Pack consecutive inputs into request-sized batches.
+
+    Each batch holds at most max_inputs inputs and max_tokens tokens. An input
+    that alone exceeds max_tokens gets a batch of its own.
+
+    Args:
+        token_counts: Token count of each input, in order
+        max_inputs: Maximum number of inputs per batch
+        max_tokens: Maximum total tokens per batch
+
+    Returns:
+        (start, end) index ranges covering all inputs in order
+    """
+    batches = []
+    start = 0
+    batch_tokens = 0
+
+    for idx, tokens in enumerate(token_counts):
+        batch_size = idx - start
+        if batch_size and (batch_size >= max_inputs or batch_tokens + tokens > max_tokens):
+            batches.append((start, idx))
+            start = idx
+            batch_tokens = 0
+        batch_tokens += tokens
+
+    if start < len(token_counts):
+        batches.append((start, len(token_counts)))
+
+    return batches
+
+
 class EmbeddingService:
     """Service for generating embeddings for text chunks."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, cache: EmbeddingCache | None = None):
         """
         Initialize embedding service.
 
         Args:
             api_key: OpenAI API key (uses settings if not provided)
+            cache: Optional persistent cache consulted before calling the API
         """
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
+        self.cache = cache
+        self.max_inputs = settings.EMBEDDING_BATCH_MAX_INPUTS
+        self.max_tokens = settings.EMBEDDING_BATCH_MAX_TOKENS
+        self.max_concurrency = settings.EMBEDDING_MAX_CONCURRENCY
 
     async def embed_batch(
         self,
@@ -69,6 +114,11 @@ class EmbeddingService:
         """
         Generate embeddings for multiple texts.
 
+        Texts are packed into requests bounded by input count and token budget,
+        and up to EMBEDDING_MAX_CONCURRENCY requests run at once. With a cache
+        configured, only texts missing from the cache are sent to the API (each
+        distinct text once) and the new embeddings are written back.
+
         Args:
             texts: List of texts to embed
             model: Embedding model to use
@@ -82,12 +132,62 @@ class EmbeddingService:
         # Validate model before making API call
         expected_dim = get_model_dimensions(model)
 
-        response = await self.client.embeddings.create(
+        if self.cache is None:
+            return await self._embed_uncached(texts, model, expected_dim)
+
+        embeddings_by_text = await self.cache.get_many(model, texts)
+        missing = list(dict.fromkeys(text for text in texts if text not in embeddings_by_text))
+
+        if missing:
+            new_embeddings = dict(
+                zip(missing, await self._embed_uncached(missing, model, expected_dim))
+            )
+            await self.cache.put_many(model, new_embeddings)
+            embeddings_by_text.update(new_embeddings)
+
+        return [embeddings_by_text[text] for text in texts]
+
+    async def _embed_uncached(
+        self,
+        texts: List[str],
+        model: str,
+        expected_dim: int,
+    ) -> List[List[float]]:
+        """Embed texts in concurrent, size-bounded requests, preserving order."""
+        if len(texts) <= 1:
+            return await self._create_embeddings(texts, model, expected_dim) if texts else []
+
+        # Token counting is CPU-bound; keep it off the event loop
+        token_counts = await asyncio.to_thread(count_tokens_batch, texts, model)
+        batches = pack_batches(token_counts, self.max_inputs, self.max_tokens)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_range(start: int, end: int) -> List[List[float]]:
+            async with semaphore:
+                return await self._create_embeddings(
+                    texts[start:end], model, expected_dim, sum(token_counts[start:end])
+                )
+
+        results = await asyncio.gather(*(embed_range(start, end) for start, end in batches))
+        return [embedding for batch in results for embedding in batch]
+
+    async def _create_embeddings(
+        self,
+        texts: List[str],
+        model: str,
+        expected_dim: int,
+        estimated_tokens: int | None = None,
+    ) -> List[List[float]]:
+        """Call the embeddings API once and validate the returned dimensions."""
+        response = await self.client.create_embeddings(
             model=model,
             input=texts,
+            estimated_tokens=estimated_tokens,
         )
 
-        embeddings = [item.embedding for item in response.data]
+        # Responses carry an index per input; don't rely on their order
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
         # Verify dimensions match expected (sanity check)
         if embeddings and len(embeddings[0]) != expected_dim:
@@ -131,3 +231,69 @@ class EmbeddingService:
         a_array = np.array(a)
         b_array = np.array(b)
         return float(np.dot(a_array, b_array) / (np.linalg.norm(a_array) * np.linalg.norm(b_array)))
+
+
+class EmbeddingLookup:
+    """
+    Precomputed embeddings keyed by (model, text).
+
+    Experiments embed every distinct query and ground-truth text once per
+    embedding model up front (one embed_batch call per model) instead of once
+    per config/query cell.
+    """
+
+    def __init__(self):
+        """Initialize an empty lookup."""
+        self._vectors: Dict[Tuple[str, str], List[float]] = {}
+        # Concurrent batches of an experiment share the lookup; the second
+        # prefetch waits for the first and finds its texts embedded
+        self._prefetching = asyncio.Lock()
+
+    async def prefetch(
+        self,
+        embedding_service: EmbeddingService,
+        pairs: Iterable[Tuple[str, str]],
+    ) -> None:
+        """
+        Embed all (text, model) pairs that are not cached yet.
+
+        Models that fail validation are skipped; lookups for them fall back to
+        embedding on demand so the error surfaces per cell as before.
+
+        Args:
+            embedding_service: Service used for the embed_batch calls
+            pairs: (text, model) pairs to embed
+        """
+        async with self._prefetching:
+            # Ordered set of missing texts per model
+            missing: Dict[str, Dict[str, None]] = {}
+            for text, model in pairs:
+                if (model, text) not in self._vectors:
+                    missing.setdefault(model, {})[text] = None
+
+            for model, missing_texts in missing.items():
+                texts = list(missing_texts)
+                try:
+                    embeddings = await embedding_service.embed_batch(texts, model)
+                except ValueError:
+                    continue
+                self._vectors.update(
+                    ((model, text), embedding) for text, embedding in zip(texts, embeddings)
+                )
+
+    def get_cached(self, text: str, model: str) -> List[float] | None:
+        """Return a prefetched embedding, or None if it was not prefetched."""
+        return self._vectors.get((model, text))
+
+    async def get(
+        self,
+        embedding_service: EmbeddingService,
+        text: str,
+        model: str,
+    ) -> List[float]:
+        """Return a prefetched embedding, embedding (and caching) it on a miss."""
+        embedding = self._vectors.get((model, text))
+        if embedding is None:
+            embedding = await embedding_service.embed_single(text=text, model=model)
+            self._vectors[(model, text)] = embedding
+        return embedding
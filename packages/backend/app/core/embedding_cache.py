@@ -0,0 +1,86 @@
+"""Persistent embedding cache backed by Postgres."""
+
+import hashlib
+from typing import Dict, List, Sequence
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of a text (cache key component)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Look up and store embeddings keyed by (model, sha256(text)).
+
+    Writes are added to the caller's transaction; the caller commits.
+    """
+
+    # Keep IN (...) lists and multi-row inserts at a reasonable size
+    BATCH_SIZE = 1000
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize embedding cache.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    async def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Fetch cached embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Mapping of text -> embedding for the cache hits
+        """
+        hashes: Dict[str, str] = {text_hash(text): text for text in texts}
+        hash_list = list(hashes)
+        found: Dict[str, List[float]] = {}
+
+        for start in range(0, len(hash_list), self.BATCH_SIZE):
+            batch = hash_list[start:start + self.BATCH_SIZE]
+            query = (
+                select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding)
+                .where(EmbeddingCacheEntry.model == model)
+                .where(EmbeddingCacheEntry.text_hash.in_(batch))
+            )
+            result = await self.db.execute(query)
+            for digest, embedding in result.all():
+                # pgvector returns numpy arrays; hand out plain lists like the API does
+                found[hashes[digest]] = (
+                    embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+                )
+
+        return found
+
+    async def put_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings (existing entries are left untouched).
+
+        Args:
+            model: Embedding model name
+            embeddings: Mapping of text -> embedding
+        """
+        rows = [
+            {"model": model, "text_hash": text_hash(text), "embedding": embedding}
+            for text, embedding in embeddings.items()
+        ]
+
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            stmt = (
+                insert(EmbeddingCacheEntry)
+                .values(rows[start:start + self.BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=["model", "text_hash"])
+            )
+            await self.db.execute(stmt)
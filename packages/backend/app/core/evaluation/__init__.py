@@ -1,5 +1,6 @@
 """Evaluation package for RAG metrics."""
 
-from app.core.evaluation.basic_evaluator import BasicIREvaluator
+from app.core.evaluation.basic_evaluator import BasicIREvaluator, EvaluationCase
+from app.core.evaluation.judge_cache import JudgeVerdictCache
 
-__all__ = ["BasicIREvaluator"]
+__all__ = ["BasicIREvaluator", "EvaluationCase", "JudgeVerdictCache"]
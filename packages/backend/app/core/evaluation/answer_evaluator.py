@@ -2,8 +2,9 @@
 
 import json
 from typing import List, Dict, Any
-from openai import AsyncOpenAI
-
+from app.config import settings
+from app.core.context_packing import pack_context
+from app.core.openai_client import get_openai_client
 from app.models.chunk import Chunk
 
 
@@ -16,14 +17,15 @@ class AnswerQualityEvaluator:
 
     def __init__(self, api_key: str):
         """Initialize with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     async def evaluate(
         self,
         query_text: str,
         generated_answer: str,
         chunks: List[Chunk],
-        model: str = "gpt-4o-mini"
+        model: str = "gpt-4o-mini",
+        context_texts: List[str] | None = None,
     ) -> Dict[str, Any]:
         """
         Evaluate answer quality comprehensively.
@@ -33,12 +35,21 @@ class AnswerQualityEvaluator:
             generated_answer: The AI-generated answer
             chunks: The chunks used as context
             model: OpenAI model for evaluation
+            context_texts: Packed context the answer was generated from (the
+                generator's "context_chunks"); if None, chunks are packed
+                into the default token budget
 
         Returns:
             Dictionary with metrics and detailed evaluation
         """
-        # Build context from chunks
-        context = self._build_context(chunks)
+        # Judge against the same bounded context the generator saw
+        if context_texts is None:
+            context_texts = pack_context(
+                [chunk.content for chunk in chunks],
+                model,
+                settings.GENERATION_CONTEXT_TOKEN_BUDGET,
+            ).texts
+        context = self._build_context(context_texts)
 
         # Build evaluation prompt
         prompt = self._build_evaluation_prompt(
@@ -48,7 +59,7 @@ class AnswerQualityEvaluator:
         )
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self.client.create_chat_completion(
                 model=model,
                 messages=[
                     {
@@ -123,12 +134,12 @@ class AnswerQualityEvaluator:
                 "tokens_used": 0,
             }
 
-    def _build_context(self, chunks: List[Chunk]) -> str:
-        """Build formatted context from chunks."""
+    def _build_context(self, context_texts: List[str]) -> str:
+        """Build formatted context from packed chunk texts."""
         context_parts = []
-        for i, chunk in enumerate(chunks, 1):
+        for i, text in enumerate(context_texts, 1):
             context_parts.append(f"[Chunk {i}]")
-            context_parts.append(chunk.content)
+            context_parts.append(text)
             context_parts.append("")
         return "\n".join(context_parts)
 
@@ -1,6 +1,6 @@
 """Basic Information Retrieval metrics evaluator."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Sequence, Tuple
 import numpy as np
 from uuid import UUID
 
@@ -9,11 +9,41 @@ from app.models.query import Query
 from app.core.embedding import EmbeddingService
 
 
+# Cosine similarity above which a chunk matches a text ground truth
+TEXT_GROUND_TRUTH_THRESHOLD = 0.75
+
+# Upper bound on floats gathered at once when comparing embeddings
+_EMBEDDING_BLOCK_SIZE = 1 << 24
+
+
+class EvaluationCase(NamedTuple):
+    """
+    One ranked result list to evaluate (e.g. one config/query cell).
+
+    Ground truth metrics are computed at top_k and at every cutoff, all
+    from the same ranked list; diversity and average length describe the
+    top_k chunks.
+
+    Relevance comes from ground_truth_chunk_ids if given, otherwise from
+    cosine similarity of each chunk to ground_truth_embedding (the embedded
+    text ground truth); with neither, only ground-truth-free metrics apply.
+    """
+
+    retrieved_chunks: List[Chunk]
+    top_k: int = 5
+    ground_truth_chunk_ids: Optional[List[UUID]] = None
+    ground_truth_embedding: Optional[List[float]] = None
+    # Extra cutoffs for the ground truth metrics (the list may run deeper than top_k)
+    cutoffs: Tuple[int, ...] = ()
+
+
 class BasicIREvaluator:
     """
     Evaluate retrieval using standard IR metrics (no API calls needed).
 
-    All metrics are FREE and INSTANT - no external API costs.
+    All metrics are FREE and INSTANT - no external API costs. Metrics are
+    computed with NumPy over whole batches of result lists (see
+    evaluate_batch); evaluate() is the single-list convenience wrapper.
     """
 
     async def evaluate(
@@ -23,7 +53,9 @@ class BasicIREvaluator:
         embedding_service: Optional[EmbeddingService] = None,
         embedding_model: Optional[str] = None,
         ground_truth_chunk_ids: Optional[List[UUID]] = None,
-        top_k: int = 5
+        top_k: int = 5,
+        ground_truth_embedding: Optional[List[float]] = None,
+        cutoffs: Optional[Sequence[int]] = None,
     ) -> Dict[str, float]:
         """
         Calculate all basic IR metrics.
@@ -34,231 +66,286 @@ class BasicIREvaluator:
             embedding_service: Optional embedding service for text-based ground truth
             ground_truth_chunk_ids: Optional list of ground truth chunk IDs (legacy)
             top_k: Number of top chunks to consider
+            ground_truth_embedding: Optional precomputed embedding of query.ground_truth
+            cutoffs: Extra k values for the @k metrics (retrieved_chunks should
+                hold at least max(cutoffs) chunks)
 
         Returns:
             Dictionary of metric name -> score
         """
-        metrics = {}
-
-        # Limit to top_k
-        chunks = retrieved_chunks[:top_k]
-        retrieved_ids = [str(c.id) for c in chunks]
-
-        # Determine ground truth chunk IDs
-        gt_ids: Optional[List[str]] = None
-
+        cutoffs = tuple(cutoffs or ())
+        depth = max((top_k, *cutoffs))
         # Priority 1: Explicit chunk IDs (legacy/power user feature)
-        if ground_truth_chunk_ids:
-            gt_ids = [str(id) for id in ground_truth_chunk_ids]
         # Priority 2: Text-based ground truth via semantic matching
-        elif query.ground_truth and query.ground_truth.strip() and embedding_service and embedding_model:
-            gt_ids = await self._match_chunks_with_text_ground_truth(
-                ground_truth_text=query.ground_truth,
-                retrieved_chunks=chunks,
-                embedding_service=embedding_service,
-                embedding_model=embedding_model,
-                threshold=0.75  # 75% similarity threshold
-            )
-
-        # Ground truth dependent metrics
-        if gt_ids:
-            metrics["mrr"] = self._calculate_mrr(retrieved_ids, gt_ids)
-            metrics[f"ndcg@{top_k}"] = self._calculate_ndcg(retrieved_ids, gt_ids, top_k)
-            metrics[f"precision@{top_k}"] = self._calculate_precision(retrieved_ids, gt_ids)
-            metrics[f"recall@{top_k}"] = self._calculate_recall(retrieved_ids, gt_ids)
-            metrics[f"f1@{top_k}"] = self._calculate_f1(
-                metrics[f"precision@{top_k}"],
-                metrics[f"recall@{top_k}"]
+        gt_embedding = None
+        if (
+            not ground_truth_chunk_ids
+            and query.ground_truth
+            and query.ground_truth.strip()
+            and embedding_service
+            and embedding_model
+            # Nothing to compare against (e.g. BM25-only configs have no embeddings)
+            and any(chunk.embedding is not None for chunk in retrieved_chunks[:depth])
+        ):
+            gt_embedding = ground_truth_embedding
+            if gt_embedding is None:
+                # Generate embedding for ground truth text using SAME model as chunks
+                gt_embedding = await embedding_service.embed_single(
+                    text=query.ground_truth,
+                    model=embedding_model
+                )
+
+        return self.evaluate_batch([
+            EvaluationCase(
+                retrieved_chunks=retrieved_chunks,
+                top_k=top_k,
+                ground_truth_chunk_ids=ground_truth_chunk_ids,
+                ground_truth_embedding=gt_embedding,
+                cutoffs=cutoffs,
             )
-            metrics[f"hit_rate@{top_k}"] = self._calculate_hit_rate(retrieved_ids, gt_ids)
+        ])[0]
 
-        # Ground truth independent metrics
-        metrics["diversity"] = self._calculate_diversity(chunks)
-        metrics["avg_chunk_length"] = self._calculate_avg_length(chunks)
-
-        return metrics
-
-    async def _match_chunks_with_text_ground_truth(
-        self,
-        ground_truth_text: str,
-        retrieved_chunks: List[Chunk],
-        embedding_service: EmbeddingService,
-        embedding_model: str,
-        threshold: float = 0.75
-    ) -> List[str]:
+    def evaluate_batch(self, cases: Sequence[EvaluationCase]) -> List[Dict[str, float]]:
         """
-        Match retrieved chunks to ground truth text via embedding similarity.
+        Calculate basic IR metrics for many result lists at once.
+
+        Retrieved and ground truth chunk IDs are encoded as integer arrays,
+        giving one boolean relevance matrix (cases x positions) from which
+        every ground truth metric is a row reduction. Prefix sums over the
+        positions give the metrics at every cutoff from the same matrix.
+        Diversity comes from one Gram matrix of normalized embeddings per
+        result list.
 
         Args:
-            ground_truth_text: The expected answer text
-            retrieved_chunks: List of retrieved chunks
-            embedding_service: Service to generate embeddings
-            embedding_model: Embedding model to use (must match chunk embeddings)
-            threshold: Similarity threshold (0-1) for considering a chunk relevant
+            cases: Result lists to evaluate
 
         Returns:
-            List of chunk IDs that match the ground truth semantically
+            Per case (in input order), metric name -> score, with the same keys as evaluate()
         """
-        # Generate embedding for ground truth text using SAME model as chunks
-        gt_embedding = await embedding_service.embed_single(
-            text=ground_truth_text,
-            model=embedding_model
+        if not cases:
+            return []
+
+        # Cases of an experiment share a handful of (top_k, cutoffs) combinations
+        sorted_cutoffs: Dict[tuple, List[int]] = {}
+        case_cutoffs = [
+            sorted_cutoffs.get((case.top_k, case.cutoffs))
+            or sorted_cutoffs.setdefault((case.top_k, case.cutoffs), sorted({case.top_k, *case.cutoffs}))
+            for case in cases
+        ]
+        lists = [case.retrieved_chunks[:ks[-1]] for case, ks in zip(cases, case_cutoffs)]
+        top_ks = np.array([case.top_k for case in cases], dtype=np.int64)
+        lengths = np.array([len(chunks) for chunks in lists], dtype=np.int64)
+        width = max(int(lengths.max()), 1)
+        # Positions within each case's top_k (what diversity / length describe)
+        in_top_k = np.arange(width) < top_ks[:, None]
+
+        # Encode retrieved chunks as integer codes, one per distinct chunk ID
+        id_codes: Dict[UUID, int] = {}
+        seen: Dict[int, int] = {}  # object identity -> code (lists share chunk objects)
+        distinct: List[Chunk] = []
+        flat_codes: List[int] = []
+        for chunks in lists:
+            for chunk in chunks:
+                code = seen.get(id(chunk))
+                if code is None:
+                    code = seen[id(chunk)] = id_codes.setdefault(chunk.id, len(id_codes))
+                    if code == len(distinct):
+                        distinct.append(chunk)
+                flat_codes.append(code)
+            flat_codes.extend([-1] * (width - len(chunks)))
+        retrieved_codes = np.array(flat_codes, dtype=np.int64).reshape(len(cases), width)
+
+        # Per distinct chunk: content length and embedding (None for BM25-only chunks);
+        # the trailing entries are what padding (code -1) maps to
+        chunk_lengths = np.array([len(chunk.content) for chunk in distinct] + [0], dtype=np.float64)
+        vectors = [
+            np.asarray(chunk.embedding, dtype=np.float32) if chunk.embedding is not None else None
+            for chunk in distinct
+        ]
+        has_embedding = np.array([vector is not None for vector in vectors] + [False])
+        content_lengths = chunk_lengths[retrieved_codes] * in_top_k
+        embedding_rows = np.where(has_embedding[retrieved_codes], retrieved_codes, -1)
+
+        relevance, num_relevant = self._relevance(cases, retrieved_codes, id_codes)
+        similarities, pair_counts, matched = self._embedding_metrics(
+            cases, embedding_rows, vectors, in_top_k
         )
 
-        relevant_chunk_ids = []
-
-        for chunk in retrieved_chunks:
-            if chunk.embedding is None:
-                continue
-
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(gt_embedding, chunk.embedding)
-
-            # If similarity exceeds threshold, consider it relevant
-            if similarity >= threshold:
-                relevant_chunk_ids.append(str(chunk.id))
-
-        return relevant_chunk_ids
-
-    def _calculate_mrr(self, retrieved: List[str], ground_truth: List[str]) -> float:
-        """
-        Mean Reciprocal Rank.
-
-        MRR = 1 / rank of first relevant item
-
-        Example:
-        - First relevant item at position 2 -> MRR = 1/2 = 0.5
-        - First relevant item at position 1 -> MRR = 1/1 = 1.0
-        - No relevant items -> MRR = 0.0
-        """
-        for i, chunk_id in enumerate(retrieved):
-            if chunk_id in ground_truth:
-                return 1.0 / (i + 1)
-        return 0.0
-
-    def _calculate_ndcg(
-        self,
-        retrieved: List[str],
-        ground_truth: List[str],
-        k: int
-    ) -> float:
-        """
-        Normalized Discounted Cumulative Gain at K.
-
-        NDCG considers both relevance and position:
-        - Items at top positions get higher weight
-        - Normalized to [0, 1] range
-
-        Formula:
-        DCG = Σ (relevance_i / log2(i + 2))
-        IDCG = DCG for perfect ranking
-        NDCG = DCG / IDCG
-        """
-        if not ground_truth:
-            return 0.0
-
-        # Calculate DCG
-        dcg = 0.0
-        for i, chunk_id in enumerate(retrieved[:k]):
-            relevance = 1.0 if chunk_id in ground_truth else 0.0
-            dcg += relevance / np.log2(i + 2)  # i+2 because i starts at 0
-
-        # Calculate IDCG (perfect ranking)
-        idcg = 0.0
-        for i in range(min(k, len(ground_truth))):
-            idcg += 1.0 / np.log2(i + 2)
-
-        return dcg / idcg if idcg > 0 else 0.0
-
-    def _calculate_precision(self, retrieved: List[str], ground_truth: List[str]) -> float:
-        """
-        Precision at K.
-
-        Precision = (# relevant items retrieved) / (# items retrieved)
-
-        Example:
-        - Retrieved 5 chunks, 4 are relevant -> P@5 = 4/5 = 0.8
-        """
-        if not retrieved:
-            return 0.0
-
-        relevant_retrieved = len(set(retrieved) & set(ground_truth))
-        return relevant_retrieved / len(retrieved)
-
-    def _calculate_recall(self, retrieved: List[str], ground_truth: List[str]) -> float:
-        """
-        Recall at K.
-
-        Recall = (# relevant items retrieved) / (# relevant items total)
+        # Text ground truth: chunks similar enough to the ground truth embedding
+        text_cases = np.array([
+            not case.ground_truth_chunk_ids and case.ground_truth_embedding is not None
+            for case in cases
+        ])
+        relevance[text_cases] = matched[text_cases]
+        rows = np.arange(len(cases))
+
+        # Prefix sums: hits and DCG (Σ relevance_i / log2(i + 2)) of the first n positions
+        discounts = 1.0 / np.log2(np.arange(width) + 2)
+        zeros = np.zeros((len(cases), 1))
+        cumulative_hits = np.hstack((zeros, np.cumsum(relevance, axis=1)))
+        cumulative_dcg = np.hstack((zeros, np.cumsum(relevance * discounts, axis=1)))
+        max_k = max(ks[-1] for ks in case_cutoffs)
+        ideal = np.concatenate(([0.0], np.cumsum(1.0 / np.log2(np.arange(max_k) + 2))))
+        found = relevance.any(axis=1)
+        first = relevance.argmax(axis=1)
+
+        # Text ground truth has no fixed relevant set: the matches within a
+        # cutoff are its relevant chunks, so metrics at k (in particular the
+        # primary ones at top_k) only depend on the top k chunks, whatever
+        # deeper cutoffs are configured
+        has_ground_truth = np.where(
+            text_cases, cumulative_hits[rows, np.minimum(lengths, top_ks)] > 0, num_relevant > 0
+        )
 
-        Example:
-        - 10 relevant chunks exist, retrieved 8 -> R@K = 8/10 = 0.8
-        """
-        if not ground_truth:
-            return 0.0
+        ground_truth_metrics = {}
+        for k in sorted({k for ks in case_cutoffs for k in ks}):
+            retrieved = np.minimum(lengths, k)
+            hits = cumulative_hits[rows, retrieved]
+            relevant = np.where(text_cases, hits.astype(np.int64), num_relevant)
+            # IDCG = DCG for perfect ranking
+            idcg = ideal[np.minimum(k, relevant)]
+            # Precision = relevant retrieved / retrieved, recall = relevant retrieved / relevant
+            precision = _safe_divide(hits, retrieved)
+            recall = _safe_divide(hits, relevant)
+            ground_truth_metrics[k] = [
+                # MRR = 1 / rank of first relevant item
+                (f"mrr@{k}", np.where(found & (first < k), 1.0 / (first + 1), 0.0).tolist()),
+                (f"ndcg@{k}", _safe_divide(cumulative_dcg[rows, retrieved], idcg).tolist()),
+                (f"precision@{k}", precision.tolist()),
+                (f"recall@{k}", recall.tolist()),
+                (f"f1@{k}", _safe_divide(2 * precision * recall, precision + recall).tolist()),
+                (f"hit_rate@{k}", (hits > 0).astype(np.float64).tolist()),
+            ]
+
+        # Diversity = 1 - average pairwise cosine similarity (1.0 without pairs)
+        diversity = np.where(pair_counts > 0, 1.0 - _safe_divide(similarities, pair_counts), 1.0)
+        avg_length = _safe_divide(content_lengths.sum(axis=1), np.minimum(lengths, top_ks))
+
+        results = []
+        rows = zip(case_cutoffs, top_ks.tolist(), has_ground_truth.tolist(), diversity.tolist(), avg_length.tolist())
+        for i, (ks, top_k, has_gt, diversity_i, avg_length_i) in enumerate(rows):
+            metrics = {}
+            if has_gt:
+                # Unsuffixed MRR is the one at the config's top_k
+                metrics["mrr"] = ground_truth_metrics[top_k][0][1][i]
+                for k in ks:
+                    for key, values in ground_truth_metrics[k]:
+                        metrics[key] = values[i]
+            metrics["diversity"] = diversity_i
+            metrics["avg_chunk_length"] = avg_length_i
+            results.append(metrics)
+        return results
 
-        relevant_retrieved = len(set(retrieved) & set(ground_truth))
-        return relevant_retrieved / len(ground_truth)
+    @staticmethod
+    def _relevance(cases, retrieved_codes: np.ndarray, id_codes: Dict[UUID, int]):
+        """Relevance matrix and ground truth sizes from explicit ground truth chunk IDs."""
+        num_cases, width = retrieved_codes.shape
+        num_relevant = np.zeros(num_cases, dtype=np.int64)
+        pair_codes = []
+        for i, case in enumerate(cases):
+            if not case.ground_truth_chunk_ids:
+                continue
+            num_relevant[i] = len(case.ground_truth_chunk_ids)
+            for chunk_id in case.ground_truth_chunk_ids:
+                code = id_codes.get(chunk_id if isinstance(chunk_id, UUID) else UUID(str(chunk_id)))
+                if code is not None:
+                    pair_codes.append(i * len(id_codes) + code)
 
-    def _calculate_f1(self, precision: float, recall: float) -> float:
-        """
-        F1 Score (harmonic mean of precision and recall).
+        if not pair_codes:
+            return np.zeros((num_cases, width), dtype=bool), num_relevant
 
-        F1 = 2 * (P * R) / (P + R)
+        # (case, chunk) pairs as single integers, so membership is one isin()
+        case_offsets = np.arange(num_cases, dtype=np.int64)[:, None] * len(id_codes)
+        relevance = np.isin(case_offsets + retrieved_codes, np.array(pair_codes, dtype=np.int64))
+        return relevance & (retrieved_codes >= 0), num_relevant
 
-        Balances precision and recall into single metric.
+    @staticmethod
+    def _embedding_metrics(
+        cases,
+        embedding_rows: np.ndarray,
+        vectors: List[Optional[np.ndarray]],
+        in_top_k: np.ndarray,
+    ):
         """
-        if precision + recall == 0:
-            return 0.0
-        return 2 * (precision * recall) / (precision + recall)
+        Embedding-based statistics of each result list.
 
-    def _calculate_hit_rate(self, retrieved: List[str], ground_truth: List[str]) -> float:
-        """
-        Hit Rate at K (binary: did we get ANY relevant item?).
+        Pairwise similarities only cover the top_k positions; ground truth
+        matching covers the whole list.
 
-        Hit Rate = 1 if any relevant item in top K, else 0
+        Returns:
+            (sum of pairwise cosine similarities, number of pairs, boolean
+            matrix of chunks matching the case's ground truth embedding)
         """
-        return 1.0 if any(chunk_id in ground_truth for chunk_id in retrieved) else 0.0
+        num_cases, width = embedding_rows.shape
+        totals = np.zeros(num_cases, dtype=np.float64)
+        counts = np.zeros(num_cases, dtype=np.int64)
+        matched = np.zeros((num_cases, width), dtype=bool)
+        if not vectors:
+            return totals, counts, matched
+
+        # Result lists of a config share one dimension; group by it
+        vector_dims = np.array([len(v) if v is not None else 0 for v in vectors] + [0], dtype=np.int64)
+        first = embedding_rows[np.arange(num_cases), np.argmax(embedding_rows >= 0, axis=1)]
+        dims = vector_dims[first]  # -1 (no embedded chunk) picks the trailing 0
+
+        upper = np.triu(np.ones((width, width), dtype=bool), k=1)
+        for dim in np.unique(dims[dims > 0]):
+            group = np.flatnonzero(dims == dim)
+            rows = embedding_rows[group]
+            present = rows >= 0
+            present_top_k = present & in_top_k[group]
+
+            # Unique chunks of this dimension, L2-normalized once, plus a zero row for gaps
+            used = np.unique(rows[present])
+            lookup = np.full(len(vectors), len(used), dtype=np.int64)
+            lookup[used] = np.arange(len(used))
+            matrix = np.zeros((len(used) + 1, dim), dtype=np.float32)
+            matrix[:-1] = np.stack([vectors[row] for row in used])
+            matrix[:-1] /= np.linalg.norm(matrix[:-1], axis=1, keepdims=True)
+            local = np.where(present, lookup[np.maximum(rows, 0)], len(used))
+
+            # Normalized ground truth embeddings (zero where absent or of another dimension);
+            # cases of the same query share one
+            target_ids: Dict[int, int] = {}
+            target_vectors = [np.zeros(dim, dtype=np.float32)]
+            target_index = np.zeros(len(group), dtype=np.int64)
+            for i, case_index in enumerate(group):
+                target = cases[case_index].ground_truth_embedding
+                if target is not None and len(target) == dim:
+                    key = id(target)
+                    if key not in target_ids:
+                        target_ids[key] = len(target_vectors)
+                        vector = np.asarray(target, dtype=np.float32)
+                        target_vectors.append(vector / np.linalg.norm(vector))
+                    target_index[i] = target_ids[key]
+            targets = np.stack(target_vectors)
+
+            pairs = present_top_k[:, :, None] & present_top_k[:, None, :] & upper
+            counts[group] = pairs.sum(axis=(1, 2))
+
+            if len(matrix) ** 2 <= _EMBEDDING_BLOCK_SIZE:
+                # Few distinct chunks: one Gram matrix for all of them, then lookups
+                gram = matrix @ matrix.T
+                totals[group] = (gram[local[:, :, None], local[:, None, :]] * pairs).sum(axis=(1, 2))
+                similarity = (matrix @ targets.T)[local, target_index[:, None]]
+                matched[group] = present & (similarity >= TEXT_GROUND_TRUTH_THRESHOLD)
+                continue
 
-    def _calculate_diversity(self, chunks: List[Chunk]) -> float:
-        """
-        Diversity score (how different are the retrieved chunks?).
+            # Otherwise gather each result list's vectors, a block of lists at a time
+            block = max(1, _EMBEDDING_BLOCK_SIZE // (width * int(dim)))
+            for start in range(0, len(group), block):
+                part = slice(start, start + block)
+                stacked = matrix[local[part]]
+                gram = np.matmul(stacked, stacked.transpose(0, 2, 1))
+                totals[group[part]] = (gram * pairs[part]).sum(axis=(1, 2))
+                similarity = np.einsum("mkd,md->mk", stacked, targets[target_index[part]])
+                matched[group[part]] = present[part] & (similarity >= TEXT_GROUND_TRUTH_THRESHOLD)
 
-        Calculates average pairwise cosine distance between chunks.
-        Higher diversity = less redundant information.
+        return totals, counts, matched
 
-        Range: [0, 1] where 1 = maximum diversity
-        """
-        if len(chunks) < 2:
-            return 1.0
-
-        # Calculate pairwise similarities
-        similarities = []
-        for i in range(len(chunks)):
-            for j in range(i + 1, len(chunks)):
-                if chunks[i].embedding is not None and chunks[j].embedding is not None:
-                    sim = self._cosine_similarity(
-                        chunks[i].embedding,
-                        chunks[j].embedding
-                    )
-                    similarities.append(sim)
-
-        if not similarities:
-            return 1.0
-
-        # Diversity = 1 - avg_similarity
-        avg_similarity = sum(similarities) / len(similarities)
-        return 1.0 - avg_similarity
-
-    def _calculate_avg_length(self, chunks: List[Chunk]) -> float:
-        """Average chunk length in characters."""
-        if not chunks:
-            return 0.0
-        return sum(len(c.content) for c in chunks) / len(chunks)
 
-    @staticmethod
-    def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
-        return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+def _safe_divide(numerator, denominator) -> np.ndarray:
+    """Element-wise division that yields 0.0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
@@ -1,5 +1,6 @@
 """Unified evaluation service that orchestrates all evaluators."""
 
+import time
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 
@@ -7,19 +8,32 @@ from app.models.chunk import Chunk
 from app.models.query import Query
 from app.models.config import Config
 from app.core.evaluation.basic_evaluator import BasicIREvaluator
+from app.core.evaluation.judge_cache import JudgeVerdictCache, VerdictKey
 from app.core.evaluation.llm_evaluator import LLMJudgeEvaluator
 from app.core.embedding import EmbeddingService
+from app.config import settings
 
 
 class EvaluationService:
     """Orchestrates all evaluation methods."""
 
-    def __init__(self, openai_api_key: Optional[str] = None):
-        """Initialize evaluation service."""
+    def __init__(
+        self,
+        openai_api_key: Optional[str] = None,
+        judge_verdicts: Optional[JudgeVerdictCache] = None,
+    ):
+        """
+        Initialize evaluation service.
+
+        Args:
+            openai_api_key: OpenAI API key (LLM-based evaluation is skipped without one)
+            judge_verdicts: Optional LLM judge verdict cache shared by the run
+        """
         self.basic_evaluator = BasicIREvaluator()
+        self.judge_verdicts = judge_verdicts
 
         if openai_api_key:
-            self.llm_evaluator = LLMJudgeEvaluator(api_key=openai_api_key)
+            self.llm_evaluator = LLMJudgeEvaluator(api_key=openai_api_key, verdicts=judge_verdicts)
             self.embedding_service = EmbeddingService(api_key=openai_api_key)
         else:
             self.llm_evaluator = None
@@ -30,16 +44,25 @@ class EvaluationService:
         query: Query,
         retrieved_chunks: List[Chunk],
         config: Config,
-        top_k: int = 5
+        top_k: int = 5,
+        ground_truth_embedding: Optional[List[float]] = None,
+        basic_metrics: Optional[Dict[str, float]] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
         """
         Run complete evaluation pipeline.
 
         Args:
             query: Query object
-            retrieved_chunks: Retrieved chunks
+            retrieved_chunks: Retrieved chunks, ideally retrieval_depth(config) of them
+                (only the first top_k are judged)
             config: Config with evaluation settings
             top_k: Number of top chunks to evaluate
+            ground_truth_embedding: Optional precomputed embedding of query.ground_truth
+            basic_metrics: Optional precomputed basic IR metrics (see
+                BasicIREvaluator.evaluate_batch); skips phase 1
+            timings: Optional dict receiving the wall time in ms of the phases
+                that ran ("ir_evaluation", "llm_judge")
 
         Returns:
             Complete evaluation results with all metrics
@@ -48,28 +71,37 @@ class EvaluationService:
         total_cost = 0.0
 
         # PHASE 1: Basic IR metrics (always run, free)
-        basic_metrics = await self.basic_evaluator.evaluate(
-            query=query,
-            retrieved_chunks=retrieved_chunks,
-            embedding_service=self.embedding_service,
-            embedding_model=config.embedding_model,
-            ground_truth_chunk_ids=query.ground_truth_chunk_ids,
-            top_k=top_k
-        )
+        if basic_metrics is None:
+            start = time.perf_counter()
+            basic_metrics = await self.basic_evaluator.evaluate(
+                query=query,
+                retrieved_chunks=retrieved_chunks,
+                embedding_service=self.embedding_service,
+                embedding_model=config.embedding_model,
+                ground_truth_chunk_ids=query.ground_truth_chunk_ids,
+                top_k=top_k,
+                ground_truth_embedding=ground_truth_embedding,
+                cutoffs=self.get_cutoffs(config),
+            )
+            if timings is not None:
+                timings["ir_evaluation"] = (time.perf_counter() - start) * 1000
         all_metrics["basic"] = basic_metrics
 
         # PHASE 2: LLM Judge (optional, costs money)
         eval_settings = config.evaluation_settings or {}
+        llm_model = self.get_judge_model(config)
 
-        if eval_settings.get("use_llm_judge") and self.llm_evaluator:
-            llm_model = eval_settings.get("llm_judge_model", "gpt-3.5-turbo")
-
+        if llm_model and self.llm_evaluator:
+            start = time.perf_counter()
             llm_metrics = await self.llm_evaluator.evaluate(
                 query_text=query.query_text,
-                chunks=retrieved_chunks,
+                chunks=retrieved_chunks[:top_k],
                 model=llm_model,
-                top_k=top_k
+                top_k=top_k,
+                mode=self.get_judge_mode(config),
             )
+            if timings is not None:
+                timings["llm_judge"] = (time.perf_counter() - start) * 1000
 
             all_metrics["llm_judge"] = llm_metrics
             total_cost += llm_metrics.get("llm_eval_cost_usd", 0)
@@ -85,6 +117,90 @@ class EvaluationService:
             "top_k": top_k
         }
 
+    @staticmethod
+    def get_judge_model(config: Config) -> Optional[str]:
+        """
+        LLM judge model of a config.
+
+        Args:
+            config: Config with evaluation settings
+
+        Returns:
+            Judge model name, or None if the LLM judge is disabled
+        """
+        eval_settings = config.evaluation_settings or {}
+        if not eval_settings.get("use_llm_judge"):
+            return None
+        return eval_settings.get("llm_judge_model", "gpt-3.5-turbo")
+
+    @staticmethod
+    def get_judge_mode(config: Config) -> str:
+        """
+        LLM judge mode of a config: "pointwise" (default) or "listwise".
+
+        Args:
+            config: Config with evaluation settings
+
+        Returns:
+            Judge mode
+        """
+        eval_settings = config.evaluation_settings or {}
+        return eval_settings.get("llm_judge_mode") or "pointwise"
+
+    @staticmethod
+    def judge_verdict_keys(
+        query: Query, retrieved_chunks: List[Chunk], config: Config, top_k: int
+    ) -> List[VerdictKey]:
+        """
+        Verdict cache keys evaluate_retrieval() will look up for a cell.
+
+        Args:
+            query: Query object
+            retrieved_chunks: Retrieved chunks
+            config: Config with evaluation settings
+            top_k: Number of top chunks to evaluate
+
+        Returns:
+            Keys to prefetch (empty if the LLM judge is disabled)
+        """
+        model = EvaluationService.get_judge_model(config)
+        if model is None:
+            return []
+        mode = EvaluationService.get_judge_mode(config)
+        return [
+            LLMJudgeEvaluator.verdict_key(query.query_text, chunk.content, model, mode)
+            for chunk in retrieved_chunks[:top_k]
+        ]
+
+    @staticmethod
+    def get_cutoffs(config: Config) -> List[int]:
+        """
+        Cutoffs at which a config's @k metrics are computed (besides its top_k).
+
+        Args:
+            config: Config, optionally with evaluation_settings["cutoffs"]
+
+        Returns:
+            Sorted distinct cutoffs
+        """
+        eval_settings = config.evaluation_settings or {}
+        cutoffs = eval_settings.get("cutoffs", settings.EVALUATION_CUTOFFS)
+        return sorted({int(k) for k in cutoffs if int(k) > 0})
+
+    @staticmethod
+    def retrieval_depth(config: Config, top_k: Optional[int] = None) -> int:
+        """
+        Number of chunks to retrieve so every cutoff can be evaluated in one pass.
+
+        Args:
+            config: Config
+            top_k: Effective top_k (defaults to config.top_k)
+
+        Returns:
+            max(top_k, *cutoffs)
+        """
+        return max([top_k or config.top_k, *EvaluationService.get_cutoffs(config)])
+
     @staticmethod
     def get_primary_score(metrics: Dict[str, Any]) -> float:
         """
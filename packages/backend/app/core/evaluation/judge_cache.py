@@ -0,0 +1,145 @@
+"""LLM judge verdict cache backed by Postgres."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.judge_verdict import JudgeVerdictEntry
+
+# (judge model, prompt version, sha256 of normalized query, sha256 of judged chunk text)
+VerdictKey = Tuple[str, str, str, str]
+
+
+class JudgeVerdictCache:
+    """
+    Judge verdicts of one run, backed by the judge_verdicts table.
+
+    prefetch() loads persisted verdicts in bulk before the run fans out;
+    get_or_judge() serves them and coalesces concurrent judgements of the
+    same key (configs of one experiment often retrieve the same chunk for
+    a query); flush() writes the verdicts judged since the last flush to
+    the caller's transaction. Failed judgements are not cached.
+    """
+
+    # Keep IN (...) lists and multi-row inserts at a reasonable size
+    BATCH_SIZE = 1000
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._verdicts: Dict[VerdictKey, dict] = {}
+        self._inflight: Dict[VerdictKey, asyncio.Future] = {}
+        self._pending: Dict[VerdictKey, dict] = {}
+
+    async def prefetch(self, db: AsyncSession, keys: Iterable[VerdictKey]) -> None:
+        """
+        Load persisted verdicts for the given keys.
+
+        Args:
+            db: Database session
+            keys: Keys the run is about to judge
+        """
+        by_prompt: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        for key in set(keys):
+            if key not in self._verdicts:
+                by_prompt.setdefault(key[:2], []).append(key[2:])
+
+        for (model, prompt_version), pairs in by_prompt.items():
+            for start in range(0, len(pairs), self.BATCH_SIZE):
+                batch = pairs[start:start + self.BATCH_SIZE]
+                query = (
+                    select(
+                        JudgeVerdictEntry.query_hash,
+                        JudgeVerdictEntry.chunk_hash,
+                        JudgeVerdictEntry.verdict,
+                    )
+                    .where(JudgeVerdictEntry.model == model)
+                    .where(JudgeVerdictEntry.prompt_version == prompt_version)
+                    .where(
+                        tuple_(JudgeVerdictEntry.query_hash, JudgeVerdictEntry.chunk_hash).in_(batch)
+                    )
+                )
+                result = await db.execute(query)
+                for query_hash, chunk_hash, verdict in result.all():
+                    self._verdicts[(model, prompt_version, query_hash, chunk_hash)] = verdict
+
+    def get(self, key: VerdictKey) -> dict | None:
+        """Return a loaded or already judged verdict."""
+        return self._verdicts.get(key)
+
+    def put(self, key: VerdictKey, verdict: dict) -> None:
+        """Record a verdict judged outside get_or_judge() (e.g. in a listwise request)."""
+        self._verdicts[key] = verdict
+        self._pending[key] = verdict
+
+    async def get_or_judge(
+        self,
+        key: VerdictKey,
+        judge: Callable[[], Awaitable[dict]],
+    ) -> Tuple[dict, bool]:
+        """
+        Return a cached verdict or ask the judge.
+
+        Args:
+            key: Verdict key
+            judge: Coroutine factory calling the judge model
+
+        Returns:
+            (verdict, hit) where hit is True if this call did not invoke the judge
+        """
+        verdict = self._verdicts.get(key)
+        if verdict is not None:
+            return verdict, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            verdict = await judge()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(verdict)
+        self.put(key, verdict)
+        return verdict, False
+
+    async def flush(self, db: AsyncSession) -> None:
+        """
+        Store verdicts judged since the last flush (existing entries are left untouched).
+
+        Args:
+            db: Database session (the caller commits)
+        """
+        pending, self._pending = self._pending, {}
+        rows = [
+            {
+                "model": model,
+                "prompt_version": prompt_version,
+                "query_hash": query_hash,
+                "chunk_hash": chunk_hash,
+                "verdict": verdict,
+            }
+            for (model, prompt_version, query_hash, chunk_hash), verdict in pending.items()
+        ]
+
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            stmt = (
+                insert(JudgeVerdictEntry)
+                .values(rows[start:start + self.BATCH_SIZE])
+                .on_conflict_do_nothing(
+                    index_elements=["model", "prompt_version", "query_hash", "chunk_hash"]
+                )
+            )
+            await db.execute(stmt)
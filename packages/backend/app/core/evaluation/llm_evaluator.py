@@ -2,11 +2,32 @@
 
 import asyncio
 import json
-from typing import List, Dict, Any
-from openai import AsyncOpenAI
-
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.openai_client import get_openai_client
+from app.core.embedding_cache import text_hash
+from app.core.evaluation.judge_cache import JudgeVerdictCache, VerdictKey
+from app.core.query_cache import normalize_query_text
 from app.models.chunk import Chunk
 
+JUDGE_MODES = ("pointwise", "listwise")
+
+
+class ListwiseParseError(ValueError):
+    """A listwise judge response did not contain one valid score per chunk."""
+
+    def __init__(self, message: str, cost_usd: float):
+        super().__init__(message)
+        self.cost_usd = cost_usd
+
+
+def _judge_integer(value: Any, field: str) -> int:
+    """A judge response field as an int; bools, strings and fractions are rejected."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or (
+        isinstance(value, float) and not value.is_integer()
+    ):
+        raise ValueError(f"{field} {value!r} is not an integer")
+    return int(value)
+
 
 class LLMJudgeEvaluator:
     """Evaluate retrieval quality using LLM as judge."""
@@ -15,42 +36,95 @@ class LLMJudgeEvaluator:
     COST_PER_1K_INPUT_TOKENS = 0.0015
     COST_PER_1K_OUTPUT_TOKENS = 0.002
 
-    def __init__(self, api_key: str):
-        """Initialize with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+    # Bump whenever a prompt or its response parsing changes (invalidates cached verdicts)
+    PROMPT_VERSION = "v1"
+    LISTWISE_PROMPT_VERSION = "list-v2"
+
+    # Chunk text shown to the judge
+    MAX_CHUNK_CHARS = 1000
+
+    def __init__(self, api_key: str, verdicts: Optional[JudgeVerdictCache] = None):
+        """
+        Initialize with OpenAI API key.
+
+        Args:
+            api_key: OpenAI API key
+            verdicts: Optional verdict cache consulted before calling the API
+        """
+        self.client = get_openai_client(api_key)
+        self.verdicts = verdicts
+
+    @classmethod
+    def verdict_key(
+        cls, query_text: str, chunk_content: str, model: str, mode: str = "pointwise"
+    ) -> VerdictKey:
+        """
+        Cache key of a judgement: only what the judge actually sees.
+
+        Args:
+            query_text: The user query
+            chunk_content: Full chunk text (truncated like the prompt)
+            model: Judge model
+            mode: Judge mode (pointwise and listwise verdicts are cached separately)
+
+        Returns:
+            (model, prompt version, query hash, chunk hash)
+        """
+        return (
+            model,
+            cls.LISTWISE_PROMPT_VERSION if mode == "listwise" else cls.PROMPT_VERSION,
+            text_hash(normalize_query_text(query_text)),
+            text_hash(chunk_content[:cls.MAX_CHUNK_CHARS]),
+        )
 
     async def evaluate(
         self,
         query_text: str,
         chunks: List[Chunk],
         model: str = "gpt-3.5-turbo",
-        top_k: int = 5
+        top_k: int = 5,
+        mode: str = "pointwise",
     ) -> Dict[str, Any]:
         """
         Evaluate chunks using LLM judge.
 
+        Pointwise mode sends one request per chunk. Listwise mode scores all
+        uncached chunks in a single request (falling back to pointwise if
+        the response can't be parsed), cutting judge calls by ~top_k.
+
         Args:
             query_text: The user query
             chunks: Retrieved chunks to evaluate
             model: OpenAI model to use
             top_k: Number of chunks to evaluate
+            mode: "pointwise" or "listwise"
 
         Returns:
             Dictionary with scores and reasoning
         """
-        # Evaluate chunks in parallel
-        tasks = [
-            self._evaluate_single_chunk(query_text, chunk, model)
-            for chunk in chunks[:top_k]
-        ]
+        if mode not in JUDGE_MODES:
+            raise ValueError(f"Unknown LLM judge mode: {mode}")
 
-        results = await asyncio.gather(*tasks)
+        if mode == "listwise":
+            results, judge_calls, overhead_cost = await self._evaluate_listwise(
+                query_text, chunks[:top_k], model
+            )
+        else:
+            # Evaluate chunks in parallel
+            tasks = [
+                self._evaluate_single_chunk(query_text, chunk, model)
+                for chunk in chunks[:top_k]
+            ]
+            results = await asyncio.gather(*tasks)
+            judge_calls = sum(1 for r in results if not r.get("cached"))
+            overhead_cost = 0.0
 
         # Extract scores
         scores = [r["score"] for r in results]
 
-        # Calculate cost
-        total_cost = sum(r["cost_usd"] for r in results)
+        # Calculate cost (including failed listwise attempts)
+        total_cost = sum(r["cost_usd"] for r in results) + overhead_cost
+        cache_hits = sum(1 for r in results if r.get("cached"))
 
         return {
             "llm_avg_score": sum(scores) / len(scores) if scores else 0,
@@ -60,7 +134,11 @@ class LLMJudgeEvaluator:
             "llm_chunk_scores": scores,
             "llm_chunk_evaluations": results,
             "llm_judge_model": model,
-            "llm_eval_cost_usd": round(total_cost, 4)
+            "llm_judge_mode": mode,
+            "llm_judge_calls": judge_calls,
+            "llm_eval_cost_usd": round(total_cost, 4),
+            "llm_judge_cache_hits": cache_hits,
+            "llm_judge_cache_misses": len(results) - cache_hits,
         }
 
     async def _evaluate_single_chunk(
@@ -69,56 +147,195 @@ class LLMJudgeEvaluator:
         chunk: Chunk,
         model: str
     ) -> Dict[str, Any]:
-        """Evaluate a single chunk's relevance."""
+        """Evaluate a single chunk's relevance (from the verdict cache when possible)."""
+        try:
+            if self.verdicts is None:
+                verdict, cached = await self._judge(query, chunk.content, model), False
+            else:
+                verdict, cached = await self.verdicts.get_or_judge(
+                    self.verdict_key(query, chunk.content, model),
+                    lambda: self._judge(query, chunk.content, model),
+                )
+        except Exception as e:
+            return self._error_result(chunk, e)
+
+        return self._chunk_result(chunk, verdict, cached)
 
-        prompt = self._build_evaluation_prompt(query, chunk.content)
+    async def _evaluate_listwise(
+        self,
+        query: str,
+        chunks: List[Chunk],
+        model: str
+    ) -> Tuple[List[Dict[str, Any]], int, float]:
+        """
+        Evaluate chunks with one listwise request for the uncached ones.
+
+        Returns:
+            (per-chunk results, number of judge calls, cost of failed listwise calls)
+        """
+        keys = [self.verdict_key(query, chunk.content, model, "listwise") for chunk in chunks]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+        misses = []
+        for i, (chunk, key) in enumerate(zip(chunks, keys)):
+            verdict = self.verdicts.get(key) if self.verdicts is not None else None
+            if verdict is not None:
+                results[i] = self._chunk_result(chunk, verdict, cached=True)
+            else:
+                misses.append(i)
+
+        if not misses:
+            return results, 0, 0.0
 
         try:
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert evaluator for retrieval systems. Rate retrieved chunks objectively."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0,
-                max_tokens=200
+            verdicts = await self._judge_listwise(
+                query, [chunks[i].content for i in misses], model
             )
+        except ListwiseParseError as e:
+            # Fall back to one request per chunk (pointwise verdicts are cached as such)
+            fallback = await asyncio.gather(*[
+                self._evaluate_single_chunk(query, chunks[i], model) for i in misses
+            ])
+            for i, result in zip(misses, fallback):
+                results[i] = result
+            return results, 1 + sum(1 for r in fallback if not r.get("cached")), e.cost_usd
+        except Exception as e:
+            for i in misses:
+                results[i] = self._error_result(chunks[i], e)
+            return results, 1, 0.0
 
-            # Parse JSON response
-            result = json.loads(response.choices[0].message.content)
+        for i, verdict in zip(misses, verdicts):
+            if self.verdicts is not None:
+                self.verdicts.put(keys[i], verdict)
+            results[i] = self._chunk_result(chunks[i], verdict, cached=False)
+        return results, 1, 0.0
 
-            # Calculate cost
-            usage = response.usage
-            cost_usd = (
-                (usage.prompt_tokens / 1000) * self.COST_PER_1K_INPUT_TOKENS +
-                (usage.completion_tokens / 1000) * self.COST_PER_1K_OUTPUT_TOKENS
-            )
+    @staticmethod
+    def _chunk_result(chunk: Chunk, verdict: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        """Per-chunk evaluation entry from a verdict."""
+        return {
+            "chunk_id": str(chunk.id),
+            "score": verdict["score"],
+            "reasoning": verdict["reasoning"],
+            "key_points": verdict["key_points"],
+            # A cached verdict was paid for by an earlier cell or run
+            "cost_usd": 0 if cached else verdict["cost_usd"],
+            "tokens_used": 0 if cached else verdict["tokens_used"],
+            "cached": cached,
+        }
 
-            return {
-                "chunk_id": str(chunk.id),
-                "score": result.get("score", 0),
-                "reasoning": result.get("reasoning", ""),
-                "key_points": result.get("key_points", []),
-                "cost_usd": cost_usd,
-                "tokens_used": usage.total_tokens
-            }
+    @staticmethod
+    def _error_result(chunk: Chunk, error: Exception) -> Dict[str, Any]:
+        """Per-chunk evaluation entry for a failed judgement."""
+        return {
+            "chunk_id": str(chunk.id),
+            "score": 0,
+            "reasoning": f"Error: {str(error)}",
+            "error": str(error),
+            "cost_usd": 0,
+            "tokens_used": 0
+        }
 
-        except Exception as e:
-            return {
-                "chunk_id": str(chunk.id),
-                "score": 0,
-                "reasoning": f"Error: {str(e)}",
-                "error": str(e),
-                "cost_usd": 0,
-                "tokens_used": 0
-            }
+    async def _judge(self, query: str, chunk_content: str, model: str) -> Dict[str, Any]:
+        """Ask the judge model for a verdict (raises on API or parsing errors)."""
+        prompt = self._build_evaluation_prompt(query, chunk_content)
+
+        response = await self.client.create_chat_completion(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert evaluator for retrieval systems. Rate retrieved chunks objectively."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=200
+        )
+
+        # Parse JSON response; a verdict without a valid score must never be cached
+        result = json.loads(response.choices[0].message.content)
+        try:
+            score = _judge_integer(result.get("score") if isinstance(result, dict) else None, "score")
+        except ValueError as e:
+            raise ValueError(f"Invalid judge response: {e}") from e
+        if not 1 <= score <= 5:
+            raise ValueError(f"Invalid judge response: score {score} out of range")
+
+        # Calculate cost
+        usage = response.usage
+        cost_usd = (
+            (usage.prompt_tokens / 1000) * self.COST_PER_1K_INPUT_TOKENS +
+            (usage.completion_tokens / 1000) * self.COST_PER_1K_OUTPUT_TOKENS
+        )
+
+        return {
+            "score": score,
+            "reasoning": result.get("reasoning", ""),
+            "key_points": result.get("key_points", []),
+            "cost_usd": cost_usd,
+            "tokens_used": usage.total_tokens
+        }
+
+    async def _judge_listwise(
+        self, query: str, chunk_contents: List[str], model: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Ask the judge model for verdicts on all chunks in one request.
+
+        The request's cost and tokens are split evenly across the verdicts.
+
+        Raises:
+            ListwiseParseError: If the response lacks a valid score for some chunk
+        """
+        prompt = self._build_listwise_prompt(query, chunk_contents)
+
+        response = await self.client.create_chat_completion(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert evaluator for retrieval systems. Rate retrieved chunks objectively."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=50 + 100 * len(chunk_contents)
+        )
+
+        usage = response.usage
+        cost_usd = (
+            (usage.prompt_tokens / 1000) * self.COST_PER_1K_INPUT_TOKENS +
+            (usage.completion_tokens / 1000) * self.COST_PER_1K_OUTPUT_TOKENS
+        )
+
+        try:
+            result = json.loads(response.choices[0].message.content)
+            entries = {_judge_integer(entry["index"], "index"): entry for entry in result["scores"]}
+            verdicts = []
+            for index in range(1, len(chunk_contents) + 1):
+                entry = entries[index]
+                score = _judge_integer(entry["score"], "score")
+                if not 1 <= score <= 5:
+                    raise ValueError(f"score {score} out of range")
+                verdicts.append({
+                    "score": score,
+                    "reasoning": entry.get("reasoning", ""),
+                    "key_points": entry.get("key_points", []),
+                    "cost_usd": cost_usd / len(chunk_contents),
+                    "tokens_used": round(usage.total_tokens / len(chunk_contents)),
+                })
+        except (ValueError, KeyError, TypeError) as e:
+            raise ListwiseParseError(f"Invalid listwise judge response: {e!r}", cost_usd) from e
+
+        return verdicts
 
     def _build_evaluation_prompt(self, query: str, chunk: str) -> str:
         """Build evaluation prompt for LLM judge."""
@@ -128,7 +345,7 @@ class LLMJudgeEvaluator:
 
 **Retrieved Chunk:**
 ```
-{chunk[:1000]}
+{chunk[:self.MAX_CHUNK_CHARS]}
 ```
 
 Rate this chunk's relevance on a scale of 1-5:
@@ -145,10 +362,45 @@ Respond in JSON format:
   "key_points": ["<relevant point 1>", "<relevant point 2>"]
 }}
 
+Be objective and consistent in your scoring."""
+
+    def _build_listwise_prompt(self, query: str, chunks: List[str]) -> str:
+        """Build listwise evaluation prompt covering all chunks."""
+        chunk_sections = "\n\n".join(
+            f"**[{index}]**\n```\n{chunk[:self.MAX_CHUNK_CHARS]}\n```"
+            for index, chunk in enumerate(chunks, start=1)
+        )
+        return f"""You are evaluating how well each of several retrieved chunks answers a user's query.
+
+**Query:** "{query}"
+
+**Retrieved Chunks:**
+
+{chunk_sections}
+
+Rate each chunk's relevance independently on a scale of 1-5:
+- **5**: Perfectly answers the query, contains all key information
+- **4**: Highly relevant, contains most key information
+- **3**: Somewhat relevant, contains partial information
+- **2**: Marginally relevant, tangentially related
+- **1**: Not relevant at all
+
+Respond in JSON format with exactly one entry per chunk ({len(chunks)} in total):
+{{
+  "scores": [
+    {{"index": <chunk number>, "score": <1-5>, "reasoning": "<one sentence>"}}
+  ]
+}}
+
 Be objective and consistent in your scoring."""
 
     @staticmethod
-    def estimate_cost(num_queries: int, chunks_per_query: int, model: str = "gpt-3.5-turbo") -> float:
+    def estimate_cost(
+        num_queries: int,
+        chunks_per_query: int,
+        model: str = "gpt-3.5-turbo",
+        mode: str = "pointwise",
+    ) -> float:
         """
         Estimate cost for evaluation.
 
@@ -156,22 +408,32 @@ Be objective and consistent in your scoring."""
             num_queries: Number of queries to evaluate
             chunks_per_query: Chunks per query (typically top_k)
             model: OpenAI model
+            mode: "pointwise" or "listwise"
 
         Returns:
             Estimated cost in USD
         """
-        # Rough estimate: ~500 tokens input + 100 tokens output per chunk
         total_chunks = num_queries * chunks_per_query
 
+        if mode == "listwise":
+            # Rough estimate: ~250 tokens of instructions per request plus
+            # ~300 input + 40 output tokens per chunk
+            input_tokens = num_queries * 250 + total_chunks * 300
+            output_tokens = total_chunks * 40
+        else:
+            # Rough estimate: ~500 tokens input + 100 tokens output per chunk
+            input_tokens = total_chunks * 500
+            output_tokens = total_chunks * 100
+
         if model == "gpt-3.5-turbo":
-            input_cost = (total_chunks * 500 / 1000) * 0.0015
-            output_cost = (total_chunks * 100 / 1000) * 0.002
+            input_cost = (input_tokens / 1000) * 0.0015
+            output_cost = (output_tokens / 1000) * 0.002
         elif model == "gpt-4-turbo":
-            input_cost = (total_chunks * 500 / 1000) * 0.01
-            output_cost = (total_chunks * 100 / 1000) * 0.03
+            input_cost = (input_tokens / 1000) * 0.01
+            output_cost = (output_tokens / 1000) * 0.03
         else:
             # Default to GPT-3.5 pricing
-            input_cost = (total_chunks * 500 / 1000) * 0.0015
-            output_cost = (total_chunks * 100 / 1000) * 0.002
+            input_cost = (input_tokens / 1000) * 0.0015
+            output_cost = (output_tokens / 1000) * 0.002
 
         return round(input_cost + output_cost, 4)
@@ -1,8 +1,10 @@
 """Answer generation service for RAG pipeline."""
 
 from typing import List, Dict, Any
-from openai import AsyncOpenAI
-
+from app.config import settings
+from app.core.context_packing import PackedContext, pack_context
+from app.core.openai_client import get_openai_client
+from app.core.generation_cache import GenerationCache, generation_key
 from app.models.chunk import Chunk
 
 
@@ -36,9 +38,16 @@ class AnswerGenerationService:
         "gpt-3.5-turbo": {"input": 0.0015, "output": 0.002},
     }
 
-    def __init__(self, api_key: str):
-        """Initialize with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, cache: GenerationCache | None = None):
+        """
+        Initialize with OpenAI API key.
+
+        Args:
+            api_key: OpenAI API key
+            cache: Optional cache consulted for temperature-0 generations
+        """
+        self.client = get_openai_client(api_key)
+        self.cache = cache
 
     async def generate_answer(
         self,
@@ -48,6 +57,7 @@ class AnswerGenerationService:
         temperature: float = 0.0,
         max_tokens: int = 500,
         prompt_template: str | None = None,
+        context_token_budget: int | None = None,
     ) -> Dict[str, Any]:
         """
         Generate answer from retrieved chunks.
@@ -59,62 +69,34 @@ class AnswerGenerationService:
             temperature: Temperature for generation (0 = deterministic)
             max_tokens: Maximum tokens to generate
             prompt_template: Custom prompt template (uses default if None)
+            context_token_budget: Max chunk tokens in the prompt (uses settings if None)
 
         Returns:
             Dictionary with:
             - answer: Generated answer text
             - model: Model used
             - tokens_used: Total tokens used
-            - cost_usd: Cost in USD
+            - cost_usd: Cost in USD (0 for cached answers)
             - chunks_used: Number of chunks used
+            - cached: Whether the answer came from the generation cache
+            - context_chunks: Chunk texts packed into the prompt
+            - context: Packing statistics (see PackedContext)
         """
-        # Build context from chunks
-        context = self._build_context(chunks)
-
-        # Build prompt
-        template = prompt_template or DEFAULT_PROMPT_TEMPLATE
-        prompt = template.format(
-            context=context,
-            question=query_text,
-            top_k=len(chunks)
-        )
+        packed = self.pack_chunks(chunks, model, context_token_budget)
+        prompt = self.build_prompt(query_text, packed.texts, prompt_template)
+        context_stats = {
+            **packed.stats(),
+            "token_budget": context_token_budget or settings.GENERATION_CONTEXT_TOKEN_BUDGET,
+        }
 
         try:
-            # Generate answer
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-
-            answer = response.choices[0].message.content or ""
-
-            # Calculate cost
-            usage = response.usage
-            cost_usd = self._calculate_cost(
-                model=model,
-                input_tokens=usage.prompt_tokens,
-                output_tokens=usage.completion_tokens
-            )
-
-            return {
-                "answer": answer.strip(),
-                "model": model,
-                "tokens_used": usage.total_tokens,
-                "prompt_tokens": usage.prompt_tokens,
-                "completion_tokens": usage.completion_tokens,
-                "cost_usd": cost_usd,
-                "chunks_used": len(chunks),
-                "temperature": temperature,
-                "prompt_sent": prompt,  # Full prompt sent to LLM
-            }
-
+            key = self.cache_key(model, temperature, max_tokens, prompt)
+            if self.cache is None or key is None:
+                completion, cached = await self._complete(prompt, model, temperature, max_tokens), False
+            else:
+                completion, cached = await self.cache.get_or_generate(
+                    key, lambda: self._complete(prompt, model, temperature, max_tokens)
+                )
         except Exception as e:
             return {
                 "answer": f"Error generating answer: {str(e)}",
@@ -123,11 +105,132 @@ class AnswerGenerationService:
                 "prompt_tokens": 0,
                 "completion_tokens": 0,
                 "cost_usd": 0.0,
-                "chunks_used": len(chunks),
+                "chunks_used": len(packed.texts),
+                "context": context_stats,
                 "error": str(e),
             }
 
-    def _build_context(self, chunks: List[Chunk]) -> str:
+        prompt_tokens = completion["prompt_tokens"]
+        completion_tokens = completion["completion_tokens"]
+        return {
+            "answer": completion["answer"],
+            "model": model,
+            "tokens_used": prompt_tokens + completion_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            # A cached answer was paid for by an earlier cell or run
+            "cost_usd": 0.0 if cached else self._calculate_cost(
+                model=model,
+                input_tokens=prompt_tokens,
+                output_tokens=completion_tokens
+            ),
+            "chunks_used": len(packed.texts),
+            "temperature": temperature,
+            "prompt_sent": prompt,  # Full prompt sent to LLM
+            "cached": cached,
+            "context_chunks": packed.texts,
+            "context": context_stats,
+        }
+
+    @staticmethod
+    def pack_chunks(
+        chunks: List[Chunk],
+        model: str,
+        context_token_budget: int | None = None,
+    ) -> PackedContext:
+        """
+        Pack retrieved chunks into the context token budget.
+
+        Args:
+            chunks: Retrieved chunks, best first
+            model: Model whose tokenizer counts the budget
+            context_token_budget: Max chunk tokens (uses settings if None)
+
+        Returns:
+            PackedContext (deduplicated, lowest-ranked chunks truncated/dropped)
+        """
+        return pack_context(
+            [chunk.content for chunk in chunks],
+            model,
+            context_token_budget or settings.GENERATION_CONTEXT_TOKEN_BUDGET,
+        )
+
+    def build_prompt(
+        self,
+        query_text: str,
+        context_texts: List[str],
+        prompt_template: str | None = None,
+    ) -> str:
+        """
+        Render the generation prompt for a query and its packed context.
+
+        Args:
+            query_text: The user's question
+            context_texts: Packed chunk texts (see pack_chunks)
+            prompt_template: Custom prompt template (uses default if None)
+
+        Returns:
+            Prompt sent to the model
+        """
+        # Build context from chunks
+        context = self._build_context(context_texts)
+
+        # Build prompt
+        template = prompt_template or DEFAULT_PROMPT_TEMPLATE
+        return template.format(
+            context=context,
+            question=query_text,
+            top_k=len(context_texts)
+        )
+
+    @staticmethod
+    def cache_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str | None:
+        """
+        Generation cache key, or None if the request isn't deterministic enough to cache.
+
+        Args:
+            model: OpenAI model
+            temperature: Sampling temperature (only 0 is cached)
+            max_tokens: Maximum tokens to generate
+            prompt: Rendered prompt
+
+        Returns:
+            SHA-256 hex digest of the request, or None
+        """
+        if temperature != 0:
+            return None
+        return generation_key(model, temperature, max_tokens, prompt)
+
+    async def _complete(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> Dict[str, Any]:
+        """Call the chat API (raises on errors)."""
+        response = await self.client.create_chat_completion(
+            model=model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+        answer = response.choices[0].message.content or ""
+        usage = response.usage
+        return {
+            "model": model,
+            "answer": answer.strip(),
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+        }
+
+    def _build_context(self, context_texts: List[str]) -> str:
         """
         Build context string from chunks.
 
@@ -143,9 +246,9 @@ class AnswerGenerationService:
         """
         context_parts = []
 
-        for i, chunk in enumerate(chunks, 1):
+        for i, text in enumerate(context_texts, 1):
             context_parts.append(f"--- Chunk {i} ---")
-            context_parts.append(chunk.content)
+            context_parts.append(text)
             context_parts.append("")  # Empty line between chunks
 
         return "\n".join(context_parts)
@@ -177,4 +280,5 @@ class AnswerGenerationService:
             "model": "gpt-4o-mini",
             "temperature": 0.0,
             "max_tokens": 500,
+            "context_token_budget": settings.GENERATION_CONTEXT_TOKEN_BUDGET,
         }
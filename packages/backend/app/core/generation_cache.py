@@ -0,0 +1,127 @@
+"""Deterministic answer generation cache backed by Postgres."""
+
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Iterable, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generation_cache import GenerationCacheEntry
+
+
+def generation_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    """SHA-256 hex digest of a generation request (cache key)."""
+    payload = json.dumps([model, float(temperature), int(max_tokens), prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    Generated answers of one run, backed by the generation_cache table.
+
+    Only temperature-0 generations are cacheable (see
+    AnswerGenerationService). prefetch() loads persisted answers in bulk
+    before the run fans out; get_or_generate() serves them and coalesces
+    concurrent identical requests; flush() writes new answers to the
+    caller's transaction. Failed generations are not cached.
+
+    Completions are dicts with model, answer, prompt_tokens and
+    completion_tokens.
+    """
+
+    # Keep IN (...) lists and multi-row inserts at a reasonable size
+    BATCH_SIZE = 1000
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._completions: Dict[str, dict] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: Dict[str, dict] = {}
+
+    async def prefetch(self, db: AsyncSession, keys: Iterable[str]) -> None:
+        """
+        Load persisted completions for the given keys.
+
+        Args:
+            db: Database session
+            keys: Keys (see generation_key) the run is about to generate
+        """
+        missing = [key for key in set(keys) if key not in self._completions]
+
+        for start in range(0, len(missing), self.BATCH_SIZE):
+            batch = missing[start:start + self.BATCH_SIZE]
+            query = select(GenerationCacheEntry).where(GenerationCacheEntry.prompt_hash.in_(batch))
+            result = await db.execute(query)
+            for entry in result.scalars().all():
+                self._completions[entry.prompt_hash] = {
+                    "model": entry.model,
+                    "answer": entry.answer,
+                    "prompt_tokens": entry.prompt_tokens,
+                    "completion_tokens": entry.completion_tokens,
+                }
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[dict]],
+    ) -> Tuple[dict, bool]:
+        """
+        Return a cached completion or generate it.
+
+        Args:
+            key: Generation key
+            generate: Coroutine factory calling the chat API
+
+        Returns:
+            (completion, hit) where hit is True if this call did not invoke the API
+        """
+        completion = self._completions.get(key)
+        if completion is not None:
+            return completion, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            completion = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(completion)
+        self._completions[key] = completion
+        self._pending[key] = completion
+        return completion, False
+
+    async def flush(self, db: AsyncSession) -> None:
+        """
+        Store completions generated since the last flush (existing entries are left untouched).
+
+        Args:
+            db: Database session (the caller commits)
+        """
+        pending, self._pending = self._pending, {}
+        rows = [
+            {"prompt_hash": key, **completion}
+            for key, completion in pending.items()
+        ]
+
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            stmt = (
+                insert(GenerationCacheEntry)
+                .values(rows[start:start + self.BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=["prompt_hash"])
+            )
+            await db.execute(stmt)
@@ -0,0 +1,321 @@
+"""Shared, rate-limit-aware OpenAI client."""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, TypeVar
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+
+from app.config import settings
+from app.core.tokens import count_tokens
+
+
+T = TypeVar("T")
+
+# Default per-model budgets (requests per minute, tokens per minute).
+# Override with settings.OPENAI_RATE_LIMITS to match your account tier.
+MODEL_RATE_LIMITS = {
+    "text-embedding-ada-002": {"rpm": 3000, "tpm": 1000000},
+    "text-embedding-3-small": {"rpm": 3000, "tpm": 1000000},
+    "text-embedding-3-large": {"rpm": 3000, "tpm": 1000000},
+    "gpt-4o": {"rpm": 500, "tpm": 30000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "gpt-4-turbo": {"rpm": 500, "tpm": 30000},
+    "gpt-3.5-turbo": {"rpm": 3500, "tpm": 200000},
+}
+
+# Errors worth retrying; everything else surfaces immediately
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Budget that refills continuously up to a per-minute capacity.
+
+    Reservations may drive the balance negative; the caller then waits until
+    the debt is repaid, so concurrent callers are served in reservation order.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Capacity, refilled evenly over one minute
+            clock: Monotonic clock in seconds
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.clock = clock
+        self.available = self.capacity
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserve capacity.
+
+        Args:
+            amount: Capacity to take
+
+        Returns:
+            Seconds to wait before the reservation may be used
+        """
+        self._refill()
+        self.available -= amount
+        return max(0.0, -self.available / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Return unused capacity (e.g. when a request used fewer tokens than estimated)."""
+        self._refill()
+        self.available = min(self.capacity, self.available + amount)
+
+
+class ModelRateLimiter:
+    """Requests-per-minute and tokens-per-minute budgets for one model."""
+
+    def __init__(self, rpm: int, tpm: int, clock: Callable[[], float] = time.monotonic):
+        """Initialize with the model's budgets."""
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.clock = clock
+        self.paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return seconds to wait."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        return max(wait, self.paused_until - self.clock())
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller of this model (after the server said to slow down)."""
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class RateLimitedOpenAI:
+    """
+    OpenAI client shared by all services using the same API key.
+
+    Every call reserves capacity against per-model RPM/TPM budgets before it is
+    sent, and retryable failures (429s, timeouts, connection and 5xx errors)
+    are retried with jittered exponential backoff, honoring retry-after.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_retries: int | None = None,
+        rate_limits: Dict[str, Dict[str, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: OpenAI API key
+            max_retries: Retries per call (uses settings if not provided)
+            rate_limits: Per-model {"rpm", "tpm"} overrides
+            clock: Monotonic clock in seconds
+        """
+        # Retries are handled here so they respect the shared budgets
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+        self.max_retries = settings.OPENAI_MAX_RETRIES if max_retries is None else max_retries
+        self.rate_limits = {
+            **MODEL_RATE_LIMITS,
+            **settings.OPENAI_RATE_LIMITS,
+            **(rate_limits or {}),
+        }
+        self.clock = clock
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def limiter_for(self, model: str) -> ModelRateLimiter:
+        """Get (or create) the rate limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limits = self.rate_limits.get(model, {})
+            limiter = ModelRateLimiter(
+                rpm=limits.get("rpm", settings.OPENAI_DEFAULT_RPM),
+                tpm=limits.get("tpm", settings.OPENAI_DEFAULT_TPM),
+                clock=self.clock,
+            )
+            self._limiters[model] = limiter
+        return limiter
+
+    async def create_embeddings(
+        self,
+        model: str,
+        input: List[str],
+        estimated_tokens: int | None = None,
+    ) -> Any:
+        """
+        Create embeddings within the model's budget.
+
+        Args:
+            model: Embedding model
+            input: Texts to embed
+            estimated_tokens: Token count of the input (counted if not provided)
+
+        Returns:
+            The OpenAI embeddings response
+        """
+        if estimated_tokens is None:
+            estimated_tokens = sum(count_tokens(text, model) for text in input)
+
+        return await self.call(
+            model,
+            estimated_tokens,
+            lambda: self.client.embeddings.create(model=model, input=input),
+        )
+
+    async def create_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Create a chat completion within the model's budget.
+
+        Prompt tokens plus max_tokens are reserved up front (that is what
+        OpenAI counts against the limit); unused tokens are refunded.
+
+        Args:
+            model: Chat model
+            messages: Chat messages
+            max_tokens: Maximum completion tokens
+            **kwargs: Extra completion parameters (temperature, response_format, ...)
+
+        Returns:
+            The OpenAI chat completion response
+        """
+        estimated_tokens = max_tokens + sum(
+            count_tokens(message["content"], model) for message in messages
+        )
+
+        return await self.call(
+            model,
+            estimated_tokens,
+            lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **kwargs,
+            ),
+        )
+
+    async def call(
+        self,
+        model: str,
+        estimated_tokens: int,
+        request: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Run a request within the model's budget, retrying retryable errors.
+
+        Args:
+            model: Model the request is billed against
+            estimated_tokens: Tokens to reserve for the request
+            request: Factory for the request coroutine (called once per attempt)
+
+        Returns:
+            The request's result
+
+        Raises:
+            openai.OpenAIError: If the request fails and retries are exhausted
+        """
+        limiter = self.limiter_for(model)
+
+        for attempt in range(self.max_retries + 1):
+            wait = limiter.reserve(estimated_tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                response = await request()
+            except RETRYABLE_ERRORS as e:
+                # A rejected or timed-out attempt consumed no provider TPM
+                limiter.tokens.refund(estimated_tokens)
+                if attempt == self.max_retries or _is_quota_exhausted(e):
+                    raise
+                retry_after, delay = _retry_delay(e, attempt)
+                if retry_after is not None:
+                    limiter.pause(retry_after)
+                await asyncio.sleep(delay)
+                continue
+
+            used_tokens = _total_tokens(response)
+            if used_tokens is not None and used_tokens < estimated_tokens:
+                limiter.tokens.refund(estimated_tokens - used_tokens)
+            return response
+
+        raise AssertionError("unreachable")
+
+
+def _is_quota_exhausted(error: Exception) -> bool:
+    """Out-of-credit 429s never succeed on retry."""
+    return isinstance(error, RateLimitError) and getattr(error, "code", None) == "insufficient_quota"
+
+
+def _retry_delay(error: Exception, attempt: int) -> Tuple[float | None, float]:
+    """
+    Compute the wait before the next attempt.
+
+    Returns:
+        (retry_after, delay): the server-requested wait (if any) and the
+        jittered delay to sleep, which is never shorter than retry_after
+    """
+    backoff = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    retry_after = None
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = response.headers
+        try:
+            if "retry-after-ms" in headers:
+                retry_after = float(headers["retry-after-ms"]) / 1000
+            elif "retry-after" in headers:
+                retry_after = float(headers["retry-after"])
+        except ValueError:
+            retry_after = None
+
+    if retry_after is None:
+        return None, backoff
+    retry_after = min(retry_after, BACKOFF_MAX_SECONDS)
+    # Small jitter so callers released together don't retry in lockstep
+    return retry_after, retry_after + random.uniform(0, BACKOFF_BASE_SECONDS)
+
+
+def _total_tokens(response: Any) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+_clients: Dict[str, RateLimitedOpenAI] = {}
+
+
+def get_openai_client(api_key: str) -> RateLimitedOpenAI:
+    """
+    Get the process-wide client for an API key.
+
+    Rate limits apply per account, so every service using the same key shares
+    one client and therefore one set of budgets.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = RateLimitedOpenAI(api_key=api_key)
+        _clients[api_key] = client
+    return client
@@ -0,0 +1,138 @@
+"""In-process cache for query-time experiment results."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from uuid import UUID
+
+from app.config import settings
+
+
+def normalize_query_text(text: str | None) -> str | None:
+    """
+    Normalize query text for cache keys.
+
+    Only whitespace is collapsed: case can change embeddings, so queries
+    differing in case are cached separately.
+    """
+    if text is None:
+        return None
+    return " ".join(text.split())
+
+
+class QueryResultCache:
+    """
+    LRU/TTL cache of query-time results with single-flight computation.
+
+    Entries are keyed by config ID, the config's persisted versions
+    (Config.version, bumped when its chunks change, and
+    Config.results_version, bumped when its settings or the project's
+    queries change) and a caller supplied key (normalized query +
+    overrides). The versions are bumped in the changing transaction, so a
+    change made in any process makes older entries unreachable everywhere;
+    they age out through the LRU/TTL. invalidate() only frees this
+    process's memory early.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results (uses settings if not provided)
+            ttl_seconds: Lifetime of a cached result (uses settings if not provided)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_entries = settings.QUERY_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl_seconds = settings.QUERY_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self,
+        config_id: UUID,
+        version: Hashable,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Return a cached result or compute it.
+
+        Concurrent callers with the same key share one computation. Failed
+        computations are not cached.
+
+        Args:
+            config_id: Config the result belongs to
+            version: The config's current (version, results_version), None if it doesn't exist
+            key: Hashable request key (normalized query, overrides, ...)
+            compute: Coroutine factory producing the result
+
+        Returns:
+            (result, hit) where hit is True if no computation was started
+        """
+        full_key = (config_id, version, key)
+
+        entry = self._entries.get(full_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(full_key)
+                return value, True
+            del self._entries[full_key]
+
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+
+        future.set_result(value)
+        if self.max_entries > 0:
+            self._store(full_key, value)
+        return value, False
+
+    def invalidate(self, config_id: UUID | None = None) -> None:
+        """
+        Free cached results of this process early.
+
+        Not needed for correctness: results are keyed by config versions.
+
+        Args:
+            config_id: Config whose results are stale (None drops everything)
+        """
+        if config_id is None:
+            self._entries.clear()
+            return
+
+        for key in [key for key in self._entries if key[0] == config_id]:
+            del self._entries[key]
+
+    def _store(self, key: Tuple, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Process-wide cache used by query-time experiments
+query_results = QueryResultCache()
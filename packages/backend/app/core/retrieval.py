@@ -1,11 +1,64 @@
 """Retrieval service for vector similarity search."""
 
-from typing import List, Dict
+from typing import Any, Iterable, List, Dict, NamedTuple
 from uuid import UUID
-from sqlalchemy import select, cast, Integer, func
+from sqlalchemy import select, cast, func, inspect, literal, literal_column, Float, Text, and_, true
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from sqlalchemy.orm.attributes import set_committed_value
+from pgvector.sqlalchemy import HALFVEC, Vector
 
 from app.models.chunk import Chunk
+from app.models.config import Config
+from app.core.bm25 import bm25_indexes
+
+
+# pgvector indexes at most 2,000 dimensions for vector; wider embeddings are
+# indexed (and searched) as halfvec, see migrations 9b2d4f6a8c13 / 1e6b3c8d5f27
+MAX_VECTOR_INDEX_DIMS = 2000
+
+# pgvector's default HNSW candidate list size
+DEFAULT_EF_SEARCH = 40
+
+# Standard RRF constant, and how many candidates per method hybrid search fuses (x top_k)
+RRF_K = 60
+HYBRID_FUSION_FACTOR = 3
+
+
+class RetrievedChunk(NamedTuple):
+    """
+    A retrieved chunk with its database-computed score.
+
+    score is the cosine similarity (dense), ts_rank_cd (BM25) or fused RRF
+    score (hybrid); rank is the 1-based position in the result list. Hybrid
+    results also carry the chunk's rank in each method's candidate list
+    (None if that method didn't return it).
+    """
+
+    chunk: Chunk
+    score: float
+    rank: int
+    dense_rank: int | None = None
+    sparse_rank: int | None = None
+
+
+def _index_type(dim: int):
+    """Typed vector column type the per-dimension index uses."""
+    return Vector(dim) if dim <= MAX_VECTOR_INDEX_DIMS else HALFVEC(dim)
+
+
+def indexed_embedding(dim: int):
+    """
+    Chunk.embedding cast to the typed expression its per-dimension HNSW index is built on.
+
+    Args:
+        dim: Embedding dimensions
+
+    Returns:
+        SQL expression matching the partial index for this dimension
+    """
+    return cast(Chunk.embedding, _index_type(dim))
 
 
 class RetrievalService:
@@ -25,43 +78,51 @@ class RetrievalService:
         query_embedding: List[float],
         config_id: UUID,
         top_k: int = 5,
-    ) -> List[Chunk]:
+        search_settings: Dict[str, Any] | None = None,
+    ) -> List[RetrievedChunk]:
         """
         Search for similar chunks using dense vector similarity (cosine).
 
         Ensures dimension safety by only comparing vectors of the same dimension.
+        The query is shaped to use the per-dimension HNSW index (approximate
+        nearest neighbors) instead of scanning every chunk.
 
         Args:
             query_embedding: Query embedding vector
             config_id: Configuration ID to filter chunks
             top_k: Number of results to return
+            search_settings: Optional ANN tuning ("ef_search", "probes"), usually config.settings
 
         Returns:
-            List of most similar chunks
+            Most similar chunks with cosine similarity scores
 
         Raises:
             ValueError: If no chunks found for the config or dimension mismatch
         """
         query_dim = len(query_embedding)
 
+        await self._apply_search_settings(top_k, search_settings)
+
         # Build query with dimension validation
-        # Filter by config_id AND embedding_dim to ensure dimension safety
+        # Filter by config_id AND embedding dimensions to ensure dimension safety.
+        # The dimension is inlined (not bound) so the planner can match the
+        # partial index predicate embedding_dim = <dim>.
+        distance = indexed_embedding(query_dim).cosine_distance(query_embedding)
         query = (
-            select(Chunk)
+            select(Chunk, (1 - distance).label("score"))
+            .options(defer(Chunk.embedding))
             .where(Chunk.config_id == config_id)
-            .where(
-                cast(Chunk.chunk_metadata["embedding_dim"].astext, Integer) == query_dim
-            )
-            .order_by(Chunk.embedding.cosine_distance(query_embedding))
+            .where(Chunk.embedding_dim == literal_column(str(int(query_dim))))
+            .order_by(distance)
             .limit(top_k)
         )
 
         result = await self.db.execute(query)
-        chunks = list(result.scalars().all())
+        chunks = _retrieved_chunks(result.all())
 
         if not chunks:
             # Check if there are any chunks for this config at all
-            count_query = select(Chunk).where(Chunk.config_id == config_id).limit(1)
+            count_query = select(Chunk.id).where(Chunk.config_id == config_id).limit(1)
             count_result = await self.db.execute(count_query)
             if not count_result.scalar_one_or_none():
                 raise ValueError(f"No chunks found for config {config_id}")
@@ -73,12 +134,317 @@ class RetrievalService:
 
         return chunks
 
+    async def search_dense_batch(
+        self,
+        query_embeddings: List[List[float]],
+        config_id: UUID,
+        top_k: int = 5,
+        search_settings: Dict[str, Any] | None = None,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Dense search for many queries in one SQL statement.
+
+        The query embeddings are unnested into a table and each row drives a
+        LATERAL top-k index scan, so a whole query set costs one round trip.
+
+        Args:
+            query_embeddings: Query embedding vectors (all of the same dimension)
+            config_id: Configuration ID to filter chunks
+            top_k: Number of results per query
+            search_settings: Optional ANN tuning ("ef_search", "probes")
+
+        Returns:
+            Per query (in input order), the most similar chunks with cosine similarity scores
+
+        Raises:
+            ValueError: If no chunks found for the config or dimension mismatch
+        """
+        if not query_embeddings:
+            return []
+        query_dim = self._batch_dim(query_embeddings)
+
+        await self._apply_search_settings(top_k, search_settings)
+
+        queries = _query_table(query_embeddings=query_embeddings)
+        dense = self._dense_ranked(queries, config_id, query_dim, top_k)
+        query = (
+            select(dense.c.ord, Chunk, dense.c.score)
+            .options(defer(Chunk.embedding))
+            .join(Chunk, Chunk.id == dense.c.id)
+            .order_by(dense.c.ord, dense.c.rank)
+        )
+
+        result = await self.db.execute(query)
+        results = _group_by_query(result.all(), len(query_embeddings))
+
+        if not any(results):
+            # Same checks as search_dense
+            count_query = select(Chunk.id).where(Chunk.config_id == config_id).limit(1)
+            count_result = await self.db.execute(count_query)
+            if not count_result.scalar_one_or_none():
+                raise ValueError(f"No chunks found for config {config_id}")
+            raise ValueError(
+                f"No chunks with {query_dim} dimensions found for config {config_id}. "
+                "Embedding model mismatch detected."
+            )
+
+        return results
+
+    async def search_bm25_batch(
+        self,
+        query_texts: List[str],
+        config_id: UUID,
+        top_k: int = 5,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        BM25 search for many queries in one SQL statement.
+
+        Args:
+            query_texts: Query texts for keyword search
+            config_id: Configuration ID to filter chunks
+            top_k: Number of results per query
+
+        Returns:
+            Per query (in input order), the most relevant chunks with ts_rank_cd
+            scores (empty when a query matches nothing)
+
+        Raises:
+            ValueError: If no chunks found for the config
+        """
+        if not query_texts:
+            return []
+
+        queries = _query_table(query_texts=query_texts)
+        sparse = self._sparse_ranked(queries, config_id, top_k)
+        query = (
+            select(sparse.c.ord, Chunk, sparse.c.score)
+            .options(defer(Chunk.embedding))
+            .join(Chunk, Chunk.id == sparse.c.id)
+            .order_by(sparse.c.ord, sparse.c.rank)
+        )
+
+        result = await self.db.execute(query)
+        results = _group_by_query(result.all(), len(query_texts))
+
+        if not any(results):
+            count_query = select(Chunk.id).where(Chunk.config_id == config_id).limit(1)
+            count_result = await self.db.execute(count_query)
+            if not count_result.scalar_one_or_none():
+                raise ValueError(f"No chunks found for config {config_id}")
+
+        return results
+
+    async def search_hybrid_batch(
+        self,
+        query_embeddings: List[List[float]],
+        query_texts: List[str],
+        config_id: UUID,
+        top_k: int = 5,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        search_settings: Dict[str, Any] | None = None,
+        fusion_k: int | None = None,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Hybrid (RRF) search for many queries in one SQL statement.
+
+        Dense and sparse candidates come from per-query LATERAL scans and are
+        fused per query exactly like search_hybrid.
+
+        Args:
+            query_embeddings: Query embedding vectors (all of the same dimension)
+            query_texts: Query texts, aligned with query_embeddings
+            config_id: Configuration ID to filter chunks
+            top_k: Number of results per query
+            dense_weight: Weight for dense retrieval (default 0.5)
+            sparse_weight: Weight for sparse retrieval (default 0.5)
+            search_settings: Optional ANN tuning for the dense candidates
+            fusion_k: Candidates fused per method (default top_k * HYBRID_FUSION_FACTOR);
+                pass the pool of the caller's own top_k when retrieving deeper than it,
+                so the extra depth doesn't change the fused top_k
+
+        Returns:
+            Per query (in input order), the re-ranked chunks with fused RRF
+            scores and per-method ranks; empty for a query where neither method found anything
+            (search_hybrid raises ValueError in that case)
+        """
+        if not query_embeddings:
+            return []
+        if len(query_embeddings) != len(query_texts):
+            raise ValueError("query_embeddings and query_texts must have the same length")
+        query_dim = self._batch_dim(query_embeddings)
+
+        # Get more results from each method for better fusion
+        fusion_k = fusion_k or top_k * HYBRID_FUSION_FACTOR
+
+        await self._apply_search_settings(fusion_k, search_settings)
+
+        queries = _query_table(query_embeddings=query_embeddings, query_texts=query_texts)
+        dense = self._dense_ranked(queries, config_id, query_dim, fusion_k)
+        sparse = self._sparse_ranked(queries, config_id, fusion_k)
+
+        # RRF score = sum(weight / (k + rank)) for each method, per query
+        score = (
+            func.coalesce(literal(dense_weight, Float) / cast(RRF_K + dense.c.rank, Float), 0.0)
+            + func.coalesce(literal(sparse_weight, Float) / cast(RRF_K + sparse.c.rank, Float), 0.0)
+        )
+        ord_ = func.coalesce(dense.c.ord, sparse.c.ord)
+        fused = (
+            select(
+                ord_.label("ord"),
+                func.coalesce(dense.c.id, sparse.c.id).label("id"),
+                score.label("score"),
+                dense.c.rank.label("dense_rank"),
+                sparse.c.rank.label("sparse_rank"),
+                func.row_number().over(
+                    partition_by=ord_,
+                    order_by=(
+                        score.desc(),
+                        dense.c.rank.asc().nulls_last(),
+                        sparse.c.rank.asc().nulls_last(),
+                    ),
+                ).label("position"),
+            )
+            .select_from(
+                dense.join(
+                    sparse,
+                    and_(dense.c.ord == sparse.c.ord, dense.c.id == sparse.c.id),
+                    full=True,
+                )
+            )
+            .cte("fused")
+        )
+        query = (
+            select(fused.c.ord, Chunk, fused.c.score, fused.c.dense_rank, fused.c.sparse_rank)
+            .options(defer(Chunk.embedding))
+            .join(Chunk, Chunk.id == fused.c.id)
+            .where(fused.c.position <= top_k)
+            .order_by(fused.c.ord, fused.c.position)
+        )
+
+        result = await self.db.execute(query)
+        return _group_by_query(result.all(), len(query_embeddings))
+
+    async def load_embeddings(self, chunks: Iterable[Chunk]) -> None:
+        """
+        Load the embeddings of retrieved chunks in one statement.
+
+        Searches hydrate chunks without their embedding (only diversity and
+        text ground truth matching need it), and a chunk retrieved by many
+        queries is fetched once here. Chunks that carry their embedding
+        already (e.g. from the vector index) are skipped; chunks deleted
+        since retrieval get None.
+
+        Args:
+            chunks: Chunks returned by the search methods
+        """
+        pending: Dict[UUID, List[Chunk]] = {}
+        for chunk in chunks:
+            if "embedding" in inspect(chunk).unloaded:
+                pending.setdefault(chunk.id, []).append(chunk)
+        if not pending:
+            return
+
+        result = await self.db.execute(
+            select(Chunk.id, Chunk.embedding).where(Chunk.id.in_(pending))
+        )
+        embeddings = dict(result.all())
+        for chunk_id, same_chunks in pending.items():
+            for chunk in same_chunks:
+                set_committed_value(chunk, "embedding", embeddings.get(chunk_id))
+
+    @staticmethod
+    def _batch_dim(query_embeddings: List[List[float]]) -> int:
+        query_dim = len(query_embeddings[0])
+        if any(len(embedding) != query_dim for embedding in query_embeddings):
+            raise ValueError("All query embeddings in a batch must have the same dimensions")
+        return query_dim
+
+    @staticmethod
+    def _dense_ranked(queries, config_id: UUID, query_dim: int, limit: int):
+        """Per-query top `limit` chunks by cosine distance: (ord, id, score, rank)."""
+        distance = indexed_embedding(query_dim).cosine_distance(
+            cast(queries.c.embedding, _index_type(query_dim))
+        )
+        hits = (
+            select(Chunk.id.label("id"), distance.label("distance"))
+            .where(Chunk.config_id == config_id)
+            .where(Chunk.embedding_dim == literal_column(str(int(query_dim))))
+            .order_by(distance)
+            .limit(limit)
+            .lateral("dense_hits")
+        )
+        return (
+            select(
+                queries.c.ord,
+                hits.c.id,
+                (1 - hits.c.distance).label("score"),
+                func.row_number().over(
+                    partition_by=queries.c.ord, order_by=hits.c.distance
+                ).label("rank"),
+            )
+            .select_from(queries.join(hits, true()))
+            .cte("dense")
+        )
+
+    @staticmethod
+    def _sparse_ranked(queries, config_id: UUID, limit: int):
+        """Per-query top `limit` chunks by ts_rank_cd: (ord, id, score, rank)."""
+        tsquery = func.plainto_tsquery('english', queries.c.query_text)
+        ts_rank = func.ts_rank_cd(Chunk.content_tsv, tsquery)
+        hits = (
+            select(Chunk.id.label("id"), ts_rank.label("ts_rank"))
+            .where(Chunk.config_id == config_id)
+            .where(Chunk.content_tsv.op('@@')(tsquery))
+            .order_by(ts_rank.desc())
+            .limit(limit)
+            .lateral("sparse_hits")
+        )
+        return (
+            select(
+                queries.c.ord,
+                hits.c.id,
+                hits.c.ts_rank.label("score"),
+                func.row_number().over(
+                    partition_by=queries.c.ord, order_by=hits.c.ts_rank.desc()
+                ).label("rank"),
+            )
+            .select_from(queries.join(hits, true()))
+            .cte("sparse")
+        )
+
+    async def _apply_search_settings(
+        self,
+        top_k: int,
+        search_settings: Dict[str, Any] | None,
+    ) -> None:
+        """
+        Set ANN search parameters for the current transaction.
+
+        ef_search is raised to at least top_k (HNSW never returns more than
+        ef_search rows), and iterative scans keep the index walking until
+        enough rows pass the config filter.
+        """
+        search_settings = search_settings or {}
+        ef_search = max(int(search_settings.get("ef_search", DEFAULT_EF_SEARCH)), top_k)
+
+        params = [
+            func.set_config("hnsw.ef_search", str(ef_search), True),
+            func.set_config("hnsw.iterative_scan", "strict_order", True),
+        ]
+        if search_settings.get("probes"):
+            params.append(
+                func.set_config("ivfflat.probes", str(int(search_settings["probes"])), True)
+            )
+
+        await self.db.execute(select(*params))
+
     async def search_bm25(
         self,
         query_text: str,
         config_id: UUID,
         top_k: int = 5,
-    ) -> List[Chunk]:
+    ) -> List[RetrievedChunk]:
         """
         Search for similar chunks using BM25 (full-text search).
 
@@ -90,31 +456,29 @@ class RetrievalService:
             top_k: Number of results to return
 
         Returns:
-            List of most relevant chunks
+            Most relevant chunks with ts_rank_cd scores
 
         Raises:
             ValueError: If no chunks found for the config
         """
         # Convert query to tsquery
+        tsquery = func.plainto_tsquery('english', query_text)
+        ts_rank = func.ts_rank_cd(Chunk.content_tsv, tsquery)
         query = (
-            select(Chunk)
+            select(Chunk, ts_rank.label("score"))
+            .options(defer(Chunk.embedding))
             .where(Chunk.config_id == config_id)
-            .where(Chunk.content_tsv.op('@@')(func.plainto_tsquery('english', query_text)))
-            .order_by(
-                func.ts_rank_cd(
-                    Chunk.content_tsv,
-                    func.plainto_tsquery('english', query_text)
-                ).desc()
-            )
+            .where(Chunk.content_tsv.op('@@')(tsquery))
+            .order_by(ts_rank.desc())
             .limit(top_k)
         )
 
         result = await self.db.execute(query)
-        chunks = list(result.scalars().all())
+        chunks = _retrieved_chunks(result.all())
 
         if not chunks:
             # Check if there are any chunks for this config at all
-            count_query = select(Chunk).where(Chunk.config_id == config_id).limit(1)
+            count_query = select(Chunk.id).where(Chunk.config_id == config_id).limit(1)
             count_result = await self.db.execute(count_query)
             if not count_result.scalar_one_or_none():
                 raise ValueError(f"No chunks found for config {config_id}")
@@ -126,6 +490,78 @@ class RetrievalService:
 
         return chunks
 
+    async def search_okapi_bm25(
+        self,
+        query_text: str,
+        config_id: UUID,
+        top_k: int = 5,
+        version: int | None = None,
+    ) -> List[RetrievedChunk]:
+        """
+        Search using Okapi BM25 over the config's in-process inverted index.
+
+        Unlike search_bm25 (ts_rank_cd), scores use IDF and length
+        normalization and a chunk needs to match only one query term.
+
+        Args:
+            query_text: Query text for keyword search
+            config_id: Configuration ID to filter chunks
+            top_k: Number of results to return
+            version: The config's current version (looked up if not provided)
+
+        Returns:
+            Most relevant chunks with BM25 scores
+
+        Raises:
+            ValueError: If no chunks found for the config
+        """
+        results = await self.search_okapi_bm25_batch([query_text], config_id, top_k, version)
+        return results[0]
+
+    async def search_okapi_bm25_batch(
+        self,
+        query_texts: List[str],
+        config_id: UUID,
+        top_k: int = 5,
+        version: int | None = None,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Okapi BM25 search for many queries; chunks are fetched in one statement.
+
+        Args:
+            query_texts: Query texts
+            config_id: Configuration ID to filter chunks
+            top_k: Number of results per query
+            version: The config's current version (looked up if not provided)
+
+        Returns:
+            Per query (in input order), the most relevant chunks with BM25 scores
+
+        Raises:
+            ValueError: If no chunks found for the config
+        """
+        if version is None:
+            version = await self.db.scalar(select(Config.version).where(Config.id == config_id))
+        index = await bm25_indexes.get(self.db, config_id, version or 0)
+        if not len(index):
+            raise ValueError(f"No chunks found for config {config_id}")
+
+        hits = [index.search(query_text, top_k) for query_text in query_texts]
+        chunk_ids = {chunk_id for query_hits in hits for chunk_id, _ in query_hits}
+        chunks = {}
+        if chunk_ids:
+            result = await self.db.execute(
+                select(Chunk).options(defer(Chunk.embedding)).where(Chunk.id.in_(chunk_ids))
+            )
+            chunks = {chunk.id: chunk for chunk in result.scalars()}
+
+        results = []
+        for query_hits in hits:
+            # Chunks deleted since the index was loaded are skipped
+            ranked = [(chunks[chunk_id], score) for chunk_id, score in query_hits if chunk_id in chunks]
+            results.append(_retrieved_chunks(ranked))
+        return results
+
     async def search_hybrid(
         self,
         query_embedding: List[float],
@@ -134,11 +570,15 @@ class RetrievalService:
         top_k: int = 5,
         dense_weight: float = 0.5,
         sparse_weight: float = 0.5,
-    ) -> List[Chunk]:
+        search_settings: Dict[str, Any] | None = None,
+        fusion_k: int | None = None,
+    ) -> List[RetrievedChunk]:
         """
         Hybrid search combining dense (vector) and sparse (BM25) retrieval.
 
         Uses Reciprocal Rank Fusion (RRF) to combine results from both methods.
+        Both candidate lists and the fusion run inside one CTE query, and only
+        the fused top_k chunks are loaded.
 
         Args:
             query_embedding: Query embedding vector
@@ -147,83 +587,219 @@ class RetrievalService:
             top_k: Number of results to return
             dense_weight: Weight for dense retrieval (default 0.5)
             sparse_weight: Weight for sparse retrieval (default 0.5)
+            search_settings: Optional ANN tuning for the dense candidates
+            fusion_k: Candidates fused per method (default top_k * HYBRID_FUSION_FACTOR);
+                pass the pool of the caller's own top_k when retrieving deeper than it,
+                so the extra depth doesn't change the fused top_k
 
         Returns:
-            List of most similar chunks (re-ranked using RRF)
+            Most similar chunks (re-ranked using RRF) with fused RRF scores
+            and per-method ranks
 
         Raises:
             ValueError: If no chunks found for the config
         """
         # Get more results from each method for better fusion
-        fusion_k = top_k * 3
+        fusion_k = fusion_k or top_k * HYBRID_FUSION_FACTOR
 
-        # Get dense results
-        try:
-            dense_chunks = await self.search_dense(query_embedding, config_id, fusion_k)
-        except ValueError:
-            dense_chunks = []
+        await self._apply_search_settings(fusion_k, search_settings)
 
-        # Get sparse results
-        try:
-            sparse_chunks = await self.search_bm25(query_text, config_id, fusion_k)
-        except ValueError:
-            sparse_chunks = []
+        query = self._hybrid_query(
+            query_embedding, query_text, config_id, top_k, fusion_k, dense_weight, sparse_weight
+        )
+        result = await self.db.execute(query)
+        chunks = _retrieved_chunks(result.all())
 
-        if not dense_chunks and not sparse_chunks:
+        if not chunks:
             raise ValueError(f"No chunks found for config {config_id}")
 
-        # If only one method returned results, use that
-        if not dense_chunks:
-            return sparse_chunks[:top_k]
-        if not sparse_chunks:
-            return dense_chunks[:top_k]
+        return chunks
 
-        # Apply Reciprocal Rank Fusion (RRF)
-        # RRF score = sum(weight / (k + rank)) for each method
-        rrf_k = 60  # Standard RRF constant
-        chunk_scores: Dict[UUID, float] = {}
-        chunk_map: Dict[UUID, Chunk] = {}
-
-        # Score dense results
-        for rank, chunk in enumerate(dense_chunks, start=1):
-            chunk_id = chunk.id
-            chunk_scores[chunk_id] = chunk_scores.get(chunk_id, 0) + dense_weight / (rrf_k + rank)
-            chunk_map[chunk_id] = chunk
-
-        # Score sparse results
-        for rank, chunk in enumerate(sparse_chunks, start=1):
-            chunk_id = chunk.id
-            chunk_scores[chunk_id] = chunk_scores.get(chunk_id, 0) + sparse_weight / (rrf_k + rank)
-            chunk_map[chunk_id] = chunk
-
-        # Sort by RRF score and return top-k
-        sorted_chunk_ids = sorted(chunk_scores.keys(), key=lambda x: chunk_scores[x], reverse=True)
-        return [chunk_map[chunk_id] for chunk_id in sorted_chunk_ids[:top_k]]
-
-    async def calculate_score(
+    def _hybrid_query(
         self,
         query_embedding: List[float],
-        chunk_embedding: List[float],
-    ) -> float:
+        query_text: str,
+        config_id: UUID,
+        top_k: int,
+        fusion_k: int,
+        dense_weight: float,
+        sparse_weight: float,
+    ):
         """
-        Calculate similarity score between query and chunk.
+        Build the hybrid RRF query.
 
-        Args:
-            query_embedding: Query embedding vector
-            chunk_embedding: Chunk embedding vector
+        WITH dense AS (top fusion_k by cosine distance, ranked),
+             sparse AS (top fusion_k by ts_rank_cd, ranked),
+             fused AS (FULL JOIN, score = sum(weight / (k + rank)), top_k)
+        SELECT chunk, score, dense_rank, sparse_rank
 
-        Returns:
-            Similarity score (cosine similarity)
+        A dimension mismatch simply yields no dense candidates, so the sparse
+        list is used alone (as with the previous two-query implementation).
         """
-        import numpy as np
+        query_dim = len(query_embedding)
 
-        query_array = np.array(query_embedding)
-        chunk_array = np.array(chunk_embedding)
+        # Dense candidates (same shape as search_dense so the HNSW index is used)
+        distance = indexed_embedding(query_dim).cosine_distance(query_embedding)
+        dense_candidates = (
+            select(Chunk.id.label("id"), distance.label("distance"))
+            .where(Chunk.config_id == config_id)
+            .where(Chunk.embedding_dim == literal_column(str(int(query_dim))))
+            .order_by(distance)
+            .limit(fusion_k)
+            .subquery("dense_candidates")
+        )
+        dense = select(
+            dense_candidates.c.id,
+            func.row_number().over(order_by=dense_candidates.c.distance).label("rank"),
+        ).cte("dense")
+
+        # Sparse candidates
+        tsquery = func.plainto_tsquery('english', query_text)
+        ts_rank = func.ts_rank_cd(Chunk.content_tsv, tsquery)
+        sparse_candidates = (
+            select(Chunk.id.label("id"), ts_rank.label("ts_rank"))
+            .where(Chunk.config_id == config_id)
+            .where(Chunk.content_tsv.op('@@')(tsquery))
+            .order_by(ts_rank.desc())
+            .limit(fusion_k)
+            .subquery("sparse_candidates")
+        )
+        sparse = select(
+            sparse_candidates.c.id,
+            func.row_number().over(order_by=sparse_candidates.c.ts_rank.desc()).label("rank"),
+        ).cte("sparse")
 
-        # Cosine similarity
-        similarity = float(
-            np.dot(query_array, chunk_array)
-            / (np.linalg.norm(query_array) * np.linalg.norm(chunk_array))
+        # RRF score = sum(weight / (k + rank)) for each method
+        score = (
+            func.coalesce(literal(dense_weight, Float) / cast(RRF_K + dense.c.rank, Float), 0.0)
+            + func.coalesce(literal(sparse_weight, Float) / cast(RRF_K + sparse.c.rank, Float), 0.0)
+        )
+        ordering = (
+            score.desc(),
+            dense.c.rank.asc().nulls_last(),
+            sparse.c.rank.asc().nulls_last(),
+        )
+        fused = (
+            select(
+                func.coalesce(dense.c.id, sparse.c.id).label("id"),
+                score.label("score"),
+                dense.c.rank.label("dense_rank"),
+                sparse.c.rank.label("sparse_rank"),
+            )
+            .select_from(dense.join(sparse, dense.c.id == sparse.c.id, full=True))
+            .order_by(*ordering)
+            .limit(top_k)
+            .cte("fused")
         )
 
-        return similarity
+        return (
+            select(Chunk, fused.c.score, fused.c.dense_rank, fused.c.sparse_rank)
+            .options(defer(Chunk.embedding))
+            .join(fused, Chunk.id == fused.c.id)
+            .order_by(
+                fused.c.score.desc(),
+                fused.c.dense_rank.asc().nulls_last(),
+                fused.c.sparse_rank.asc().nulls_last(),
+            )
+        )
+
+
+def fuse_rrf(
+    dense: List[RetrievedChunk],
+    sparse: List[RetrievedChunk],
+    top_k: int,
+    dense_weight: float = 0.5,
+    sparse_weight: float = 0.5,
+) -> List[RetrievedChunk]:
+    """
+    Fuse ranked dense and sparse candidates with RRF, in memory.
+
+    Mirrors search_hybrid: each method contributes its top top_k * HYBRID_FUSION_FACTOR
+    candidates, score = sum(weight / (RRF_K + rank)), ties broken by dense
+    rank then sparse rank. Candidate lists fetched once at a larger top_k can
+    therefore be re-fused for any smaller top_k or weights.
+
+    Args:
+        dense: Dense candidates ordered by rank
+        sparse: Sparse candidates ordered by rank
+        top_k: Number of results to return
+        dense_weight: Weight for dense retrieval
+        sparse_weight: Weight for sparse retrieval
+
+    Returns:
+        Re-ranked chunks with fused RRF scores
+    """
+    fusion_k = top_k * HYBRID_FUSION_FACTOR
+    missing = fusion_k + 1  # sorts after every real rank (NULLS LAST)
+    fused: Dict[Any, List[Any]] = {}
+    for item in dense[:fusion_k]:
+        fused[item.chunk.id] = [item.chunk, item.rank, missing]
+    for item in sparse[:fusion_k]:
+        entry = fused.setdefault(item.chunk.id, [item.chunk, missing, missing])
+        entry[2] = item.rank
+
+    def score(dense_rank: int, sparse_rank: int) -> float:
+        total = 0.0
+        if dense_rank != missing:
+            total += dense_weight / (RRF_K + dense_rank)
+        if sparse_rank != missing:
+            total += sparse_weight / (RRF_K + sparse_rank)
+        return total
+
+    ranked = sorted(
+        ((chunk, score(d, s), d, s) for chunk, d, s in fused.values()),
+        key=lambda entry: (-entry[1], entry[2], entry[3]),
+    )
+    return [
+        RetrievedChunk(
+            chunk=chunk,
+            score=fused_score,
+            rank=rank,
+            dense_rank=None if dense_rank == missing else dense_rank,
+            sparse_rank=None if sparse_rank == missing else sparse_rank,
+        )
+        for rank, (chunk, fused_score, dense_rank, sparse_rank) in enumerate(ranked[:top_k], start=1)
+    ]
+
+
+def _retrieved_chunks(rows) -> List[RetrievedChunk]:
+    """Convert (Chunk, score[, dense_rank, sparse_rank]) rows into ranked RetrievedChunks."""
+    return [
+        RetrievedChunk(row[0], float(row[1]), rank, *row[2:4])
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+def _query_table(
+    query_embeddings: List[List[float]] | None = None,
+    query_texts: List[str] | None = None,
+):
+    """
+    Queries as an unnested table: (embedding text, query_text, ord).
+
+    Embeddings travel as pgvector text literals and are cast in SQL; ord is
+    the 1-based position of the query in the batch.
+    """
+    columns = []
+    arrays = []
+    if query_embeddings is not None:
+        columns.append("embedding")
+        arrays.append(literal(
+            ["[" + ",".join(map(str, embedding)) + "]" for embedding in query_embeddings],
+            ARRAY(Text),
+        ))
+    if query_texts is not None:
+        columns.append("query_text")
+        arrays.append(literal(list(query_texts), ARRAY(Text)))
+
+    table = func.unnest(*arrays).table_valued(*columns, with_ordinality="ord")
+    return select(table).cte("queries")
+
+
+def _group_by_query(rows, num_queries: int) -> List[List[RetrievedChunk]]:
+    """Split (ord, Chunk, score[, dense_rank, sparse_rank]) rows, ordered by ord and rank, into per-query lists."""
+    grouped: List[List[RetrievedChunk]] = [[] for _ in range(num_queries)]
+    for ord_, chunk, score, *method_ranks in rows:
+        hits = grouped[ord_ - 1]
+        hits.append(RetrievedChunk(chunk, float(score), len(hits) + 1, *method_ranks))
+    return grouped
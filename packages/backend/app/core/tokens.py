@@ -0,0 +1,31 @@
+"""Token counting helpers backed by tiktoken."""
+
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Get (and cache) the tiktoken encoding for a model.
+
+    Loading an encoding is expensive, so each one is built once per process.
+    Unknown models fall back to cl100k_base.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the tokens of a text for a model."""
+    return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
+def count_tokens_batch(texts: List[str], model: str) -> List[int]:
+    """Count the tokens of many texts for a model (multi-threaded)."""
+    encoded = get_encoding(model).encode_batch(texts, disallowed_special=())
+    return [len(tokens) for tokens in encoded]
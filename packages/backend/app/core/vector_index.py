@@ -0,0 +1,261 @@
+"""In-memory per-config vector index for low-latency dense retrieval."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.retrieval import RetrievedChunk
+from app.models.chunk import Chunk
+
+
+class VectorIndex:
+    """
+    A config's embeddings as one contiguous, L2-normalized float32 matrix.
+
+    Top-k is a single matrix-vector product plus argpartition. Chunk
+    content and position are kept alongside so results need no DB access.
+    """
+
+    def __init__(
+        self,
+        chunk_ids: Sequence[UUID],
+        document_ids: Sequence[UUID],
+        chunk_indexes: Sequence[int],
+        contents: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        config_id: UUID | None = None,
+        version: int = 0,
+    ):
+        """
+        Build the index.
+
+        Args:
+            chunk_ids: Chunk IDs, one per embedding
+            document_ids: Document ID of each chunk
+            chunk_indexes: Position of each chunk in its document
+            contents: Text of each chunk
+            embeddings: Chunk embeddings (all of the same dimension)
+            config_id: Config the chunks belong to
+            version: Config version the chunks were loaded at
+        """
+        self.config_id = config_id
+        self.version = version
+        self.chunk_ids = list(chunk_ids)
+        self.document_ids = list(document_ids)
+        self.chunk_indexes = list(chunk_indexes)
+        self.contents = list(contents)
+
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(self.chunk_ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimensions."""
+        return self.matrix.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint (matrix plus chunk text)."""
+        return self.matrix.nbytes + sum(len(content) for content in self.contents)
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def top_k(self, query_embedding: Sequence[float], top_k: int) -> List[Tuple[int, float]]:
+        """
+        Find the most similar rows.
+
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of results to return
+
+        Returns:
+            (row, cosine similarity) pairs, most similar first
+        """
+        if not len(self) or top_k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self.matrix @ query
+        k = min(top_k, len(scores))
+        if k < len(scores):
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(len(scores))
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+
+        return [(int(row), float(scores[row])) for row in rows]
+
+    def search(self, query_embedding: Sequence[float], top_k: int) -> List[RetrievedChunk]:
+        """
+        Search the index.
+
+        Returned chunks are detached Chunk objects carrying the normalized
+        embedding (cosine similarities are unaffected by normalization).
+
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of results to return
+
+        Returns:
+            Most similar chunks with cosine similarity scores
+        """
+        return [
+            RetrievedChunk(
+                chunk=Chunk(
+                    id=self.chunk_ids[row],
+                    document_id=self.document_ids[row],
+                    config_id=self.config_id,
+                    content=self.contents[row],
+                    chunk_index=self.chunk_indexes[row],
+                    embedding=self.matrix[row],
+                ),
+                score=score,
+                rank=rank,
+            )
+            for rank, (row, score) in enumerate(self.top_k(query_embedding, top_k), start=1)
+        ]
+
+
+class VectorIndexRegistry:
+    """
+    Process-wide cache of VectorIndex objects keyed by (config_id, dim).
+
+    Indexes are loaded on first use and evicted least-recently-used once the
+    memory budget is exceeded. Every lookup passes the config's persisted
+    version (Config.version, bumped by whatever changes its chunks), and an
+    index loaded at another version is reloaded, so a change made by any API
+    or worker process is seen by all of them. invalidate() only frees this
+    process's memory early. Workers that never serve query-time requests
+    hold no indexes.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            max_bytes: Memory budget for all indexes (uses settings if not provided)
+        """
+        self.max_bytes = settings.VECTOR_INDEX_MAX_BYTES if max_bytes is None else max_bytes
+        self._indexes: "OrderedDict[Tuple[UUID, int], VectorIndex]" = OrderedDict()
+        self._loading: Dict[Tuple[UUID, int, int], asyncio.Future] = {}
+
+    async def get(self, db: AsyncSession, config_id: UUID, dim: int, version: int) -> VectorIndex:
+        """
+        Get a config's index, loading it if needed.
+
+        Concurrent callers share a single load.
+
+        Args:
+            db: Database session used for loading
+            config_id: Config ID
+            dim: Embedding dimensions
+            version: The config's current version (Config.version)
+
+        Returns:
+            The config's index (possibly empty)
+        """
+        key = (config_id, dim)
+        index = self._indexes.get(key)
+        if index is not None:
+            # An index newer than the caller's view of the config is fine to serve
+            if index.version >= version:
+                self._indexes.move_to_end(key)
+                return index
+            # The chunks changed (possibly in another process)
+            del self._indexes[key]
+
+        loading_key = (config_id, dim, version)
+        pending = self._loading.get(loading_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[loading_key] = future
+        try:
+            index = await self._load(db, config_id, dim, version)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(loading_key, None)
+
+        future.set_result(index)
+        current = self._indexes.get(key)
+        # Don't replace an index a concurrent lookup loaded at a newer version
+        if current is None or current.version < version:
+            self._store(key, index)
+        return index
+
+    def invalidate(self, config_id: UUID | None = None) -> None:
+        """
+        Free cached indexes of this process early.
+
+        Not needed for correctness: lookups at a newer config version reload.
+
+        Args:
+            config_id: Config whose chunks changed (None drops everything)
+        """
+        if config_id is None:
+            self._indexes.clear()
+            return
+
+        for key in [key for key in self._indexes if key[0] == config_id]:
+            del self._indexes[key]
+
+    def _store(self, key: Tuple[UUID, int], index: VectorIndex) -> None:
+        self._indexes[key] = index
+        self._indexes.move_to_end(key)
+        # Evict least recently used, but always keep the newest index
+        while len(self._indexes) > 1 and sum(i.nbytes for i in self._indexes.values()) > self.max_bytes:
+            self._indexes.popitem(last=False)
+
+    @staticmethod
+    async def _load(db: AsyncSession, config_id: UUID, dim: int, version: int) -> VectorIndex:
+        query = (
+            select(
+                Chunk.id,
+                Chunk.document_id,
+                Chunk.chunk_index,
+                Chunk.content,
+                Chunk.embedding,
+            )
+            .where(Chunk.config_id == config_id)
+            .where(Chunk.embedding_dim == dim)
+        )
+        result = await db.execute(query)
+        rows = result.all()
+
+        return VectorIndex(
+            chunk_ids=[row.id for row in rows],
+            document_ids=[row.document_id for row in rows],
+            chunk_indexes=[row.chunk_index for row in rows],
+            contents=[row.content for row in rows],
+            embeddings=[row.embedding for row in rows] if rows else np.empty((0, dim)),
+            config_id=config_id,
+            version=version,
+        )
+
+
+# Process-wide registry used by query-time retrieval
+vector_indexes = VectorIndexRegistry()
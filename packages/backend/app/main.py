@@ -1,10 +1,22 @@
 """FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import projects, documents, configs, queries, experiments, settings as settings_api
 from app.config import settings
+from app.services.experiment_runner import experiment_runner
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start in-process experiment workers on startup, stop them on shutdown."""
+    await experiment_runner.start()
+    yield
+    await experiment_runner.shutdown()
+
 
 app = FastAPI(
     title="RAG Studio API",
@@ -12,6 +24,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -8,6 +8,11 @@ from app.models.query import Query
 from app.models.experiment import Experiment
 from app.models.result import Result
 from app.models.settings import Settings
+from app.models.work_item import ExperimentWorkItem
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.models.bm25_index import BM25IndexRecord
+from app.models.judge_verdict import JudgeVerdictEntry
+from app.models.generation_cache import GenerationCacheEntry
 
 __all__ = [
     "Project",
@@ -18,4 +23,9 @@ __all__ = [
     "Experiment",
     "Result",
     "Settings",
+    "ExperimentWorkItem",
+    "EmbeddingCacheEntry",
+    "BM25IndexRecord",
+    "JudgeVerdictEntry",
+    "GenerationCacheEntry",
 ]
@@ -0,0 +1,31 @@
+"""BM25 index model."""
+
+from datetime import datetime
+from sqlalchemy import Integer, LargeBinary, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.database import Base
+
+
+class BM25IndexRecord(Base):
+    """
+    Persisted Okapi BM25 inverted index of a config's chunks.
+
+    data holds the serialized index arrays (see app.core.bm25.BM25Index),
+    rebuilt whenever the config's chunks change.
+    """
+
+    __tablename__ = "bm25_indexes"
+
+    config_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("configs.id", ondelete="CASCADE"), primary_key=True
+    )
+    num_chunks: Mapped[int] = mapped_column(Integer, nullable=False)
+    num_terms: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<BM25IndexRecord(config_id={self.config_id}, num_chunks={self.num_chunks})>"
@@ -1,7 +1,7 @@
 """Chunk model."""
 
 from datetime import datetime
-from sqlalchemy import String, Text, Integer, ForeignKey, DateTime
+from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from pgvector.sqlalchemy import Vector
@@ -16,13 +16,19 @@ class Chunk(Base):
 
     The embedding column uses dynamic vector dimensions to support
     multiple embedding models (1536, 3072, etc.). The actual dimension
-    is stored in chunk_metadata['embedding_dim'] for validation.
+    and model are stored in the embedding_dim / embedding_model columns
+    (NULL for BM25-only chunks) for validation. Dense search uses
+    per-dimension partial HNSW indexes on the typed cast of the column
+    (see app.core.retrieval.indexed_embedding).
 
     The content_tsv column is automatically maintained by a database trigger
     for full-text search (BM25) support.
     """
 
     __tablename__ = "chunks"
+    __table_args__ = (
+        Index("idx_chunks_config_id_embedding_dim", "config_id", "embedding_dim"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     document_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,6 +39,8 @@ class Chunk(Base):
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
     embedding: Mapped[list[float] | None] = mapped_column(Vector(), nullable=True)
+    embedding_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    embedding_dim: Mapped[int | None] = mapped_column(Integer, nullable=True)
     content_tsv: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
     chunk_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
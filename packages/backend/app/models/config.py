@@ -34,9 +34,10 @@ class Config(Base):
     )  # 'openai-ada-002', 'cohere-v3'
     retrieval_strategy: Mapped[str] = mapped_column(
         String(50), nullable=False
-    )  # 'dense', 'hybrid', 'bm25'
+    )  # 'dense', 'hybrid', 'bm25', 'okapi_bm25'
     top_k: Mapped[int] = mapped_column(Integer, default=5)
     settings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # May contain ANN tuning for dense search: { "ef_search": int, "probes": int }
 
     # New evaluation settings
     evaluation_settings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
@@ -48,6 +49,16 @@ class Config(Base):
     prompt_template: Mapped[str | None] = mapped_column(Text, nullable=True)
     # Template for answer generation with variables: {context}, {question}, {top_k}
 
+    # Bumped (in the changing transaction) whenever the config's chunks are
+    # rewritten; per-process caches compare it on lookup so every process sees
+    # the change (in-memory vector/BM25 indexes reload)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped when anything else query-time results depend on changes (the
+    # config's settings, the project's queries), without reloading indexes
+    results_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationships
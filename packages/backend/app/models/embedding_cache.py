@@ -0,0 +1,28 @@
+"""Embedding cache model."""
+
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from pgvector.sqlalchemy import Vector
+
+from app.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """
+    Content-addressed embedding cache.
+
+    Keyed by embedding model and the SHA-256 of the embedded text, so
+    byte-identical chunks (or queries) are embedded once per model no matter
+    how many configs or experiments use them.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(Vector(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingCacheEntry(model={self.model}, text_hash={self.text_hash[:12]})>"
@@ -1,7 +1,7 @@
 """Experiment model."""
 
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, DateTime, ARRAY
+from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -10,7 +10,12 @@ from app.database import Base
 
 
 class Experiment(Base):
-    """Experiment model for running RAG tests."""
+    """
+    Experiment model for running RAG tests.
+
+    Experiments run as background jobs. progress_done counts the config/query
+    cells whose Result has been committed, out of progress_total cells.
+    """
 
     __tablename__ = "experiments"
 
@@ -25,6 +30,8 @@ class Experiment(Base):
         String(50), default="pending"
     )  # 'pending', 'running', 'completed', 'failed'
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    progress_done: Mapped[int] = mapped_column(Integer, default=0)
+    progress_total: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
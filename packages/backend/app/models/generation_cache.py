@@ -0,0 +1,29 @@
+"""Answer generation cache model."""
+
+from datetime import datetime
+from sqlalchemy import String, Text, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class GenerationCacheEntry(Base):
+    """
+    Content-addressed cache of deterministic (temperature 0) answer generations.
+
+    Keyed by the SHA-256 of (model, temperature, max_tokens, rendered prompt),
+    so a cell whose prompt - same chunks in the same order, same template -
+    was generated before reuses the stored answer and token usage.
+    """
+
+    __tablename__ = "generation_cache"
+
+    prompt_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<GenerationCacheEntry(model={self.model}, prompt_hash={self.prompt_hash[:12]})>"
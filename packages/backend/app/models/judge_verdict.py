@@ -0,0 +1,33 @@
+"""LLM judge verdict cache model."""
+
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class JudgeVerdictEntry(Base):
+    """
+    Content-addressed cache of LLM judge verdicts.
+
+    Keyed by judge model, prompt version and the SHA-256 of the normalized
+    query and of the (truncated) chunk text shown to the judge, so a chunk
+    retrieved by several configs - or by a rerun - is judged once per query.
+    """
+
+    __tablename__ = "judge_verdicts"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String(20), primary_key=True)
+    query_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    chunk_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    verdict: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return (
+            f"<JudgeVerdictEntry(model={self.model}, query_hash={self.query_hash[:12]}, "
+            f"chunk_hash={self.chunk_hash[:12]})>"
+        )
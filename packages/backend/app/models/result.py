@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Integer, Float, ForeignKey, DateTime, ARRAY, Numeric, Text
+from sqlalchemy import Integer, Float, ForeignKey, DateTime, ARRAY, Numeric, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
@@ -21,6 +21,10 @@ class Result(Base):
     """
 
     __tablename__ = "results"
+    __table_args__ = (
+        # One result per cell: lets interrupted experiments resume safely
+        UniqueConstraint("experiment_id", "config_id", "query_id", name="uq_results_cell"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     experiment_id: Mapped[uuid.UUID] = mapped_column(
@@ -35,8 +39,12 @@ class Result(Base):
     retrieved_chunk_ids: Mapped[list[uuid.UUID]] = mapped_column(
         ARRAY(UUID(as_uuid=True)), nullable=False
     )
+    # Per-chunk retrieval scores (cosine similarity / ts_rank_cd / RRF), aligned with retrieved_chunk_ids
+    retrieved_scores: Mapped[list[float] | None] = mapped_column(ARRAY(Float), nullable=True)
     score: Mapped[float | None] = mapped_column(Float, nullable=True)
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Per-stage wall time in ms (query_embedding, retrieval, ir_evaluation, llm_judge, ...)
+    timings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     result_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     # New evaluation fields
@@ -0,0 +1,46 @@
+"""Experiment work item model."""
+
+from datetime import datetime
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.database import Base
+
+
+class ExperimentWorkItem(Base):
+    """
+    One config/query cell of an experiment, queued for execution.
+
+    Worker processes claim pending items with SELECT ... FOR UPDATE SKIP LOCKED
+    and keep heartbeat_at fresh while they work; claims whose heartbeat goes
+    stale are picked up again by other workers.
+    """
+
+    __tablename__ = "experiment_work_items"
+    __table_args__ = (
+        UniqueConstraint(
+            "experiment_id", "config_id", "query_id", name="uq_experiment_work_items_cell"
+        ),
+        Index("idx_experiment_work_items_status", "status", "heartbeat_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    experiment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
+    )
+    config_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    query_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(50), default="pending"
+    )  # 'pending', 'claimed', 'done', 'cancelled'
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    claimed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ExperimentWorkItem(id={self.id}, status={self.status})>"
@@ -8,6 +8,7 @@ from app.schemas.experiment import (
     ExperimentCreate,
     ExperimentResponse,
     ExperimentResultsResponse,
+    ExperimentProgressResponse,
     ConfigResult,
     QueryResult,
     ChunkResult,
@@ -29,6 +30,7 @@ __all__ = [
     "ExperimentCreate",
     "ExperimentResponse",
     "ExperimentResultsResponse",
+    "ExperimentProgressResponse",
     "ConfigResult",
     "QueryResult",
     "ChunkResult",
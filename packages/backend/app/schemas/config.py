@@ -13,7 +13,7 @@ class ConfigBase(BaseModel):
     chunk_size: int | None = Field(None, ge=1, le=8192, description="Chunk size in tokens")
     chunk_overlap: int | None = Field(None, ge=0, le=1000, description="Chunk overlap in tokens")
     embedding_model: str = Field(..., description="Embedding model: 'openai-ada-002', 'cohere-v3'")
-    retrieval_strategy: str = Field(..., description="Retrieval strategy: 'dense', 'hybrid', 'bm25'")
+    retrieval_strategy: str = Field(..., description="Retrieval strategy: 'dense', 'hybrid', 'bm25', 'okapi_bm25'")
     top_k: int = Field(5, ge=1, le=20, description="Number of chunks to retrieve")
     settings: dict | None = Field(None, description="Additional settings")
     evaluation_settings: dict | None = Field(None, description="Evaluation settings (LLM judge, RAGAS, etc.)")
@@ -1,6 +1,7 @@
 """Experiment schemas."""
 
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 from uuid import UUID
 
@@ -26,6 +27,8 @@ class ExperimentResponse(ExperimentBase):
     project_id: UUID
     status: str = Field(..., description="Status: 'pending', 'running', 'completed', 'failed'")
     error_message: str | None = None
+    progress_done: int = 0
+    progress_total: int = 0
     created_at: datetime
     started_at: datetime | None = None
     completed_at: datetime | None = None
@@ -34,12 +37,25 @@ class ExperimentResponse(ExperimentBase):
         from_attributes = True
 
 
+class ExperimentProgressResponse(BaseModel):
+    """Schema for experiment job progress."""
+
+    experiment_id: UUID
+    status: str
+    done: int = Field(..., description="Config/query cells completed")
+    total: int = Field(..., description="Total config/query cells")
+    percent: float
+    elapsed_seconds: float | None = None
+    eta_seconds: float | None = Field(None, description="Estimated seconds until completion")
+
+
 class ChunkResult(BaseModel):
     """Schema for chunk result in experiment."""
 
     id: UUID
     content: str
-    score: float | None = None
+    score: float | None = Field(None, description="Retrieval score computed by the search query")
+    rank: int | None = None
 
 
 class QueryResult(BaseModel):
@@ -51,14 +67,33 @@ class QueryResult(BaseModel):
     chunks: list[ChunkResult]
     score: float | None = None
     latency_ms: int | None = None
+    timings: dict[str, float] | None = Field(
+        None, description="Wall time in ms per pipeline stage (batched stages amortized per query)"
+    )
     metrics: dict | None = None
     evaluation_cost_usd: float | None = None
     # Answer generation fields
     generated_answer: str | None = None
     generation_cost_usd: float | None = None
+    generation_cached: bool | None = Field(
+        None, description="Whether the answer was served from the generation cache"
+    )
     answer_metrics: dict | None = None
 
 
+class StageTimingStats(BaseModel):
+    """Latency distribution of one pipeline stage across a config's results."""
+
+    count: int
+    mean_ms: float
+    amortized: bool = Field(
+        False, description="Timed per batch and split evenly across its queries (no percentiles)"
+    )
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+
+
 class ConfigResult(BaseModel):
     """Schema for config result in experiment."""
 
@@ -66,14 +101,28 @@ class ConfigResult(BaseModel):
     config_name: str
     avg_score: float | None = None
     avg_latency_ms: int | None = None
+    timings: dict[str, StageTimingStats] = Field(
+        default_factory=dict, description="Per-stage latency statistics, keyed by stage"
+    )
     results: list[QueryResult]
 
 
+class JudgeCacheStats(BaseModel):
+    """LLM judge verdict cache usage of an experiment."""
+
+    hits: int = Field(..., description="Chunk verdicts served from the cache")
+    misses: int = Field(..., description="Chunk verdicts requested from the judge model")
+    hit_rate: float = Field(..., description="hits / (hits + misses)")
+
+
 class ExperimentResultsResponse(BaseModel):
     """Schema for experiment results."""
 
     experiment_id: UUID
     configs: list[ConfigResult]
+    llm_judge_cache: JudgeCacheStats | None = Field(
+        None, description="Verdict cache usage (None if no config used the LLM judge)"
+    )
 
 
 class CostEstimateRequest(BaseModel):
@@ -83,6 +132,9 @@ class CostEstimateRequest(BaseModel):
     chunks_per_query: int = Field(5, ge=1, le=20, description="Chunks per query (top_k)")
     use_llm_judge: bool = Field(False, description="Use LLM judge evaluation")
     llm_judge_model: str = Field("gpt-3.5-turbo", description="LLM judge model")
+    llm_judge_mode: Literal["pointwise", "listwise"] = Field(
+        "pointwise", description="One judge request per chunk, or one per query (listwise)"
+    )
     use_ragas: bool = Field(False, description="Use RAGAS evaluation")
 
 
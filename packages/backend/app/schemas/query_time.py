@@ -1,6 +1,7 @@
 """Query-time experiment schemas."""
 
 from uuid import UUID
+from typing import Annotated
 from pydantic import BaseModel, Field
 
 
@@ -56,7 +57,7 @@ class ChunkResponse(BaseModel):
     id: UUID
     content: str
     chunk_index: int
-    similarity_score: float | None = None  # If available
+    similarity_score: float | None = None  # Retrieval score (cosine similarity, ts_rank_cd or RRF)
 
 
 class QueryTimeExperimentResponse(BaseModel):
@@ -76,6 +77,9 @@ class QueryTimeExperimentResponse(BaseModel):
     # Optional: trace data (if requested)
     trace: dict | None = None
 
+    # Served from the query-time result cache
+    cached: bool = False
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -105,3 +109,52 @@ class QueryTimeExperimentResponse(BaseModel):
                 }
             }
         }
+
+
+class QueryTimeSweepRequest(BaseModel):
+    """Request for sweeping top_k and fusion weights over one candidate set."""
+
+    config_id: UUID = Field(..., description="Base configuration to use")
+    query_id: UUID | None = Field(None, description="Existing query to test")
+    query_text: str | None = Field(None, description="Ad-hoc query text (if query_id not provided)")
+    top_k_values: list[Annotated[int, Field(ge=1, le=50)]] = Field(
+        ..., min_length=1, max_length=50, description="top_k values to evaluate"
+    )
+    dense_weights: list[Annotated[float, Field(ge=0.0, le=1.0)]] = Field(
+        default_factory=lambda: [0.5],
+        min_length=1,
+        max_length=50,
+        description="Dense weights to evaluate for hybrid configs (sparse weight = 1 - dense weight)",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "config_id": "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+                "query_text": "What are the side effects of aspirin?",
+                "top_k_values": [3, 5, 10],
+                "dense_weights": [0.3, 0.5, 0.7]
+            }
+        }
+
+
+class SweepPoint(BaseModel):
+    """Evaluation of one top_k / weight combination."""
+
+    top_k: int
+    dense_weight: float | None = None
+    sparse_weight: float | None = None
+    score: float | None = Field(None, description="Primary score for ranking")
+    metrics: dict = Field(default_factory=dict, description="Evaluation metrics")
+    retrieved_chunk_ids: list[UUID] = Field(default_factory=list)
+
+
+class QueryTimeSweepResponse(BaseModel):
+    """Metric surface over every top_k x weight combination."""
+
+    points: list[SweepPoint]
+    best: SweepPoint | None = Field(None, description="Combination with the highest primary score")
+    candidates: int = Field(..., description="Distinct chunks fetched by the single retrieval")
+    latency_ms: int = Field(..., description="Time spent on embedding + retrieval")
+    retrieval_strategy: str
+    embedding_model: str
@@ -1,7 +1,7 @@
 """Config service for business logic."""
 
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.config import Config
@@ -17,6 +17,11 @@ from app.schemas.chunk_visualization import (
 from app.schemas.similarity import SimilarityMatrixResponse
 from app.core.chunking import ChunkingService
 from app.core.embedding import EmbeddingService, get_model_dimensions
+from app.core.embedding_cache import EmbeddingCache
+from app.core.chunk_writer import ChunkRow, ChunkWriter
+from app.core.vector_index import vector_indexes
+from app.core.bm25 import bm25_indexes, save_bm25_index
+from app.core.query_cache import query_results
 
 
 class ConfigService:
@@ -60,9 +65,9 @@ class ConfigService:
                 "OpenAI API key not configured. Please set it in Settings."
             )
 
-        # Initialize services
+        # Initialize services (chunk embeddings are shared across configs via the cache)
         chunking_service = ChunkingService()
-        embedding_service = EmbeddingService(api_key=api_key)
+        embedding_service = EmbeddingService(api_key=api_key, cache=EmbeddingCache(self.db))
 
         # Get embedding dimensions for this model
         embedding_dim = get_model_dimensions(config.embedding_model)
@@ -70,48 +75,68 @@ class ConfigService:
         # Check if we need embeddings (not needed for BM25-only)
         needs_embeddings = config.retrieval_strategy in ("dense", "hybrid")
 
-        # Process each document
-        for document in documents:
-            # Chunk document
-            chunks = chunking_service.chunk_text(
-                text=document.content,
-                strategy=config.chunk_strategy,
-                chunk_size=config.chunk_size or 512,
-                chunk_overlap=config.chunk_overlap or 50,
+        # Chunk every document first so embeddings can be batched across documents
+        document_chunks = [
+            (
+                document,
+                chunking_service.chunk_text(
+                    text=document.content,
+                    strategy=config.chunk_strategy,
+                    chunk_size=config.chunk_size or 512,
+                    chunk_overlap=config.chunk_overlap or 50,
+                ),
             )
-
-            # Generate embeddings only if needed
-            if needs_embeddings:
-                embeddings = await embedding_service.embed_batch(
-                    texts=chunks,
+            for document in documents
+        ]
+        all_chunks = [chunk_text for _, chunks in document_chunks for chunk_text in chunks]
+
+        # Generate embeddings only if needed
+        if needs_embeddings:
+            embeddings = iter(
+                await embedding_service.embed_batch(
+                    texts=all_chunks,
                     model=config.embedding_model,
                 )
-            else:
-                # BM25-only: no embeddings needed
-                embeddings = [None] * len(chunks)
-
-            # Create chunk records with metadata including dimensions
-            for idx, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-                chunk_meta = {
-                    "strategy": config.chunk_strategy,
-                }
-
-                # Only add embedding metadata if we have embeddings
-                if needs_embeddings:
-                    chunk_meta["embedding_model"] = config.embedding_model
-                    chunk_meta["embedding_dim"] = embedding_dim
-
-                chunk = Chunk(
-                    document_id=document.id,
-                    config_id=config.id,
-                    content=chunk_text,
-                    embedding=embedding,
-                    chunk_index=idx,
-                    chunk_metadata=chunk_meta,
-                )
-                self.db.add(chunk)
+            )
+        else:
+            # BM25-only: no embeddings needed
+            embeddings = iter([None] * len(all_chunks))
+
+        # Chunk metadata including dimensions (only if we have embeddings)
+        chunk_meta = {
+            "strategy": config.chunk_strategy,
+        }
+        if needs_embeddings:
+            chunk_meta["embedding_model"] = config.embedding_model
+            chunk_meta["embedding_dim"] = embedding_dim
+
+        # Bulk-write chunk rows (COPY) instead of one ORM object per chunk
+        await ChunkWriter(self.db).write(
+            ChunkRow(
+                document_id=document.id,
+                config_id=config.id,
+                content=chunk_text,
+                embedding=next(embeddings),
+                embedding_model=config.embedding_model if needs_embeddings else None,
+                embedding_dim=embedding_dim if needs_embeddings else None,
+                chunk_index=idx,
+                chunk_metadata=chunk_meta,
+            )
+            for document, chunks in document_chunks
+            for idx, chunk_text in enumerate(chunks)
+        )
 
+        if config.retrieval_strategy == "okapi_bm25":
+            await save_bm25_index(self.db, config.id)
+
+        # Caches in every process reload the config's chunks on their next lookup
+        await self.db.execute(
+            update(Config).where(Config.id == config.id).values(version=Config.version + 1)
+        )
         await self.db.commit()
+        vector_indexes.invalidate(config.id)
+        bm25_indexes.invalidate(config.id)
+        query_results.invalidate(config.id)
 
     async def get_config(self, config_id: UUID) -> Config | None:
         """Get config by ID with chunk count."""
@@ -160,9 +185,13 @@ class ConfigService:
         update_data = config_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(config, key, value)
+        # Cached query-time results depend on the settings (in every process);
+        # the chunks are unchanged, so in-memory indexes stay valid
+        config.results_version = Config.results_version + 1
 
         await self.db.commit()
         await self.db.refresh(config)
+        query_results.invalidate(config_id)
         return config
 
     async def delete_config(self, config_id: UUID) -> bool:
@@ -191,6 +220,9 @@ class ConfigService:
         # Delete the config itself
         await self.db.delete(config)
         await self.db.commit()
+        vector_indexes.invalidate(config_id)
+        bm25_indexes.invalidate(config_id)
+        query_results.invalidate(config_id)
         return True
 
     async def build_chunk_visualization(
@@ -1,12 +1,17 @@
 """Document service for business logic."""
 
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.document import Document
+from app.models.config import Config
+from app.models.bm25_index import BM25IndexRecord
 from app.schemas.document import DocumentCreate
 from app.core.document_parser import DocumentParser
+from app.core.vector_index import vector_indexes
+from app.core.bm25 import bm25_indexes, save_bm25_index
+from app.core.query_cache import query_results
 
 
 class DocumentService:
@@ -69,5 +74,26 @@ class DocumentService:
             return False
 
         await self.db.delete(document)
+        await self.db.flush()
+
+        # Re-index the project's persisted BM25 indexes without its chunks
+        indexed_configs = await self.db.execute(
+            select(BM25IndexRecord.config_id)
+            .join(Config, Config.id == BM25IndexRecord.config_id)
+            .where(Config.project_id == document.project_id)
+        )
+        for config_id in indexed_configs.scalars().all():
+            await save_bm25_index(self.db, config_id)
+
+        # Caches in every process reload the project's chunks on their next lookup
+        await self.db.execute(
+            update(Config)
+            .where(Config.project_id == document.project_id)
+            .values(version=Config.version + 1)
+        )
         await self.db.commit()
+        # Its chunks (in every config) are gone
+        vector_indexes.invalidate()
+        bm25_indexes.invalidate()
+        query_results.invalidate()
         return True
@@ -0,0 +1,199 @@
+"""Postgres-backed work queue for experiment cells."""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.experiment import Experiment
+from app.models.work_item import ExperimentWorkItem
+
+
+def _db_now():
+    """Current UTC time according to the database (shared clock for all nodes)."""
+    return func.timezone("utc", func.now())
+
+
+class ExperimentQueue:
+    """
+    Work queue of experiment cells stored in the experiment_work_items table.
+
+    Any number of worker processes, on any node, can claim items concurrently:
+    claims use SELECT ... FOR UPDATE SKIP LOCKED so each item goes to exactly
+    one worker, and items whose heartbeat is older than the stale timeout are
+    handed out again.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize queue with database session."""
+        self.db = db
+
+    async def enqueue(self, experiment: Experiment) -> None:
+        """Materialize one work item per config/query cell of an experiment."""
+        rows = [
+            {"experiment_id": experiment.id, "config_id": config_id, "query_id": query_id}
+            for config_id in experiment.config_ids
+            for query_id in experiment.query_ids
+        ]
+        if not rows:
+            return
+
+        stmt = (
+            insert(ExperimentWorkItem)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["experiment_id", "config_id", "query_id"])
+        )
+        await self.db.execute(stmt)
+
+    async def claim(
+        self,
+        worker_id: str,
+        limit: int,
+        stale_after_seconds: float,
+    ) -> list[ExperimentWorkItem]:
+        """
+        Claim pending (or stale) work items of one experiment config for a worker.
+
+        The oldest claimable item picks the (experiment, config); all of its
+        claimable items are claimed together, up to ``limit``, so the
+        config's query set is retrieved in one batch.
+
+        Returns:
+            Claimed work items (committed; empty if nothing is claimable)
+        """
+        now = _db_now()
+        stale_before = now - timedelta(seconds=stale_after_seconds)
+        claimable = or_(
+            ExperimentWorkItem.status == "pending",
+            and_(
+                ExperimentWorkItem.status == "claimed",
+                ExperimentWorkItem.heartbeat_at < stale_before,
+            ),
+        )
+
+        head = (
+            await self.db.execute(
+                select(ExperimentWorkItem.experiment_id, ExperimentWorkItem.config_id)
+                .where(claimable)
+                .order_by(
+                    ExperimentWorkItem.created_at,
+                    ExperimentWorkItem.config_id,
+                    ExperimentWorkItem.query_id,
+                )
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+        ).first()
+        if head is None:
+            await self.db.commit()
+            return []
+
+        candidates = (
+            select(ExperimentWorkItem.id)
+            .where(claimable)
+            .where(ExperimentWorkItem.experiment_id == head.experiment_id)
+            .where(ExperimentWorkItem.config_id == head.config_id)
+            .order_by(ExperimentWorkItem.query_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        stmt = (
+            update(ExperimentWorkItem)
+            .where(ExperimentWorkItem.id.in_(candidates.scalar_subquery()))
+            .values(
+                status="claimed",
+                claimed_by=worker_id,
+                claimed_at=now,
+                heartbeat_at=now,
+                attempts=ExperimentWorkItem.attempts + 1,
+            )
+            .returning(ExperimentWorkItem)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        items = list(result.scalars().all())
+
+        if items:
+            # First claim flips the experiment from 'pending' to 'running'
+            experiment_ids = {item.experiment_id for item in items}
+            await self.db.execute(
+                update(Experiment)
+                .where(Experiment.id.in_(experiment_ids))
+                .where(Experiment.status == "pending")
+                .values(status="running", started_at=datetime.utcnow())
+            )
+
+        await self.db.commit()
+        return items
+
+    async def heartbeat(self, worker_id: str, item_ids: list[UUID]) -> None:
+        """Refresh the heartbeat of items still claimed by this worker."""
+        await self.db.execute(
+            update(ExperimentWorkItem)
+            .where(ExperimentWorkItem.id.in_(item_ids))
+            .where(ExperimentWorkItem.status == "claimed")
+            .where(ExperimentWorkItem.claimed_by == worker_id)
+            .values(heartbeat_at=_db_now())
+        )
+        await self.db.commit()
+
+    async def complete(self, item: ExperimentWorkItem) -> bool:
+        """
+        Mark an item done as part of the caller's transaction.
+
+        Returns:
+            False if the claim was lost (reclaimed by another worker or
+            cancelled), in which case the caller must not persist its result.
+        """
+        result = await self.db.execute(
+            update(ExperimentWorkItem)
+            .where(ExperimentWorkItem.id == item.id)
+            .where(ExperimentWorkItem.status == "claimed")
+            .where(ExperimentWorkItem.claimed_by == item.claimed_by)
+            .values(status="done", completed_at=_db_now())
+        )
+        return result.rowcount > 0
+
+    async def finalize(self, experiment_id: UUID) -> bool:
+        """
+        Mark an experiment completed once none of its items are outstanding.
+
+        Safe to call from every worker: only the call that observes the last
+        item done flips the status.
+
+        Returns:
+            True if this call completed the experiment
+        """
+        outstanding = (
+            select(ExperimentWorkItem.id)
+            .where(ExperimentWorkItem.experiment_id == experiment_id)
+            .where(ExperimentWorkItem.status.in_(("pending", "claimed")))
+            .exists()
+        )
+        result = await self.db.execute(
+            update(Experiment)
+            .where(Experiment.id == experiment_id)
+            .where(Experiment.status.in_(("pending", "running")))
+            .where(~outstanding)
+            .values(status="completed", completed_at=datetime.utcnow())
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def fail(self, experiment_id: UUID, error_message: str) -> None:
+        """Fail an experiment and cancel its outstanding items."""
+        await self.db.execute(
+            update(Experiment)
+            .where(Experiment.id == experiment_id)
+            .where(Experiment.status.in_(("pending", "running")))
+            .values(status="failed", error_message=error_message, completed_at=datetime.utcnow())
+        )
+        await self.db.execute(
+            update(ExperimentWorkItem)
+            .where(ExperimentWorkItem.experiment_id == experiment_id)
+            .where(ExperimentWorkItem.status.in_(("pending", "claimed")))
+            .values(status="cancelled", completed_at=_db_now())
+        )
+        await self.db.commit()
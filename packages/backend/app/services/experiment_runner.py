@@ -0,0 +1,60 @@
+"""In-process experiment workers for the API server."""
+
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.experiment_worker import ExperimentWorker
+
+
+class ExperimentRunner:
+    """
+    Run experiment workers as background tasks of the API process.
+
+    Experiments are queued in Postgres, so these workers cooperate with any
+    standalone workers (``python -m app.worker``) on other nodes, and jobs
+    interrupted by a restart are resumed from their last checkpoint.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        num_workers: int | None = None,
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            session_factory: Factory used to open sessions for background jobs
+            num_workers: Number of in-process workers (0 disables them)
+        """
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.num_workers = (
+            settings.EXPERIMENT_IN_PROCESS_WORKERS if num_workers is None else num_workers
+        )
+        self._workers: list[ExperimentWorker] = []
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the in-process workers."""
+        for _ in range(self.num_workers):
+            worker = ExperimentWorker(session_factory=self.session_factory)
+            self._workers.append(worker)
+            self._tasks.append(asyncio.create_task(worker.run_forever()))
+
+    def notify(self) -> None:
+        """Wake idle workers after new work has been enqueued."""
+        for worker in self._workers:
+            worker.wake()
+
+    async def shutdown(self) -> None:
+        """Stop workers; their claims go stale and are reclaimed later."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._workers.clear()
+        self._tasks.clear()
+
+
+experiment_runner = ExperimentRunner()
@@ -1,10 +1,15 @@
 """Experiment service for business logic."""
 
+import asyncio
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Awaitable, Callable
 from uuid import UUID
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import defer
 
 from app.models.experiment import Experiment
 from app.models.result import Result
@@ -12,54 +17,219 @@ from app.models.query import Query
 from app.models.config import Config
 from app.models.chunk import Chunk
 from app.models.document import Document
+from app.models.work_item import ExperimentWorkItem
 from app.schemas.experiment import ExperimentCreate
 from app.schemas.document_context import DocumentContextResponse, RetrievedChunkInfo
-from app.core.embedding import EmbeddingService
-from app.core.retrieval import RetrievalService
+from app.core.embedding import EmbeddingService, EmbeddingLookup
+from app.core.embedding_cache import EmbeddingCache
+from app.core.retrieval import RetrievalService, RetrievedChunk, HYBRID_FUSION_FACTOR, fuse_rrf
+from app.core.vector_index import vector_indexes
+from app.core.query_cache import query_results, normalize_query_text
 from app.core.evaluation.evaluator import EvaluationService
+from app.core.evaluation.judge_cache import JudgeVerdictCache
+from app.core.evaluation.basic_evaluator import BasicIREvaluator, EvaluationCase
 from app.core.generation import AnswerGenerationService
+from app.core.generation_cache import GenerationCache
 from app.core.evaluation.answer_evaluator import AnswerQualityEvaluator
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.experiment_queue import ExperimentQueue
+
+
+@dataclass
+class _CellServices:
+    """API-backed services shared by all cells of an experiment run."""
+
+    embedding: EmbeddingService
+    embeddings: EmbeddingLookup
+    evaluation: EvaluationService
+    generation: AnswerGenerationService
+    answer_evaluator: AnswerQualityEvaluator
+
+
+@dataclass
+class _CellRetrieval:
+    """Retrieval outcome of one config/query cell (computed in per-config batches)."""
+
+    retrieved: list[RetrievedChunk]
+    latency_ms: int
+    error: str | None = None
+    # Wall time in ms of query_embedding and retrieval (the SQL batch, amortized)
+    timings: dict[str, float] = field(default_factory=dict)
+    # Basic IR metrics, computed for all of a config's cells in one batch
+    basic_metrics: dict | None = None
+
+
+@dataclass
+class _PipelineCell:
+    """A config/query cell moving through the experiment pipeline."""
+
+    item: ExperimentWorkItem
+    config: Config
+    query: Query
+    retrieval: _CellRetrieval
+    evaluation_result: dict | None = None
+    generation_result: dict | None = None
+    answer_evaluation: dict | None = None
+    # Judging and answer stages still running; checkpointed when it drops to 0
+    pending_stages: int = 0
+    # Wall time in ms per stage, stored as Result.timings
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+async def _run_stage(
+    queue: asyncio.Queue,
+    workers: int,
+    handle: Callable[[Any], Awaitable[None]],
+) -> None:
+    """Process queue items with a pool of workers until each receives a None sentinel."""
+
+    async def worker() -> None:
+        while (entry := await queue.get()) is not None:
+            await handle(entry)
+
+    async with asyncio.TaskGroup() as task_group:
+        for _ in range(workers):
+            task_group.create_task(worker())
+
+
+async def _close_stage(queue: asyncio.Queue, workers: int) -> None:
+    """Stop a stage's workers once they drain the queue."""
+    for _ in range(workers):
+        await queue.put(None)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+# Stages timed once per batch and recorded as batch time / batch size: every
+# query of a batch gets the same value, so their percentiles say nothing about
+# per-query tail latency
+AMORTIZED_STAGES = frozenset({"retrieval", "ir_evaluation"})
+
+
+def _timing_stats(stage: str, samples: list[float]) -> dict:
+    """Mean and (unless the stage is amortized) p50/p95/p99 of one stage's timings."""
+    stats = {
+        "count": len(samples),
+        "mean_ms": round(float(np.mean(samples)), 2),
+        "amortized": stage in AMORTIZED_STAGES,
+        "p50_ms": None,
+        "p95_ms": None,
+        "p99_ms": None,
+    }
+    if not stats["amortized"]:
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        stats["p50_ms"] = round(float(p50), 2)
+        stats["p95_ms"] = round(float(p95), 2)
+        stats["p99_ms"] = round(float(p99), 2)
+    return stats
+
+
+def _first_error(error: BaseException) -> BaseException:
+    """Innermost first exception of (nested) exception groups."""
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
 
 
 class ExperimentService:
     """Service for experiment-related operations."""
 
-    def __init__(self, db: AsyncSession):
-        """Initialize service with database session."""
+    def __init__(
+        self,
+        db: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        max_concurrency: int | None = None,
+    ):
+        """
+        Initialize service with database session.
+
+        Args:
+            db: Database session for request-scoped operations
+            session_factory: Factory for per-cell sessions during experiment runs
+            max_concurrency: Default worker count of the LLM pipeline stages
+                (judging, generation, answer evaluation)
+        """
         self.db = db
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.max_concurrency = max_concurrency or settings.EXPERIMENT_MAX_CONCURRENCY
 
     async def create_experiment(
         self, project_id: UUID, experiment_data: ExperimentCreate
     ) -> Experiment:
-        """Create and run a new experiment."""
-        # Create experiment
+        """
+        Create a new experiment job.
+
+        The experiment is stored as 'pending' and its config x query matrix is
+        materialized as work items; experiment workers (in-process or on other
+        nodes) claim and execute them.
+        """
         experiment = Experiment(
             project_id=project_id,
             **experiment_data.model_dump(),
-            status="running",
-            started_at=datetime.utcnow(),
+            status="pending",
+            progress_done=0,
+            progress_total=len(experiment_data.config_ids) * len(experiment_data.query_ids),
         )
 
         self.db.add(experiment)
+        await self.db.flush()
+        await ExperimentQueue(self.db).enqueue(experiment)
         await self.db.commit()
         await self.db.refresh(experiment)
+        return experiment
+
+    async def run_work_items(
+        self,
+        experiment_id: UUID,
+        items: list[ExperimentWorkItem],
+        embeddings: EmbeddingLookup | None = None,
+    ) -> None:
+        """
+        Execute claimed work items of one experiment.
+
+        Completes the experiment when its last item is done; an unexpected
+        error fails the experiment and cancels its outstanding items.
+
+        Args:
+            experiment_id: Experiment the items belong to
+            items: Work items claimed by the calling worker
+            embeddings: Query/ground truth embeddings reused across batches
+        """
+        queue = ExperimentQueue(self.db)
+        experiment = await self.get_experiment(experiment_id)
+        if not experiment:
+            return
 
-        # Run experiment
         try:
-            await self._run_experiment(experiment)
-            experiment.status = "completed"
-            experiment.completed_at = datetime.utcnow()
+            await self._run_experiment(experiment, items, embeddings)
         except Exception as e:
-            experiment.status = "failed"
-            experiment.error_message = str(e)
-            experiment.completed_at = datetime.utcnow()
-
-        await self.db.commit()
-        await self.db.refresh(experiment)
-        return experiment
+            await queue.fail(experiment.id, str(e))
+        else:
+            await queue.finalize(experiment.id)
 
-    async def _run_experiment(self, experiment: Experiment) -> None:
-        """Run experiment by testing all config/query combinations."""
+    async def _run_experiment(
+        self,
+        experiment: Experiment,
+        items: list[ExperimentWorkItem],
+        embeddings: EmbeddingLookup | None = None,
+    ) -> None:
+        """
+        Run the given config/query cells of an experiment.
+
+        Query and ground truth texts of the whole experiment are embedded up
+        front, once per embedding model, so cells never call the embeddings API.
+        The cells then flow through a staged pipeline (see _run_pipeline):
+        retrieval runs as one batched statement per config for all of the
+        batch's queries, while judging, generation and answer evaluation of
+        already retrieved cells proceed concurrently.
+        Every stage uses its own database sessions (a single AsyncSession is
+        not safe for concurrent use); each cell commits its Result, the
+        progress counter and its work item as one checkpoint.
+        """
         # Get OpenAI API key from settings
         from app.services.settings_service import SettingsService
         settings_service = SettingsService(self.db)
@@ -70,161 +240,547 @@ class ExperimentService:
                 "OpenAI API key not configured. Please set it in Settings."
             )
 
-        embedding_service = EmbeddingService(api_key=api_key)
-        retrieval_service = RetrievalService(self.db)
-        evaluation_service = EvaluationService(openai_api_key=api_key)
-        generation_service = AnswerGenerationService(api_key=api_key)
-        answer_evaluator = AnswerQualityEvaluator(api_key=api_key)
+        services = _CellServices(
+            embedding=EmbeddingService(api_key=api_key),
+            embeddings=embeddings or EmbeddingLookup(),
+            evaluation=EvaluationService(
+                openai_api_key=api_key, judge_verdicts=JudgeVerdictCache()
+            ),
+            generation=AnswerGenerationService(api_key=api_key, cache=GenerationCache()),
+            answer_evaluator=AnswerQualityEvaluator(api_key=api_key),
+        )
 
-        # Get all queries
+        # Get all queries and configs of the experiment
         queries_query = select(Query).where(Query.id.in_(experiment.query_ids))
         queries_result = await self.db.execute(queries_query)
-        queries = list(queries_result.scalars().all())
+        queries = {q.id: q for q in queries_result.scalars().all()}
 
-        # Get all configs
         configs_query = select(Config).where(Config.id.in_(experiment.config_ids))
         configs_result = await self.db.execute(configs_query)
-        configs = list(configs_result.scalars().all())
-
-        # Test each config against each query
-        for config in configs:
-            for query in queries:
-                try:
-                    start_time = time.time()
-
-                    # Retrieve chunks based on configured retrieval strategy
-                    if config.retrieval_strategy == "dense":
-                        # Dense retrieval: needs query embedding
-                        query_embedding = await embedding_service.embed_single(
-                            text=query.query_text,
-                            model=config.embedding_model,
-                        )
-                        chunks = await retrieval_service.search_dense(
-                            query_embedding=query_embedding,
-                            config_id=config.id,
-                            top_k=config.top_k,
-                        )
-                    elif config.retrieval_strategy == "bm25":
-                        # BM25 retrieval: no embedding needed
-                        chunks = await retrieval_service.search_bm25(
-                            query_text=query.query_text,
-                            config_id=config.id,
-                            top_k=config.top_k,
-                        )
-                    elif config.retrieval_strategy == "hybrid":
-                        # Hybrid retrieval: needs query embedding
-                        query_embedding = await embedding_service.embed_single(
-                            text=query.query_text,
-                            model=config.embedding_model,
-                        )
-                        chunks = await retrieval_service.search_hybrid(
-                            query_embedding=query_embedding,
-                            query_text=query.query_text,
-                            config_id=config.id,
-                            top_k=config.top_k,
-                        )
-                    else:
-                        raise ValueError(f"Unknown retrieval strategy: {config.retrieval_strategy}")
-                except ValueError as e:
-                    # Dimension mismatch or other validation error
-                    # Skip this config/query combination and log the error
-                    result = Result(
-                        experiment_id=experiment.id,
-                        config_id=config.id,
-                        query_id=query.id,
-                        retrieved_chunk_ids=[],
-                        score=None,
-                        latency_ms=0,
-                        result_metadata={
-                            "error": str(e),
-                            "config_name": config.name,
-                            "query_text": query.query_text,
-                        },
-                    )
-                    self.db.add(result)
-                    continue
+        configs = {c.id: c for c in configs_result.scalars().all()}
+
+        # Pre-pass: one embedding per distinct (text, model) across all configs
+        embedding_models = {
+            config.embedding_model
+            for config in configs.values()
+            if config.retrieval_strategy in ("dense", "hybrid")
+        }
+        embedding_pairs = []
+        for query in queries.values():
+            for model in embedding_models:
+                embedding_pairs.append((query.query_text, model))
+                if (
+                    query.ground_truth
+                    and query.ground_truth.strip()
+                    and not query.ground_truth_chunk_ids
+                ):
+                    embedding_pairs.append((query.ground_truth, model))
+        # The prefetch runs before the fan-out, so it can safely use the
+        # persistent cache on this service's session
+        cached_embedding_service = EmbeddingService(api_key=api_key, cache=EmbeddingCache(self.db))
+        await services.embeddings.prefetch(cached_embedding_service, embedding_pairs)
+        await self.db.commit()
+
+        for item in items:
+            if item.config_id not in configs or item.query_id not in queries:
+                raise ValueError(
+                    f"Config {item.config_id} or query {item.query_id} no longer exists"
+                )
+
+        await self._run_pipeline(experiment, items, configs, queries, services)
+
+    async def _run_pipeline(
+        self,
+        experiment: Experiment,
+        items: list[ExperimentWorkItem],
+        configs: dict[UUID, Config],
+        queries: dict[UUID, Query],
+        services: "_CellServices",
+    ) -> None:
+        """
+        Run cells through a staged pipeline.
+
+        Stages are connected by bounded queues and each has its own worker
+        pool (see _stage_concurrency), so retrieval for upcoming configs,
+        LLM judging, answer generation and answer evaluation of other cells
+        all proceed at the same time; throughput is bounded by the slowest
+        stage rather than the sum of a cell's stage latencies:
 
-                end_time = time.time()
-                latency_ms = int((end_time - start_time) * 1000)
+            retrieval (one batch per config, then its basic IR metrics
+            and cache prefetch) -> LLM judging ----------------------> checkpoint
+                                -> generation -> answer evaluation -->
 
-                # NEW: Run comprehensive evaluation
-                evaluation_result = await evaluation_service.evaluate_retrieval(
-                    query=query,
-                    retrieved_chunks=chunks,
-                    config=config,
-                    top_k=config.top_k
+        A cell is checkpointed once its judging and (if enabled) answer
+        stages are done. The first unexpected error cancels every stage and
+        fails the experiment.
+        """
+        limits = self._stage_concurrency()
+
+        items_by_config: dict[UUID, list[ExperimentWorkItem]] = {}
+        for item in items:
+            items_by_config.setdefault(item.config_id, []).append(item)
+
+        config_queue: asyncio.Queue = asyncio.Queue()
+        for config_id in items_by_config:
+            config_queue.put_nowait(config_id)
+        for _ in range(limits["retrieval"]):
+            config_queue.put_nowait(None)
+        judge_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * limits["judge"])
+        generation_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * limits["generation"])
+        answer_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * limits["answer_evaluation"])
+        checkpoint_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * limits["checkpoint"])
+
+        async def stage_done(cell: _PipelineCell) -> None:
+            cell.pending_stages -= 1
+            if cell.pending_stages == 0:
+                await checkpoint_queue.put(cell)
+
+        async def retrieve(config_id: UUID) -> None:
+            # Batched retrieval: one statement per config for all of its queries
+            config = configs[config_id]
+            config_items = items_by_config[config_id]
+            retrievals = await self._retrieve_batch(
+                config, [queries[item.query_id] for item in config_items], services
+            )
+            cells = [
+                _PipelineCell(item, config, queries[item.query_id], retrievals[item.query_id])
+                for item in config_items
+            ]
+            for cell in cells:
+                cell.timings.update(cell.retrieval.timings)
+            await self._evaluate_basic_batch(cells, services)
+            await self._prefetch_cell_caches(cells, services)
+
+            generate = self._generation_params(config) is not None
+            for cell in cells:
+                if cell.retrieval.error:
+                    await checkpoint_queue.put(cell)
+                    continue
+                cell.pending_stages = 2 if generate else 1
+                await judge_queue.put(cell)
+                if generate:
+                    await generation_queue.put(cell)
+
+        async def judge(cell: _PipelineCell) -> None:
+            await self._evaluate_cell(cell, services)
+            await stage_done(cell)
+
+        async def generate(cell: _PipelineCell) -> None:
+            await self._generate_cell(cell, services)
+            if cell.generation_result.get("answer") and not cell.generation_result.get("error"):
+                await answer_queue.put(cell)
+            else:
+                await stage_done(cell)
+
+        async def evaluate_answer(cell: _PipelineCell) -> None:
+            await self._evaluate_answer_cell(cell, services)
+            await stage_done(cell)
+
+        async def checkpoint(cell: _PipelineCell) -> None:
+            await self._checkpoint(experiment, cell, services)
+
+        async def retrieval_stage() -> None:
+            await _run_stage(config_queue, limits["retrieval"], retrieve)
+            await _close_stage(judge_queue, limits["judge"])
+            await _close_stage(generation_queue, limits["generation"])
+
+        async def generation_stage() -> None:
+            await _run_stage(generation_queue, limits["generation"], generate)
+            await _close_stage(answer_queue, limits["answer_evaluation"])
+
+        async def cell_stages() -> None:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(retrieval_stage())
+                task_group.create_task(_run_stage(judge_queue, limits["judge"], judge))
+                task_group.create_task(generation_stage())
+                task_group.create_task(
+                    _run_stage(answer_queue, limits["answer_evaluation"], evaluate_answer)
                 )
+            await _close_stage(checkpoint_queue, limits["checkpoint"])
 
-                # Get primary score for ranking
-                primary_score = EvaluationService.get_primary_score(
-                    evaluation_result["metrics"]
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(cell_stages())
+                task_group.create_task(
+                    _run_stage(checkpoint_queue, limits["checkpoint"], checkpoint)
                 )
+        except ExceptionGroup as eg:
+            raise _first_error(eg)
+
+    async def _checkpoint(
+        self, experiment: Experiment, cell: "_PipelineCell", services: "_CellServices"
+    ) -> None:
+        """Commit a finished cell's work item, Result and progress in one transaction."""
+        result = self._build_result(experiment, cell)
+        async with self.session_factory() as session:
+            if not await ExperimentQueue(session).complete(cell.item):
+                # Claim was lost to another worker; its result wins
+                await session.rollback()
+                return
+            session.add(result)
+            await services.evaluation.judge_verdicts.flush(session)
+            await services.generation.cache.flush(session)
+            await session.execute(
+                update(Experiment)
+                .where(Experiment.id == experiment.id)
+                .values(progress_done=Experiment.progress_done + 1)
+            )
+            await session.commit()
+
+    def _stage_concurrency(self) -> dict[str, int]:
+        """Worker count of each pipeline stage (unset LLM stages use max_concurrency)."""
+        return {
+            "retrieval": settings.EXPERIMENT_RETRIEVAL_CONCURRENCY,
+            "judge": settings.EXPERIMENT_JUDGE_CONCURRENCY or self.max_concurrency,
+            "generation": settings.EXPERIMENT_GENERATION_CONCURRENCY or self.max_concurrency,
+            "answer_evaluation": (
+                settings.EXPERIMENT_ANSWER_EVAL_CONCURRENCY or self.max_concurrency
+            ),
+            "checkpoint": settings.EXPERIMENT_CHECKPOINT_CONCURRENCY,
+        }
 
-                # PHASE 2: Answer Generation (if enabled in config)
-                generated_answer = None
-                generation_cost = 0.0
-                answer_metrics = None
-
-                generation_settings = config.generation_settings or {}
-                if generation_settings.get("enabled", False):
-                    # Generate answer from chunks
-                    generation_result = await generation_service.generate_answer(
-                        query_text=query.query_text,
-                        chunks=chunks,
-                        model=generation_settings.get("model", "gpt-4o-mini"),
-                        temperature=generation_settings.get("temperature", 0.0),
-                        max_tokens=generation_settings.get("max_tokens", 500),
-                        prompt_template=config.prompt_template,
+    async def _retrieve_batch(
+        self,
+        config: Config,
+        queries: list[Query],
+        services: "_CellServices",
+    ) -> dict[UUID, _CellRetrieval]:
+        """
+        Retrieve chunks for many queries against one config in a single statement.
+
+        Validation errors (dimension mismatch, no chunks, unknown strategy) are
+        recorded per cell rather than raised. Query embedding is timed per
+        query; the retrieval statement (including hybrid RRF fusion, which
+        runs inside it) is timed once and amortized over its queries.
+        Latency is their sum.
+        """
+        async with self.session_factory() as session:
+            retrieval_service = RetrievalService(session)
+            query_texts = [query.query_text for query in queries]
+
+            # Deep enough for every evaluation cutoff; cells keep the first top_k
+            depth = EvaluationService.retrieval_depth(config)
+
+            embedding_ms = [0.0] * len(queries)
+            try:
+                # Retrieve chunks based on configured retrieval strategy
+                if config.retrieval_strategy in ("dense", "hybrid"):
+                    # Query embeddings are normally prefetched
+                    query_embeddings = []
+                    for i, query_text in enumerate(query_texts):
+                        start = time.perf_counter()
+                        query_embeddings.append(await services.embeddings.get(
+                            services.embedding, query_text, config.embedding_model
+                        ))
+                        embedding_ms[i] = _elapsed_ms(start)
+
+                start = time.perf_counter()
+
+                if config.retrieval_strategy == "dense":
+                    batches = await retrieval_service.search_dense_batch(
+                        query_embeddings=query_embeddings,
+                        config_id=config.id,
+                        top_k=depth,
+                        search_settings=config.settings,
+                    )
+                elif config.retrieval_strategy == "bm25":
+                    # BM25 retrieval: no embedding needed
+                    batches = await retrieval_service.search_bm25_batch(
+                        query_texts=query_texts,
+                        config_id=config.id,
+                        top_k=depth,
                     )
+                elif config.retrieval_strategy == "okapi_bm25":
+                    batches = await retrieval_service.search_okapi_bm25_batch(
+                        query_texts=query_texts,
+                        config_id=config.id,
+                        top_k=depth,
+                        version=config.version,
+                    )
+                elif config.retrieval_strategy == "hybrid":
+                    batches = await retrieval_service.search_hybrid_batch(
+                        query_embeddings=query_embeddings,
+                        query_texts=query_texts,
+                        config_id=config.id,
+                        top_k=depth,
+                        search_settings=config.settings,
+                        # Fuse the config's own candidate pool, whatever the depth
+                        fusion_k=config.top_k * HYBRID_FUSION_FACTOR,
+                    )
+                else:
+                    raise ValueError(f"Unknown retrieval strategy: {config.retrieval_strategy}")
+            except ValueError as e:
+                # Dimension mismatch or other validation error, same for every query
+                return {
+                    query.id: _CellRetrieval(retrieved=[], latency_ms=0, error=str(e))
+                    for query in queries
+                }
+
+            retrieval_ms = _elapsed_ms(start) / len(queries)
+            # For the basic IR metrics; each distinct chunk is fetched once
+            await retrieval_service.load_embeddings(
+                item.chunk for retrieved in batches for item in retrieved
+            )
 
-                    generated_answer = generation_result.get("answer")
-                    generation_cost = generation_result.get("cost_usd", 0.0)
+        retrievals = {}
+        for query, retrieved, query_embedding_ms in zip(queries, batches, embedding_ms):
+            error = None
+            if config.retrieval_strategy == "hybrid" and not retrieved:
+                # Neither method found anything (search_hybrid raises here)
+                error = f"No chunks found for config {config.id}"
+            timings = {"retrieval": retrieval_ms}
+            if config.retrieval_strategy in ("dense", "hybrid"):
+                timings["query_embedding"] = query_embedding_ms
+            retrievals[query.id] = _CellRetrieval(
+                retrieved=retrieved,
+                latency_ms=0 if error else int(query_embedding_ms + retrieval_ms),
+                error=error,
+                timings=timings,
+            )
+        return retrievals
 
-                    # PHASE 3: Answer Quality Evaluation (if answer was generated)
-                    if generated_answer and not generation_result.get("error"):
-                        answer_eval = await answer_evaluator.evaluate(
-                            query_text=query.query_text,
-                            generated_answer=generated_answer,
-                            chunks=chunks,
-                        )
+    async def _evaluate_basic_batch(
+        self,
+        cells: list["_PipelineCell"],
+        services: "_CellServices",
+    ) -> None:
+        """
+        Compute basic IR metrics for every retrieved cell in one vectorized pass.
 
-                        # Combine generation metadata with evaluation
-                        answer_metrics = {
-                            **answer_eval,
-                            "generation_model": generation_result.get("model"),
-                            "temperature": generation_result.get("temperature"),
-                            "prompt_tokens": generation_result.get("prompt_tokens"),
-                            "completion_tokens": generation_result.get("completion_tokens"),
-                            "prompt_sent": generation_result.get("prompt_sent"),  # Full prompt
-                        }
-                        generation_cost += answer_eval.get("evaluation_cost_usd", 0.0)
-
-                # Create result with new metrics
-                result = Result(
-                    experiment_id=experiment.id,
-                    config_id=config.id,
-                    query_id=query.id,
-                    retrieved_chunk_ids=[chunk.id for chunk in chunks],
-                    score=primary_score,  # Primary score for ranking
-                    latency_ms=latency_ms,
-                    metrics=evaluation_result["metrics"],  # Retrieval metrics
-                    evaluation_cost_usd=evaluation_result["total_cost_usd"],
-                    evaluated_at=datetime.utcnow(),
-                    # Answer generation fields
-                    generated_answer=generated_answer,
-                    generation_cost_usd=generation_cost if generated_answer else None,
-                    answer_metrics=answer_metrics,
-                    generated_at=datetime.utcnow() if generated_answer else None,
-                    result_metadata={
-                        "num_chunks": len(chunks),
-                        "config_name": config.name,
-                        "query_text": query.query_text,
-                    },
+        Cells whose text ground truth embedding wasn't prefetched are left to
+        the per-cell evaluation (which embeds it on demand). The batch time is
+        recorded amortized over the evaluated cells.
+        """
+        evaluated = []
+        cases = []
+        for cell in cells:
+            retrieval = cell.retrieval
+            if retrieval.error:
+                continue
+            config = cell.config
+            query = cell.query
+            ground_truth_embedding = None
+            if (
+                not query.ground_truth_chunk_ids
+                and query.ground_truth
+                and query.ground_truth.strip()
+                and any(item.chunk.embedding is not None for item in retrieval.retrieved)
+            ):
+                ground_truth_embedding = services.embeddings.get_cached(
+                    query.ground_truth, config.embedding_model
                 )
+                if ground_truth_embedding is None:
+                    continue
+            evaluated.append(cell)
+            cases.append(EvaluationCase(
+                retrieved_chunks=[item.chunk for item in retrieval.retrieved],
+                top_k=config.top_k,
+                ground_truth_chunk_ids=query.ground_truth_chunk_ids,
+                ground_truth_embedding=ground_truth_embedding,
+                cutoffs=tuple(EvaluationService.get_cutoffs(config)),
+            ))
 
-                self.db.add(result)
+        if not cases:
+            return
+        start = time.perf_counter()
+        metrics = await asyncio.to_thread(services.evaluation.basic_evaluator.evaluate_batch, cases)
+        evaluation_ms = _elapsed_ms(start) / len(cases)
+        for cell, basic_metrics in zip(evaluated, metrics):
+            cell.retrieval.basic_metrics = basic_metrics
+            cell.timings["ir_evaluation"] = evaluation_ms
 
-        await self.db.commit()
+    async def _prefetch_cell_caches(
+        self,
+        cells: list["_PipelineCell"],
+        services: "_CellServices",
+    ) -> None:
+        """
+        Load cached LLM judge verdicts and generated answers for retrieved cells.
+
+        Cells then only call the judge for genuinely new (query, chunk) pairs,
+        and make no generation call for prompts generated before (e.g. when
+        only evaluation settings changed).
+        """
+        judge_keys = []
+        generation_keys = []
+        for cell in cells:
+            if cell.retrieval.error:
+                continue
+            config = cell.config
+            judge_keys.extend(EvaluationService.judge_verdict_keys(
+                cell.query,
+                [item.chunk for item in cell.retrieval.retrieved],
+                config,
+                config.top_k,
+            ))
+
+            params = self._generation_params(config)
+            if params is None:
+                continue
+            packed = AnswerGenerationService.pack_chunks(
+                [item.chunk for item in cell.retrieval.retrieved[:config.top_k]],
+                params["model"],
+                params["context_token_budget"],
+            )
+            prompt = services.generation.build_prompt(
+                cell.query.query_text, packed.texts, config.prompt_template
+            )
+            key = AnswerGenerationService.cache_key(
+                params["model"], params["temperature"], params["max_tokens"], prompt
+            )
+            if key is not None:
+                generation_keys.append(key)
+
+        if not judge_keys and not generation_keys:
+            return
+        async with self.session_factory() as session:
+            if judge_keys:
+                await services.evaluation.judge_verdicts.prefetch(session, judge_keys)
+            if generation_keys:
+                await services.generation.cache.prefetch(session, generation_keys)
+
+    async def _evaluate_cell(self, cell: "_PipelineCell", services: "_CellServices") -> None:
+        """Evaluation stage: basic IR metrics (usually precomputed) and LLM judging."""
+        query = cell.query
+        config = cell.config
+        cell.evaluation_result = await services.evaluation.evaluate_retrieval(
+            query=query,
+            retrieved_chunks=[item.chunk for item in cell.retrieval.retrieved],
+            config=config,
+            top_k=config.top_k,
+            basic_metrics=cell.retrieval.basic_metrics,
+            ground_truth_embedding=(
+                services.embeddings.get_cached(query.ground_truth, config.embedding_model)
+                if query.ground_truth
+                else None
+            ),
+            timings=cell.timings,
+        )
+
+    async def _generate_cell(self, cell: "_PipelineCell", services: "_CellServices") -> None:
+        """Generation stage: answer the query from the cell's top_k chunks."""
+        config = cell.config
+        start = time.perf_counter()
+        cell.generation_result = await services.generation.generate_answer(
+            query_text=cell.query.query_text,
+            chunks=[item.chunk for item in cell.retrieval.retrieved[:config.top_k]],
+            prompt_template=config.prompt_template,
+            **self._generation_params(config),
+        )
+        cell.timings["generation"] = _elapsed_ms(start)
+
+    async def _evaluate_answer_cell(
+        self, cell: "_PipelineCell", services: "_CellServices"
+    ) -> None:
+        """Answer evaluation stage: judge the generated answer against its context."""
+        start = time.perf_counter()
+        cell.answer_evaluation = await services.answer_evaluator.evaluate(
+            query_text=cell.query.query_text,
+            generated_answer=cell.generation_result["answer"],
+            chunks=[item.chunk for item in cell.retrieval.retrieved[:cell.config.top_k]],
+            context_texts=cell.generation_result.get("context_chunks"),
+        )
+        cell.timings["answer_evaluation"] = _elapsed_ms(start)
+
+    def _build_result(self, experiment: Experiment, cell: "_PipelineCell") -> Result:
+        """Assemble the Result of a cell whose stages are done."""
+        config = cell.config
+        query = cell.query
+        retrieval = cell.retrieval
+        timings = {stage: round(ms, 2) for stage, ms in cell.timings.items()}
+        if retrieval.error:
+            # Record the error for this config/query combination
+            return Result(
+                experiment_id=experiment.id,
+                config_id=config.id,
+                query_id=query.id,
+                retrieved_chunk_ids=[],
+                retrieved_scores=[],
+                score=None,
+                latency_ms=0,
+                timings=timings,
+                result_metadata={
+                    "error": retrieval.error,
+                    "config_name": config.name,
+                    "query_text": query.query_text,
+                },
+            )
+
+        # Retrieval ran to the deepest evaluation cutoff; the cell's result is its top_k
+        retrieved = retrieval.retrieved[:config.top_k]
+        chunks = [item.chunk for item in retrieved]
+        evaluation_result = cell.evaluation_result
+
+        # Get primary score for ranking
+        primary_score = EvaluationService.get_primary_score(
+            evaluation_result["metrics"]
+        )
+
+        # Answer generation (if enabled in config)
+        generated_answer = None
+        generation_cost = 0.0
+        answer_metrics = None
+        generation_cached = None
+
+        generation_result = cell.generation_result
+        if generation_result is not None:
+            generated_answer = generation_result.get("answer")
+            generation_cost = generation_result.get("cost_usd", 0.0)
+            generation_cached = generation_result.get("cached", False)
+
+            # Answer quality evaluation (if answer was generated)
+            answer_eval = cell.answer_evaluation
+            if answer_eval is not None:
+                # Combine generation metadata with evaluation
+                answer_metrics = {
+                    **answer_eval,
+                    "generation_model": generation_result.get("model"),
+                    "temperature": generation_result.get("temperature"),
+                    "prompt_tokens": generation_result.get("prompt_tokens"),
+                    "completion_tokens": generation_result.get("completion_tokens"),
+                    "prompt_sent": generation_result.get("prompt_sent"),  # Full prompt
+                    "context_packing": generation_result.get("context"),
+                }
+                generation_cost += answer_eval.get("evaluation_cost_usd", 0.0)
+
+        # Create result with new metrics
+        return Result(
+            experiment_id=experiment.id,
+            config_id=config.id,
+            query_id=query.id,
+            retrieved_chunk_ids=[chunk.id for chunk in chunks],
+            retrieved_scores=[item.score for item in retrieved],
+            score=primary_score,  # Primary score for ranking
+            latency_ms=retrieval.latency_ms,
+            timings=timings,
+            metrics=evaluation_result["metrics"],  # Retrieval metrics
+            evaluation_cost_usd=evaluation_result["total_cost_usd"],
+            evaluated_at=datetime.utcnow(),
+            # Answer generation fields
+            generated_answer=generated_answer,
+            generation_cost_usd=generation_cost if generated_answer else None,
+            answer_metrics=answer_metrics,
+            generated_at=datetime.utcnow() if generated_answer else None,
+            result_metadata={
+                "num_chunks": len(chunks),
+                "config_name": config.name,
+                "query_text": query.query_text,
+                "generation_cached": generation_cached,
+            },
+        )
+
+    @staticmethod
+    def _generation_params(config: Config) -> dict | None:
+        """Answer generation parameters of a config (None if generation is disabled)."""
+        generation_settings = config.generation_settings or {}
+        if not generation_settings.get("enabled", False):
+            return None
+        return {
+            "model": generation_settings.get("model", "gpt-4o-mini"),
+            "temperature": generation_settings.get("temperature", 0.0),
+            "max_tokens": generation_settings.get("max_tokens", 500),
+            "context_token_budget": generation_settings.get("context_token_budget"),
+        }
 
     async def list_experiments(self, project_id: UUID) -> list[Experiment]:
         """List all experiments for a project."""
@@ -242,6 +798,40 @@ class ExperimentService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_experiment_progress(self, experiment_id: UUID) -> dict:
+        """
+        Get progress of an experiment job.
+
+        The ETA extrapolates the average time per completed cell since the
+        experiment started over the remaining cells.
+        """
+        experiment = await self.get_experiment(experiment_id)
+        if not experiment:
+            return {}
+
+        done = experiment.progress_done or 0
+        total = experiment.progress_total or 0
+
+        elapsed_seconds = None
+        eta_seconds = None
+        if experiment.started_at:
+            end = experiment.completed_at or datetime.utcnow()
+            elapsed_seconds = (end - experiment.started_at).total_seconds()
+            if experiment.status == "running" and done > 0:
+                eta_seconds = elapsed_seconds / done * max(total - done, 0)
+            elif experiment.status == "completed":
+                eta_seconds = 0.0
+
+        return {
+            "experiment_id": str(experiment.id),
+            "status": experiment.status,
+            "done": done,
+            "total": total,
+            "percent": round(done / total * 100, 1) if total else 0.0,
+            "elapsed_seconds": elapsed_seconds,
+            "eta_seconds": eta_seconds,
+        }
+
     async def get_experiment_results(self, experiment_id: UUID) -> dict:
         """Get formatted experiment results."""
         experiment = await self.get_experiment(experiment_id)
@@ -271,7 +861,7 @@ class ExperimentService:
         for result in results:
             chunk_ids.extend(result.retrieved_chunk_ids)
 
-        chunks_query = select(Chunk).where(Chunk.id.in_(chunk_ids))
+        chunks_query = select(Chunk).options(defer(Chunk.embedding)).where(Chunk.id.in_(chunk_ids))
         chunks_result = await self.db.execute(chunks_query)
         chunks = {c.id: c for c in chunks_result.scalars().all()}
 
@@ -288,6 +878,7 @@ class ExperimentService:
                 "results": [],
                 "avg_score": None,
                 "avg_latency_ms": None,
+                "timings": {},
             }
 
             # Get results for this config
@@ -295,15 +886,17 @@ class ExperimentService:
 
             scores = []
             latencies = []
+            stage_timings: dict[str, list[float]] = {}
 
             for result in config_results_list:
                 query = queries.get(result.query_id)
                 if not query:
                     continue
 
-                # Get chunks for this result
+                # Get chunks for this result (with the scores computed at retrieval time)
+                chunk_scores = result.retrieved_scores or []
                 result_chunks = []
-                for chunk_id in result.retrieved_chunk_ids:
+                for rank, chunk_id in enumerate(result.retrieved_chunk_ids, start=1):
                     chunk = chunks.get(chunk_id)
                     if chunk:
                         result_chunks.append(
@@ -312,7 +905,8 @@ class ExperimentService:
                                 "content": chunk.content[:200] + "..."
                                 if len(chunk.content) > 200
                                 else chunk.content,
-                                "score": None,  # Could calculate individual chunk scores
+                                "score": chunk_scores[rank - 1] if rank <= len(chunk_scores) else None,
+                                "rank": rank,
                             }
                         )
 
@@ -324,11 +918,13 @@ class ExperimentService:
                         "chunks": result_chunks,
                         "score": result.score,
                         "latency_ms": result.latency_ms,
+                        "timings": result.timings,
                         "metrics": result.metrics,
                         "evaluation_cost_usd": float(result.evaluation_cost_usd) if result.evaluation_cost_usd else None,
                         # Answer generation data
                         "generated_answer": result.generated_answer,
                         "generation_cost_usd": float(result.generation_cost_usd) if result.generation_cost_usd else None,
+                        "generation_cached": (result.result_metadata or {}).get("generation_cached"),
                         "answer_metrics": result.answer_metrics,
                     }
                 )
@@ -339,23 +935,94 @@ class ExperimentService:
                     scores.append(result.score)
                 if result.latency_ms is not None:
                     latencies.append(result.latency_ms)
+                for stage, ms in (result.timings or {}).items():
+                    stage_timings.setdefault(stage, []).append(ms)
 
             # Calculate averages
             if scores:
                 config_data["avg_score"] = sum(scores) / len(scores)
             if latencies:
                 config_data["avg_latency_ms"] = int(sum(latencies) / len(latencies))
+            config_data["timings"] = {
+                stage: _timing_stats(stage, samples) for stage, samples in stage_timings.items()
+            }
 
             config_results[str(config_id)] = config_data
 
+        # LLM judge verdict cache usage across all cells
+        judge_metrics = [
+            result.metrics["llm_judge"]
+            for result in results
+            if result.metrics and "llm_judge" in result.metrics
+        ]
+        judge_hits = sum(m.get("llm_judge_cache_hits", 0) for m in judge_metrics)
+        judge_misses = sum(
+            m.get("llm_judge_cache_misses", len(m.get("llm_chunk_scores", [])))
+            for m in judge_metrics
+        )
+        llm_judge_cache = None
+        if judge_hits + judge_misses:
+            llm_judge_cache = {
+                "hits": judge_hits,
+                "misses": judge_misses,
+                "hit_rate": judge_hits / (judge_hits + judge_misses),
+            }
+
         return {
             "experiment_id": str(experiment.id),
             "configs": list(config_results.values()),
+            "llm_judge_cache": llm_judge_cache,
         }
 
     async def run_query_time_experiment(
         self,
         request: "QueryTimeExperimentRequest"
+    ) -> "QueryTimeExperimentResponse":
+        """
+        Run instant retrieval with parameter overrides, served from cache when possible.
+
+        Results are cached per (config, config version, query, normalized
+        query text, overrides); concurrent identical requests share a single
+        computation. Cached responses are flagged with cached=True and report
+        the lookup time as latency.
+
+        Args:
+            request: QueryTimeExperimentRequest with config_id, query, and overrides
+
+        Returns:
+            QueryTimeExperimentResponse with results and effective parameters
+        """
+        start_time = time.perf_counter()
+        # Persisted, so changes made by other processes invalidate too
+        versions = await self.db.execute(
+            select(Config.version, Config.results_version).where(Config.id == request.config_id)
+        )
+        version = versions.one_or_none()
+        if version is not None:
+            version = tuple(version)
+        key = (
+            request.query_id,
+            normalize_query_text(request.query_text) if not request.query_id else None,
+            request.overrides.top_k,
+            request.overrides.dense_weight,
+            request.overrides.sparse_weight,
+        )
+        response, hit = await query_results.get_or_compute(
+            request.config_id,
+            version,
+            key,
+            lambda: self._compute_query_time_experiment(request),
+        )
+        if not hit:
+            return response
+        return response.model_copy(update={
+            "cached": True,
+            "latency_ms": int((time.perf_counter() - start_time) * 1000),
+        })
+
+    async def _compute_query_time_experiment(
+        self,
+        request: "QueryTimeExperimentRequest"
     ) -> "QueryTimeExperimentResponse":
         """
         Run instant retrieval with parameter overrides.
@@ -380,32 +1047,9 @@ class ExperimentService:
         )
         from app.services.settings_service import SettingsService
 
-        # Get config
-        config_query = select(Config).where(Config.id == request.config_id)
-        config_result = await self.db.execute(config_query)
-        config = config_result.scalar_one_or_none()
-
-        if not config:
-            raise ValueError(f"Config {request.config_id} not found")
-
-        # Get or create query object
-        if request.query_id:
-            query_query = select(Query).where(Query.id == request.query_id)
-            query_result = await self.db.execute(query_query)
-            query = query_result.scalar_one_or_none()
-            if not query:
-                raise ValueError(f"Query {request.query_id} not found")
-        elif request.query_text:
-            # Create temporary query object (not saved to DB)
-            from app.models.query import Query as QueryModel
-            query = QueryModel(
-                project_id=config.project_id,
-                query_text=request.query_text,
-                ground_truth=None,
-                ground_truth_chunk_ids=[]
-            )
-        else:
-            raise ValueError("Either query_id or query_text must be provided")
+        config, query = await self._load_query_time_target(
+            request.config_id, request.query_id, request.query_text
+        )
 
         # Merge config with overrides
         effective_top_k = request.overrides.top_k or config.top_k
@@ -422,11 +1066,13 @@ class ExperimentService:
         # Initialize services
         embedding_service = EmbeddingService(api_key=api_key)
         retrieval_service = RetrievalService(self.db)
-        evaluation_service = EvaluationService(openai_api_key=api_key)
+        judge_verdicts = JudgeVerdictCache()
+        evaluation_service = EvaluationService(
+            openai_api_key=api_key, judge_verdicts=judge_verdicts
+        )
 
         # Start timing
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Generate query embedding (if needed for strategy)
         if config.retrieval_strategy in ("dense", "hybrid"):
@@ -437,64 +1083,87 @@ class ExperimentService:
         else:
             query_embedding = None
 
-        # Run retrieval with overrides
+        # Run retrieval with overrides, deep enough for every evaluation cutoff
+        depth = EvaluationService.retrieval_depth(config, effective_top_k)
         if config.retrieval_strategy == "dense":
-            chunks = await retrieval_service.search_dense(
-                query_embedding=query_embedding,
+            # Served from the in-process index when possible (no DB round trip)
+            retrieved = []
+            if settings.VECTOR_INDEX_ENABLED:
+                index = await vector_indexes.get(
+                    self.db, config.id, len(query_embedding), config.version
+                )
+                retrieved = index.search(query_embedding, depth)
+            if not retrieved:
+                retrieved = await retrieval_service.search_dense(
+                    query_embedding=query_embedding,
+                    config_id=config.id,
+                    top_k=depth,
+                    search_settings=config.settings,
+                )
+        elif config.retrieval_strategy == "bm25":
+            retrieved = await retrieval_service.search_bm25(
+                query_text=query.query_text,
                 config_id=config.id,
-                top_k=effective_top_k
+                top_k=depth
             )
-        elif config.retrieval_strategy == "bm25":
-            chunks = await retrieval_service.search_bm25(
+        elif config.retrieval_strategy == "okapi_bm25":
+            retrieved = await retrieval_service.search_okapi_bm25(
                 query_text=query.query_text,
                 config_id=config.id,
-                top_k=effective_top_k
+                top_k=depth,
+                version=config.version,
             )
         elif config.retrieval_strategy == "hybrid":
-            chunks = await retrieval_service.search_hybrid(
+            retrieved = await retrieval_service.search_hybrid(
                 query_embedding=query_embedding,
                 query_text=query.query_text,
                 config_id=config.id,
-                top_k=effective_top_k,
+                top_k=depth,
                 dense_weight=effective_dense_weight,
-                sparse_weight=effective_sparse_weight
+                sparse_weight=effective_sparse_weight,
+                search_settings=config.settings,
+                fusion_k=effective_top_k * HYBRID_FUSION_FACTOR,
             )
         else:
             raise ValueError(f"Unknown retrieval strategy: {config.retrieval_strategy}")
 
-        end_time = time.time()
-        latency_ms = int((end_time - start_time) * 1000)
+        latency_ms = int(_elapsed_ms(start_time))
 
-        # Run evaluation (same as regular experiments)
+        # Run evaluation (same as regular experiments) on the full depth,
+        # then keep the requested top_k
+        retrieved_chunks = [item.chunk for item in retrieved]
+        await retrieval_service.load_embeddings(retrieved_chunks)
+        judge_keys = EvaluationService.judge_verdict_keys(
+            query, retrieved_chunks, config, effective_top_k
+        )
+        if judge_keys:
+            await judge_verdicts.prefetch(self.db, judge_keys)
         evaluation_result = await evaluation_service.evaluate_retrieval(
             query=query,
-            retrieved_chunks=chunks,
+            retrieved_chunks=retrieved_chunks,
             config=config,
             top_k=effective_top_k
         )
+        if judge_keys:
+            await judge_verdicts.flush(self.db)
+            await self.db.commit()
+        retrieved = retrieved[:effective_top_k]
 
         # Get primary score
         primary_score = EvaluationService.get_primary_score(
             evaluation_result["metrics"]
         )
 
-        # Build response
-        chunk_responses = []
-        for i, chunk in enumerate(chunks):
-            # Calculate similarity score if we have embeddings
-            similarity_score = None
-            if query_embedding and chunk.embedding:
-                similarity_score = retrieval_service.calculate_score(
-                    query_embedding,
-                    chunk.embedding
-                )
-
-            chunk_responses.append(ChunkResponse(
-                id=chunk.id,
-                content=chunk.content,
-                chunk_index=chunk.chunk_index,
-                similarity_score=similarity_score
-            ))
+        # Build response (scores come from the retrieval query itself)
+        chunk_responses = [
+            ChunkResponse(
+                id=item.chunk.id,
+                content=item.chunk.content,
+                chunk_index=item.chunk.chunk_index,
+                similarity_score=item.score,
+            )
+            for item in retrieved
+        ]
 
         # Build effective parameters
         effective_params = EffectiveParameters(
@@ -515,6 +1184,214 @@ class ExperimentService:
             effective_params=effective_params
         )
 
+    async def _load_query_time_target(
+        self,
+        config_id: UUID,
+        query_id: UUID | None,
+        query_text: str | None,
+    ) -> tuple[Config, Query]:
+        """
+        Load the config and query for a query-time request.
+
+        Args:
+            config_id: Base configuration ID
+            query_id: Existing query ID (takes precedence)
+            query_text: Ad-hoc query text (used if query_id is not provided)
+
+        Returns:
+            (config, query); an ad-hoc query is a transient object, not saved
+
+        Raises:
+            ValueError: If the config/query doesn't exist or neither query is given
+        """
+        # Get config
+        config_query = select(Config).where(Config.id == config_id)
+        config_result = await self.db.execute(config_query)
+        config = config_result.scalar_one_or_none()
+
+        if not config:
+            raise ValueError(f"Config {config_id} not found")
+
+        # Get or create query object
+        if query_id:
+            query_query = select(Query).where(Query.id == query_id)
+            query_result = await self.db.execute(query_query)
+            query = query_result.scalar_one_or_none()
+            if not query:
+                raise ValueError(f"Query {query_id} not found")
+        elif query_text:
+            # Create temporary query object (not saved to DB)
+            query = Query(
+                project_id=config.project_id,
+                query_text=query_text,
+                ground_truth=None,
+                ground_truth_chunk_ids=[]
+            )
+        else:
+            raise ValueError("Either query_id or query_text must be provided")
+
+        return config, query
+
+    async def run_query_time_sweep(
+        self,
+        request: "QueryTimeSweepRequest"
+    ) -> "QueryTimeSweepResponse":
+        """
+        Evaluate a grid of top_k x fusion weights from a single retrieval.
+
+        Candidates are fetched once at the largest top_k (dense and sparse
+        lists separately for hybrid configs) and every combination is then
+        sliced / re-fused in memory with fuse_rrf and scored with the basic
+        IR metrics, so an N x M grid costs one retrieval instead of N x M.
+
+        Args:
+            request: QueryTimeSweepRequest with config_id, query and the grid
+
+        Returns:
+            QueryTimeSweepResponse with one point per combination
+
+        Raises:
+            ValueError: If the config/query is missing, no API key is set or
+                the config has no chunks
+        """
+        from app.schemas.query_time import QueryTimeSweepResponse, SweepPoint
+        from app.services.settings_service import SettingsService
+
+        config, query = await self._load_query_time_target(
+            request.config_id, request.query_id, request.query_text
+        )
+        strategy = config.retrieval_strategy
+        if strategy not in ("dense", "bm25", "okapi_bm25", "hybrid"):
+            raise ValueError(f"Unknown retrieval strategy: {strategy}")
+
+        top_k_values = sorted(set(request.top_k_values))
+        max_top_k = top_k_values[-1]
+
+        settings_service = SettingsService(self.db)
+        api_key = await settings_service.get_openai_key()
+        if not api_key:
+            raise ValueError("OpenAI API key not configured. Please set it in Settings.")
+
+        embedding_service = EmbeddingService(api_key=api_key)
+        retrieval_service = RetrievalService(self.db)
+
+        start_time = time.perf_counter()
+
+        query_embedding = None
+        if strategy in ("dense", "hybrid"):
+            query_embedding = await embedding_service.embed_single(
+                text=query.query_text,
+                model=config.embedding_model
+            )
+
+        # The one retrieval: everything below is sliced from these lists
+        if strategy == "dense":
+            dense = await retrieval_service.search_dense(
+                query_embedding=query_embedding,
+                config_id=config.id,
+                top_k=max_top_k,
+                search_settings=config.settings,
+            )
+            sparse = []
+        elif strategy == "bm25":
+            dense = []
+            sparse = await retrieval_service.search_bm25(
+                query_text=query.query_text,
+                config_id=config.id,
+                top_k=max_top_k
+            )
+        elif strategy == "okapi_bm25":
+            dense = []
+            sparse = await retrieval_service.search_okapi_bm25(
+                query_text=query.query_text,
+                config_id=config.id,
+                top_k=max_top_k,
+                version=config.version,
+            )
+        else:
+            fusion_k = max_top_k * HYBRID_FUSION_FACTOR
+            try:
+                dense = await retrieval_service.search_dense(
+                    query_embedding=query_embedding,
+                    config_id=config.id,
+                    top_k=fusion_k,
+                    search_settings=config.settings,
+                )
+            except ValueError:
+                dense = []  # search_hybrid also falls back to sparse alone
+            try:
+                sparse = await retrieval_service.search_bm25(
+                    query_text=query.query_text,
+                    config_id=config.id,
+                    top_k=fusion_k
+                )
+            except ValueError:
+                sparse = []
+            if not dense and not sparse:
+                raise ValueError("No chunks found for config")
+
+        latency_ms = int(_elapsed_ms(start_time))
+        await retrieval_service.load_embeddings(item.chunk for item in dense + sparse)
+
+        # Text ground truth is embedded once, not once per combination
+        ground_truth_embedding = None
+        if (
+            not query.ground_truth_chunk_ids
+            and query.ground_truth
+            and query.ground_truth.strip()
+            and any(item.chunk.embedding is not None for item in dense + sparse)
+        ):
+            ground_truth_embedding = await embedding_service.embed_single(
+                text=query.ground_truth,
+                model=config.embedding_model
+            )
+
+        if strategy == "hybrid":
+            weights = [(w, 1.0 - w) for w in sorted(set(request.dense_weights))]
+        else:
+            weights = [(None, None)]
+
+        grid = []
+        for dense_weight, sparse_weight in weights:
+            for top_k in top_k_values:
+                if strategy == "hybrid":
+                    retrieved = fuse_rrf(dense, sparse, top_k, dense_weight, sparse_weight)
+                else:
+                    retrieved = (dense or sparse)[:top_k]
+                grid.append((top_k, dense_weight, sparse_weight, [item.chunk for item in retrieved]))
+
+        # Every combination is scored in one vectorized pass
+        basic_metrics = BasicIREvaluator().evaluate_batch([
+            EvaluationCase(
+                retrieved_chunks=chunks,
+                top_k=top_k,
+                ground_truth_chunk_ids=query.ground_truth_chunk_ids,
+                ground_truth_embedding=ground_truth_embedding,
+            )
+            for top_k, _, _, chunks in grid
+        ])
+
+        points = []
+        for (top_k, dense_weight, sparse_weight, chunks), basic in zip(grid, basic_metrics):
+            metrics = {"basic": basic}
+            points.append(SweepPoint(
+                top_k=top_k,
+                dense_weight=dense_weight,
+                sparse_weight=sparse_weight,
+                score=EvaluationService.get_primary_score(metrics),
+                metrics=metrics,
+                retrieved_chunk_ids=[chunk.id for chunk in chunks],
+            ))
+
+        return QueryTimeSweepResponse(
+            points=points,
+            best=max(points, key=lambda point: point.score or 0.0, default=None),
+            candidates=len({item.chunk.id for item in dense + sparse}),
+            latency_ms=latency_ms,
+            retrieval_strategy=strategy,
+            embedding_model=config.embedding_model,
+        )
+
     async def get_document_context_for_result(
         self,
         result_id: UUID,
@@ -556,7 +1433,11 @@ class ExperimentService:
             raise ValueError(f"Config {result.config_id} not found")
 
         # Get all retrieved chunks
-        chunks_query = select(Chunk).where(Chunk.id.in_(result.retrieved_chunk_ids))
+        chunks_query = (
+            select(Chunk)
+            .options(defer(Chunk.embedding))
+            .where(Chunk.id.in_(result.retrieved_chunk_ids))
+        )
         chunks_result = await self.db.execute(chunks_query)
         retrieved_chunks = list(chunks_result.scalars().all())
 
@@ -575,6 +1456,7 @@ class ExperimentService:
         # Get ALL chunks for this document+config (for context)
         all_chunks_query = (
             select(Chunk)
+            .options(defer(Chunk.embedding))
             .where(Chunk.document_id == document_id)
             .where(Chunk.config_id == config.id)
             .order_by(Chunk.chunk_index)
@@ -584,6 +1466,7 @@ class ExperimentService:
 
         # Build retrieved chunk info with ranks
         retrieved_chunk_map = {chunk.id: chunk for chunk in retrieved_chunks}
+        chunk_scores = result.retrieved_scores or []
         retrieved_chunk_infos = []
 
         for rank, chunk_id in enumerate(result.retrieved_chunk_ids, start=1):
@@ -598,7 +1481,9 @@ class ExperimentService:
                         chunk_id=chunk.id,
                         chunk_index=chunk.chunk_index,
                         rank=rank,
-                        score=result.score,  # Could be per-chunk score if available
+                        score=(
+                            chunk_scores[rank - 1] if rank <= len(chunk_scores) else result.score
+                        ),
                         start_pos=chunk_start if chunk_start != -1 else 0,
                         end_pos=chunk_end if chunk_end != -1 else len(chunk.content),
                         content=chunk.content,
@@ -0,0 +1,164 @@
+"""Experiment worker that executes queued experiment cells."""
+
+import asyncio
+import logging
+import os
+import socket
+from collections import OrderedDict
+from contextlib import suppress
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.embedding import EmbeddingLookup
+from app.database import AsyncSessionLocal
+from app.models.work_item import ExperimentWorkItem
+from app.services.experiment_queue import ExperimentQueue
+from app.services.experiment_service import ExperimentService
+
+logger = logging.getLogger(__name__)
+
+# Experiments whose query embeddings are kept in memory per worker
+_MAX_CACHED_EXPERIMENTS = 8
+
+
+class ExperimentWorker:
+    """
+    Claim experiment work items from Postgres and execute them.
+
+    Workers are stateless apart from their claims, so any number of them can
+    run in the API process or as standalone processes (``python -m app.worker``)
+    on other nodes. Each claim (one experiment config) runs its own pipeline,
+    and up to max_claims of them execute at once: the next config is claimed
+    as soon as a slot frees up, so its retrieval overlaps judging and
+    generation of earlier claims, and experiments run side by side. Claimed
+    items are heartbeated while they execute; if a worker dies its items go
+    stale and are reclaimed by the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        worker_id: str | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        max_claims: int | None = None,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            session_factory: Factory for database sessions
+            worker_id: Unique worker identity (defaults to host:pid:random)
+            batch_size: Max work items claimed at once (of one experiment config)
+            max_concurrency: Default worker count of each claim's LLM pipeline stages
+            max_claims: Maximum number of claims executing at once
+        """
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.batch_size = batch_size or settings.EXPERIMENT_WORKER_BATCH_SIZE
+        self.max_concurrency = max_concurrency or settings.EXPERIMENT_MAX_CONCURRENCY
+        self.max_claims = max_claims or settings.EXPERIMENT_WORKER_MAX_CLAIMS
+        self._wake = asyncio.Event()
+        self._embeddings: OrderedDict[UUID, EmbeddingLookup] = OrderedDict()
+
+    def wake(self) -> None:
+        """Skip the idle poll delay (e.g. right after an experiment is enqueued)."""
+        self._wake.set()
+
+    async def run_forever(self) -> None:
+        """Process work items until cancelled (cancels the claims in flight)."""
+        logger.info("Experiment worker %s started", self.worker_id)
+        slots = asyncio.Semaphore(self.max_claims)
+        running: set[asyncio.Task] = set()
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    items = await self._claim()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Experiment worker %s failed to claim work items", self.worker_id)
+                    items = []
+
+                if not items:
+                    slots.release()
+                    self._wake.clear()
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._wake.wait(), timeout=settings.EXPERIMENT_WORKER_POLL_SECONDS
+                        )
+                    continue
+
+                task = asyncio.create_task(self._execute(items))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def run_once(self) -> int:
+        """
+        Claim and execute one batch of work items (of one experiment config).
+
+        Returns:
+            Number of work items processed
+        """
+        items = await self._claim()
+        if items:
+            await self._execute(items)
+        return len(items)
+
+    async def _claim(self) -> list[ExperimentWorkItem]:
+        async with self.session_factory() as session:
+            return await ExperimentQueue(session).claim(
+                worker_id=self.worker_id,
+                limit=self.batch_size,
+                stale_after_seconds=settings.EXPERIMENT_WORKER_STALE_SECONDS,
+            )
+
+    async def _execute(self, items: list[ExperimentWorkItem]) -> None:
+        """Run claimed items (all of one experiment) while heartbeating their claims."""
+        experiment_id = items[0].experiment_id
+        heartbeat = asyncio.create_task(self._heartbeat([item.id for item in items]))
+        try:
+            async with self.session_factory() as session:
+                service = ExperimentService(
+                    session,
+                    session_factory=self.session_factory,
+                    max_concurrency=self.max_concurrency,
+                )
+                await service.run_work_items(
+                    experiment_id,
+                    items,
+                    embeddings=self._embeddings_for(experiment_id),
+                )
+        except Exception:
+            logger.exception("Experiment worker %s failed to process a batch", self.worker_id)
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    def _embeddings_for(self, experiment_id: UUID) -> EmbeddingLookup:
+        """Embedding lookup shared by all (concurrent) batches of an experiment on this worker."""
+        embeddings = self._embeddings.get(experiment_id)
+        if embeddings is None:
+            embeddings = self._embeddings[experiment_id] = EmbeddingLookup()
+            while len(self._embeddings) > _MAX_CACHED_EXPERIMENTS:
+                self._embeddings.popitem(last=False)
+        self._embeddings.move_to_end(experiment_id)
+        return embeddings
+
+    async def _heartbeat(self, item_ids: list[UUID]) -> None:
+        """Keep claims alive while the batch executes."""
+        while True:
+            await asyncio.sleep(settings.EXPERIMENT_WORKER_HEARTBEAT_SECONDS)
+            try:
+                async with self.session_factory() as session:
+                    await ExperimentQueue(session).heartbeat(self.worker_id, item_ids)
+            except Exception:
+                logger.exception("Experiment worker %s heartbeat failed", self.worker_id)
@@ -1,11 +1,13 @@
 """Query service for business logic."""
 
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.config import Config
 from app.models.query import Query
 from app.schemas.query import QueryCreate, QueryUpdate
+from app.core.query_cache import query_results
 
 
 class QueryService:
@@ -53,8 +55,11 @@ class QueryService:
         for key, value in update_data.items():
             setattr(query, key, value)
 
+        await self._bump_config_versions(query.project_id)
         await self.db.commit()
         await self.db.refresh(query)
+        # Cached query-time results may use its text/ground truth (in any config)
+        query_results.invalidate()
         return query
 
     async def delete_query(self, query_id: UUID) -> bool:
@@ -64,5 +69,15 @@ class QueryService:
             return False
 
         await self.db.delete(query)
+        await self._bump_config_versions(query.project_id)
         await self.db.commit()
+        query_results.invalidate()
         return True
+
+    async def _bump_config_versions(self, project_id: UUID) -> None:
+        """Make cached query-time results of the project's configs stale in every process."""
+        await self.db.execute(
+            update(Config)
+            .where(Config.project_id == project_id)
+            .values(results_version=Config.results_version + 1)
+        )
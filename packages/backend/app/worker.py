@@ -0,0 +1,22 @@
+"""Standalone experiment worker entry point.
+
+Run any number of these, on any node that can reach the database:
+
+    python -m app.worker
+"""
+
+import asyncio
+import logging
+
+from app.services.experiment_worker import ExperimentWorker
+
+
+async def main() -> None:
+    """Run a single experiment worker until interrupted."""
+    worker = ExperimentWorker()
+    await worker.run_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+"""Tests for the basic IR metrics evaluator."""
+
+import math
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.evaluation.basic_evaluator import BasicIREvaluator, EvaluationCase
+from app.models.chunk import Chunk
+from app.models.query import Query
+
+
+def make_chunks(embeddings):
+    """Chunks with the given embeddings (None for BM25-only chunks)."""
+    return [
+        Chunk(id=uuid4(), content="x" * (10 * (i + 1)), chunk_index=i, embedding=embedding)
+        for i, embedding in enumerate(embeddings)
+    ]
+
+
+def test_ground_truth_metrics_from_chunk_ids():
+    """Test the metric formulas on a hand-checked ranking."""
+    chunks = make_chunks([None] * 5)
+    ground_truth = [chunks[1].id, chunks[3].id, uuid4()]
+
+    [metrics] = BasicIREvaluator().evaluate_batch([
+        EvaluationCase(chunks, top_k=5, ground_truth_chunk_ids=ground_truth)
+    ])
+
+    dcg = 1 / math.log2(3) + 1 / math.log2(5)
+    idcg = 1 + 1 / math.log2(3) + 1 / math.log2(4)
+    assert metrics["mrr"] == pytest.approx(0.5)
+    assert metrics["ndcg@5"] == pytest.approx(dcg / idcg)
+    assert metrics["precision@5"] == pytest.approx(2 / 5)
+    assert metrics["recall@5"] == pytest.approx(2 / 3)
+    assert metrics["f1@5"] == pytest.approx(2 * 0.4 * (2 / 3) / (0.4 + 2 / 3))
+    assert metrics["hit_rate@5"] == 1.0
+    assert metrics["diversity"] == 1.0  # No embeddings to compare
+    assert metrics["avg_chunk_length"] == pytest.approx(30.0)
+
+
+def test_batch_cases_are_independent():
+    """Test mixed top_k, missing ground truth and empty result lists in one batch."""
+    chunks = make_chunks([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    results = BasicIREvaluator().evaluate_batch([
+        EvaluationCase(chunks, top_k=2, ground_truth_chunk_ids=[chunks[2].id]),
+        EvaluationCase(chunks, top_k=3, ground_truth_chunk_ids=[chunks[2].id]),
+        EvaluationCase(chunks, top_k=3),
+        EvaluationCase([], top_k=5, ground_truth_chunk_ids=[chunks[0].id]),
+    ])
+
+    assert results[0]["hit_rate@2"] == 0.0
+    assert results[0]["mrr"] == 0.0
+    assert results[1]["mrr"] == pytest.approx(1 / 3)
+    assert set(results[2]) == {"diversity", "avg_chunk_length"}
+    assert results[3]["precision@5"] == 0.0
+    assert results[3]["diversity"] == 1.0
+
+    # Diversity = 1 - mean pairwise cosine similarity
+    expected = 1 - (0.0 + 2 * (1 / math.sqrt(2))) / 3
+    assert results[1]["diversity"] == pytest.approx(expected, rel=1e-6)
+    assert results[0]["diversity"] == pytest.approx(1.0)
+
+
+async def test_text_ground_truth_matches_by_similarity():
+    """Test that chunks similar to the ground truth embedding count as relevant."""
+    chunks = make_chunks([[0.0, 1.0], [1.0, 0.1], [1.0, 0.0]])
+    query = Query(query_text="q", ground_truth="answer", ground_truth_chunk_ids=None)
+
+    metrics = await BasicIREvaluator().evaluate(
+        query=query,
+        retrieved_chunks=chunks,
+        embedding_service=object(),  # not called: the embedding is precomputed
+        embedding_model="text-embedding-3-small",
+        top_k=3,
+        ground_truth_embedding=[1.0, 0.0],
+    )
+
+    assert metrics["mrr"] == pytest.approx(0.5)
+    assert metrics["precision@3"] == pytest.approx(2 / 3)
+    assert metrics["recall@3"] == pytest.approx(1.0)
+
+
+def reference_metrics(case):
+    """Straightforward per-list implementation of the ground truth metrics."""
+    retrieved = [str(chunk.id) for chunk in case.retrieved_chunks[:case.top_k]]
+    ground_truth = [str(chunk_id) for chunk_id in case.ground_truth_chunk_ids]
+    k = case.top_k
+    relevant = [chunk_id in ground_truth for chunk_id in retrieved]
+    hits = sum(relevant)
+    dcg = sum(1 / math.log2(i + 2) for i, rel in enumerate(relevant) if rel)
+    idcg = sum(1 / math.log2(i + 2) for i in range(min(k, len(ground_truth))))
+    precision = hits / len(retrieved) if retrieved else 0.0
+    recall = hits / len(ground_truth)
+    return {
+        "mrr": next((1 / (i + 1) for i, rel in enumerate(relevant) if rel), 0.0),
+        f"ndcg@{k}": dcg / idcg,
+        f"precision@{k}": precision,
+        f"recall@{k}": recall,
+        f"f1@{k}": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        f"hit_rate@{k}": 1.0 if hits else 0.0,
+    }
+
+
+def test_batch_matches_reference_implementation():
+    """Test the vectorized metrics against a per-list implementation on random rankings."""
+    rng = np.random.default_rng(0)
+    pool = make_chunks(list(rng.normal(size=(30, 8))))
+    evaluator = BasicIREvaluator()
+    cases = []
+    for _ in range(50):
+        picked = [pool[i] for i in rng.choice(30, size=int(rng.integers(0, 8)), replace=False)]
+        ground_truth = [pool[i].id for i in rng.choice(30, size=4, replace=False)]
+        cases.append(EvaluationCase(picked, top_k=int(rng.integers(1, 8)), ground_truth_chunk_ids=ground_truth))
+
+    for case, metrics in zip(cases, evaluator.evaluate_batch(cases)):
+        expected = reference_metrics(case)
+        assert {key: metrics[key] for key in expected} == pytest.approx(expected)
+
+
+def test_cutoffs_match_separate_evaluations_at_each_k():
+    """Test that @k metrics from one deep list equal evaluating each k on its own."""
+    rng = np.random.default_rng(1)
+    pool = make_chunks(list(rng.normal(size=(40, 8))))
+    evaluator = BasicIREvaluator()
+    ranking = [pool[i] for i in rng.choice(40, size=10, replace=False)]
+    ground_truth = [ranking[2].id, ranking[7].id, pool[0].id]
+
+    [metrics] = evaluator.evaluate_batch([
+        EvaluationCase(ranking, top_k=3, ground_truth_chunk_ids=ground_truth, cutoffs=(1, 5, 10))
+    ])
+
+    assert metrics["mrr"] == pytest.approx(1 / 3)
+    assert metrics["ndcg@5"] > 0 and metrics["hit_rate@1"] == 0.0
+    for k in (1, 3, 5, 10):
+        [expected] = evaluator.evaluate_batch([
+            EvaluationCase(ranking[:k], top_k=k, ground_truth_chunk_ids=ground_truth)
+        ])
+        for name in ("ndcg", "precision", "recall", "f1", "hit_rate", "mrr"):
+            assert metrics[f"{name}@{k}"] == pytest.approx(expected[f"{name}@{k}"])
+
+    # Diversity and length still describe the config's top_k chunks
+    [top_3] = evaluator.evaluate_batch([EvaluationCase(ranking[:3], top_k=3)])
+    assert metrics["diversity"] == pytest.approx(top_3["diversity"])
+    assert metrics["avg_chunk_length"] == pytest.approx(top_3["avg_chunk_length"])
+
+
+def test_short_list_without_relevant_chunks_has_zero_mrr():
+    """Test that a list shorter than the cutoff with no relevant chunk scores MRR 0."""
+    chunks = make_chunks([None] * 3)
+
+    [metrics] = BasicIREvaluator().evaluate_batch([
+        EvaluationCase(chunks, top_k=8, ground_truth_chunk_ids=[uuid4()], cutoffs=(10,))
+    ])
+
+    assert metrics["mrr"] == 0.0
+    assert metrics["mrr@8"] == 0.0
+    assert metrics["mrr@10"] == 0.0
+
+
+def test_text_ground_truth_metrics_ignore_deeper_cutoffs():
+    """Test that extra cutoffs don't change text ground truth metrics at top_k."""
+    rng = np.random.default_rng(2)
+    target = np.array([1.0, 0.0])
+    # Ground truth matches at positions 2 (within top_k) and 6 (beyond it)
+    vectors = [list(rng.normal(size=2) * 0.1 + [0.0, 1.0]) for _ in range(8)]
+    vectors[1] = vectors[5] = list(target)
+    chunks = make_chunks(vectors)
+
+    [top_k_only, with_cutoffs] = BasicIREvaluator().evaluate_batch([
+        EvaluationCase(chunks[:3], top_k=3, ground_truth_embedding=list(target)),
+        EvaluationCase(chunks, top_k=3, ground_truth_embedding=list(target), cutoffs=(8,)),
+    ])
+
+    for name in ("mrr", "ndcg@3", "precision@3", "recall@3", "f1@3", "hit_rate@3"):
+        assert with_cutoffs[name] == pytest.approx(top_k_only[name])
+    assert with_cutoffs["precision@8"] == pytest.approx(2 / 8)
@@ -0,0 +1,112 @@
+"""Tests for the Okapi BM25 index."""
+
+import asyncio
+import math
+import random
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.bm25 import BM25_B, BM25_K1, BM25Index, BM25IndexRegistry, tokenize
+
+
+def brute_force_scores(contents, query_text):
+    """Textbook Okapi BM25 (Lucene IDF) for every document."""
+    docs = [tokenize(content) for content in contents]
+    avg_length = sum(len(doc) for doc in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in set(tokenize(query_text)):
+            tf = doc.count(term)
+            if not tf:
+                continue
+            df = sum(term in other for other in docs)
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_length))
+        scores.append(score)
+    return scores
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    """Test lowercasing, stopword removal and S-stemming."""
+    assert tokenize("The side-effects of Aspirin and queries") == ["side", "effect", "aspirin", "query"]
+
+
+def test_search_matches_exhaustive_scoring():
+    """Test that MaxScore pruning returns the exact top k."""
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(40)]
+    # Zipf-like term distribution so some posting lists are long and some short
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    contents = [" ".join(rng.choices(vocabulary, weights, k=rng.randint(5, 60))) for _ in range(300)]
+    index = BM25Index.build([uuid4() for _ in contents], contents)
+
+    for query_text in ["term0 term1 term30", "term5 term39", "term0", "term2 term3 term4 term5 term6"]:
+        expected = brute_force_scores(contents, query_text)
+        for k in (1, 5, 20):
+            positions, scores = index.top_k(query_text, k)
+            ranked = sorted(
+                (position for position, score in enumerate(expected) if score > 0),
+                key=lambda position: (-expected[position], position),
+            )[:k]
+            assert list(positions) == ranked
+            np.testing.assert_allclose(scores, [expected[p] for p in ranked], rtol=1e-5)
+
+
+def test_search_only_requires_one_matching_term():
+    """Test OR semantics and unknown query terms."""
+    ids = [uuid4(), uuid4(), uuid4()]
+    index = BM25Index.build(ids, ["aspirin dosage", "ibuprofen dosage", "nothing relevant here"])
+
+    results = index.search("aspirin dosage unknownterm", 5)
+    assert [chunk_id for chunk_id, _ in results] == [ids[0], ids[1]]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search("unknownterm", 5) == []
+
+
+def test_serialization_round_trip():
+    """Test that a persisted index scores identically."""
+    contents = ["the cat sat on the mat", "dogs and cats", "a mat for dogs", ""]
+    index = BM25Index.build([uuid4() for _ in contents], contents)
+    loaded = BM25Index.from_bytes(index.to_bytes())
+
+    assert loaded.chunk_ids == index.chunk_ids
+    assert loaded.vocabulary == index.vocabulary
+    assert loaded.search("dog mat", 3) == pytest.approx(index.search("dog mat", 3))
+
+    empty = BM25Index.from_bytes(BM25Index.build([], []).to_bytes())
+    assert len(empty) == 0
+    assert empty.search("cat", 3) == []
+
+
+async def test_registry_reloads_when_config_version_changes(monkeypatch):
+    """Test that indexes are cached per config until its persisted version changes."""
+    registry = BM25IndexRegistry(max_bytes=10**9)
+    loads = []
+
+    async def fake_load(db, config_id):
+        loads.append(config_id)
+        await asyncio.sleep(0)
+        return BM25Index.build([uuid4()], ["aspirin dosage"])
+
+    monkeypatch.setattr(registry, "_load", fake_load)
+    config_id = uuid4()
+
+    first, second = await asyncio.gather(
+        registry.get(None, config_id, 0), registry.get(None, config_id, 0)
+    )
+    assert first is second
+    assert len(loads) == 1
+
+    # Another process rewrote the chunks and bumped the version
+    reloaded = await registry.get(None, config_id, 1)
+    assert reloaded is not first
+    assert reloaded.version == 1
+    assert len(loads) == 2
+    assert await registry.get(None, config_id, 1) is reloaded
+
+    # A late lookup at the old version is served the newer index
+    assert await registry.get(None, config_id, 0) is reloaded
+    assert len(loads) == 2
@@ -0,0 +1,47 @@
+"""Tests for token-budgeted context packing."""
+
+from app.core.context_packing import MIN_TRUNCATED_TOKENS, pack_context
+from app.core.tokens import count_tokens
+
+MODEL = "gpt-4o-mini"
+
+
+def words(prefix, n):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def test_overlapping_and_duplicate_chunks_are_deduplicated():
+    """Test that chunk overlap, duplicates and contained chunks are packed once."""
+    shared = words("shared", 20)
+    first = words("alpha", 30) + " " + shared
+    second = shared + " " + words("beta", 30)
+
+    packed = pack_context([first, second, first, shared], MODEL, None)
+
+    assert packed.texts[0] == first
+    assert packed.texts[1] == " " + words("beta", 30)
+    assert packed.ranks == [0, 1]
+    assert packed.dropped_chunks == 2
+    assert packed.deduplicated_tokens > 0
+    assert packed.packed_tokens == sum(count_tokens(text, MODEL) for text in packed.texts)
+
+
+def test_budget_truncates_then_drops_lowest_ranked_chunks():
+    """Test that packing stops at the budget and reports what was cut."""
+    texts = [words("a", 100), words("b", 100), words("c", 100)]
+    sizes = [count_tokens(text, MODEL) for text in texts]
+    budget = sizes[0] + MIN_TRUNCATED_TOKENS + 10
+
+    packed = pack_context(texts, MODEL, budget)
+
+    assert packed.ranks == [0, 1]
+    assert packed.texts[0] == texts[0]
+    assert texts[1].startswith(packed.texts[1])
+    assert packed.packed_tokens == budget
+    assert packed.truncated_chunks == 1 and packed.dropped_chunks == 1
+    assert packed.packed_tokens + packed.dropped_tokens == sum(sizes)
+
+    # Too little room left for a useful excerpt: the chunk is dropped instead
+    packed = pack_context(texts, MODEL, sizes[0] + 10)
+    assert packed.ranks == [0]
+    assert packed.truncated_chunks == 0
@@ -2,7 +2,7 @@
 
 import pytest
 import numpy as np
-from app.core.embedding import EmbeddingService
+from app.core.embedding import EmbeddingService, EmbeddingLookup, pack_batches
 
 
 def test_cosine_similarity():
@@ -51,3 +51,128 @@ async def test_embed_batch():
 
     assert len(embeddings) == 3
     assert all(len(emb) == 1536 for emb in embeddings)
+
+
+class FakeEmbeddingService:
+    """Records embed calls and returns deterministic vectors."""
+
+    def __init__(self):
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def embed_batch(self, texts, model="text-embedding-ada-002"):
+        self.batch_calls.append((list(texts), model))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def embed_single(self, text, model="text-embedding-ada-002"):
+        self.single_calls.append((text, model))
+        return [float(len(text)), 1.0]
+
+
+async def test_embedding_lookup_prefetch_dedupes_per_model():
+    """Test that each distinct (text, model) pair is embedded once."""
+    service = FakeEmbeddingService()
+    lookup = EmbeddingLookup()
+
+    pairs = [
+        ("what is rag", "text-embedding-3-small"),
+        ("what is rag", "text-embedding-3-small"),
+        ("what is rag", "text-embedding-3-large"),
+        ("define bm25", "text-embedding-3-small"),
+    ]
+    await lookup.prefetch(service, pairs)
+
+    assert len(service.batch_calls) == 2
+    assert service.batch_calls[0] == (
+        ["what is rag", "define bm25"],
+        "text-embedding-3-small",
+    )
+    assert lookup.get_cached("define bm25", "text-embedding-3-small") == [11.0, 1.0]
+
+    # Prefetching again is free
+    await lookup.prefetch(service, pairs)
+    assert len(service.batch_calls) == 2
+
+
+async def test_embedding_lookup_get_falls_back_to_single_embedding():
+    """Test that a miss embeds on demand and is cached afterwards."""
+    service = FakeEmbeddingService()
+    lookup = EmbeddingLookup()
+
+    assert lookup.get_cached("new text", "text-embedding-3-small") is None
+    first = await lookup.get(service, "new text", "text-embedding-3-small")
+    second = await lookup.get(service, "new text", "text-embedding-3-small")
+
+    assert first == second
+    assert service.single_calls == [("new text", "text-embedding-3-small")]
+
+
+class FakeEmbeddingCache:
+    """In-memory stand-in for the Postgres embedding cache."""
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    async def get_many(self, model, texts):
+        return {text: self.entries[(model, text)] for text in texts if (model, text) in self.entries}
+
+    async def put_many(self, model, embeddings):
+        for text, embedding in embeddings.items():
+            self.entries[(model, text)] = embedding
+
+
+async def test_embed_batch_only_sends_cache_misses():
+    """Test that cached texts skip the API and misses are written back."""
+    model = "text-embedding-3-small"
+    cache = FakeEmbeddingCache({(model, "cached"): [9.0]})
+    service = EmbeddingService(api_key="test-key", cache=cache)
+
+    sent = []
+
+    async def fake_embed_uncached(texts, model, expected_dim):
+        sent.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    service._embed_uncached = fake_embed_uncached
+
+    embeddings = await service.embed_batch(["cached", "fresh", "fresh"], model=model)
+
+    assert embeddings == [[9.0], [5.0], [5.0]]
+    assert sent == [["fresh"]]
+    assert cache.entries[(model, "fresh")] == [5.0]
+
+
+def test_pack_batches_respects_input_and_token_limits():
+    """Test that batches are bounded by input count and token budget."""
+    token_counts = [100, 200, 300, 50, 50, 50, 1000, 10]
+
+    batches = pack_batches(token_counts, max_inputs=3, max_tokens=500)
+
+    assert batches == [(0, 2), (2, 5), (5, 6), (6, 7), (7, 8)]
+    # Every input is covered exactly once, in order
+    assert [i for start, end in batches for i in range(start, end)] == list(range(8))
+
+
+async def test_embed_uncached_reassembles_batches_in_order(monkeypatch):
+    """Test that concurrent batch results come back in input order."""
+    monkeypatch.setattr(
+        "app.core.embedding.count_tokens_batch",
+        lambda texts, model: [len(text) for text in texts],
+    )
+    service = EmbeddingService(api_key="test-key")
+    service.max_inputs = 2
+    service.max_tokens = 1000
+
+    requests = []
+
+    async def fake_create_embeddings(texts, model, expected_dim, estimated_tokens=None):
+        requests.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    service._create_embeddings = fake_create_embeddings
+
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    embeddings = await service._embed_uncached(texts, "text-embedding-3-small", 1536)
+
+    assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert sorted(requests) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
@@ -0,0 +1,146 @@
+"""Tests for the staged experiment pipeline."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.config import settings
+from app.models.config import Config
+from app.models.query import Query
+from app.models.work_item import ExperimentWorkItem
+from app.services.experiment_service import (
+    ExperimentService,
+    _CellRetrieval,
+    _PipelineCell,
+    _timing_stats,
+)
+
+
+class RecordingExperimentService(ExperimentService):
+    """Pipeline stages replaced by short sleeps that record what overlapped."""
+
+    def __init__(self, fail_generation: bool = False):
+        super().__init__(db=None, max_concurrency=4)
+        self.fail_generation = fail_generation
+        self.running: dict[str, int] = {}
+        self.overlaps: set[frozenset] = set()
+        self.checkpointed = []
+
+    async def _stage(self, name):
+        self.running[name] = self.running.get(name, 0) + 1
+        active = frozenset(stage for stage, count in self.running.items() if count)
+        if len(active) > 1:
+            self.overlaps.add(active)
+        await asyncio.sleep(0.01)
+        self.running[name] -= 1
+
+    async def _retrieve_batch(self, config, queries, services):
+        await self._stage("retrieval")
+        return {query.id: _CellRetrieval(retrieved=[], latency_ms=1) for query in queries}
+
+    async def _evaluate_basic_batch(self, cells, services):
+        pass
+
+    async def _prefetch_cell_caches(self, cells, services):
+        pass
+
+    async def _evaluate_cell(self, cell, services):
+        await self._stage("judge")
+        cell.evaluation_result = {"metrics": {}, "total_cost_usd": 0.0}
+
+    async def _generate_cell(self, cell, services):
+        await self._stage("generation")
+        if self.fail_generation:
+            raise RuntimeError("generation stage crashed")
+        cell.generation_result = {"answer": "an answer"}
+
+    async def _evaluate_answer_cell(self, cell, services):
+        await self._stage("answer_evaluation")
+        cell.answer_evaluation = {"overall_quality": 1.0}
+
+    async def _checkpoint(self, experiment, cell, services):
+        assert cell.evaluation_result is not None
+        assert cell.answer_evaluation is not None
+        self.checkpointed.append(cell.item)
+
+
+def make_experiment(num_configs, num_queries):
+    configs = {
+        config.id: config
+        for config in (
+            Config(id=uuid4(), name=f"c{i}", top_k=5, generation_settings={"enabled": True})
+            for i in range(num_configs)
+        )
+    }
+    queries = {
+        query.id: query
+        for query in (Query(id=uuid4(), query_text=f"q{i}") for i in range(num_queries))
+    }
+    items = [
+        ExperimentWorkItem(config_id=config_id, query_id=query_id)
+        for config_id in configs
+        for query_id in queries
+    ]
+    return items, configs, queries
+
+
+async def test_stages_overlap_and_every_cell_is_checkpointed_once(monkeypatch):
+    """Test that later retrieval, judging and answer stages run at the same time."""
+    monkeypatch.setattr(settings, "EXPERIMENT_RETRIEVAL_CONCURRENCY", 1)
+    service = RecordingExperimentService()
+    items, configs, queries = make_experiment(num_configs=4, num_queries=3)
+
+    await service._run_pipeline(None, items, configs, queries, services=None)
+
+    assert sorted(map(id, service.checkpointed)) == sorted(map(id, items))
+    assert any({"retrieval", "generation"} <= overlap for overlap in service.overlaps)
+    assert any({"judge", "generation"} <= overlap for overlap in service.overlaps)
+
+
+async def test_stage_error_fails_the_pipeline():
+    """Test that an unexpected error in any stage propagates unwrapped."""
+    service = RecordingExperimentService(fail_generation=True)
+    items, configs, queries = make_experiment(num_configs=2, num_queries=2)
+
+    with pytest.raises(RuntimeError, match="generation stage crashed"):
+        await service._run_pipeline(None, items, configs, queries, services=None)
+
+
+def test_result_records_stage_timings():
+    """Test that a cell's stage timings are stored on its Result."""
+    items, configs, queries = make_experiment(num_configs=1, num_queries=1)
+    item = items[0]
+    cell = _PipelineCell(
+        item,
+        configs[item.config_id],
+        queries[item.query_id],
+        _CellRetrieval(retrieved=[], latency_ms=0, error="No chunks found"),
+        timings={"query_embedding": 0.123, "retrieval": 4.5678},
+    )
+
+    result = ExperimentService(db=None)._build_result(SimpleNamespace(id=uuid4()), cell)
+
+    assert result.timings == {"query_embedding": 0.12, "retrieval": 4.57}
+
+
+def test_timing_stats_percentiles():
+    """Test per-stage latency aggregation."""
+    stats = _timing_stats("generation", [float(ms) for ms in range(1, 101)])
+
+    assert stats["count"] == 100
+    assert stats["mean_ms"] == 50.5
+    assert not stats["amortized"]
+    assert stats["p50_ms"] == 50.5
+    assert stats["p95_ms"] == pytest.approx(95.05)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+
+
+def test_amortized_stages_report_only_the_mean():
+    """Test that batch-amortized stages have no (meaningless) percentiles."""
+    stats = _timing_stats("retrieval", [2.0, 2.0, 2.0, 8.0])
+
+    assert stats["amortized"]
+    assert stats["mean_ms"] == 3.5
+    assert stats["p50_ms"] is stats["p95_ms"] is stats["p99_ms"] is None
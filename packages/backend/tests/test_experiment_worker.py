@@ -0,0 +1,66 @@
+"""Tests for the experiment worker's claim loop."""
+
+import asyncio
+from contextlib import suppress
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services import experiment_worker
+from app.services.experiment_worker import ExperimentWorker
+
+
+class FakeSession:
+    """Session factory stand-in; the fake service never touches it."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+async def wait_until(condition):
+    for _ in range(1000):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+async def test_claims_run_concurrently_up_to_max_claims(monkeypatch):
+    """Test that the next claim starts while earlier ones execute, up to max_claims."""
+    release = asyncio.Event()
+    started = []
+
+    class FakeExperimentService:
+        def __init__(self, session, **kwargs):
+            pass
+
+        async def run_work_items(self, experiment_id, items, embeddings=None):
+            started.append(experiment_id)
+            await release.wait()
+
+    experiments = [uuid4() for _ in range(3)]
+    claims = [[SimpleNamespace(id=uuid4(), experiment_id=experiment_id)] for experiment_id in experiments]
+
+    async def fake_claim():
+        return claims.pop(0) if claims else []
+
+    worker = ExperimentWorker(session_factory=FakeSession, max_claims=2)
+    monkeypatch.setattr(worker, "_claim", fake_claim)
+    monkeypatch.setattr(experiment_worker, "ExperimentService", FakeExperimentService)
+
+    task = asyncio.create_task(worker.run_forever())
+    try:
+        # Two experiments run side by side; the third claim waits for a slot
+        await wait_until(lambda: len(started) == 2)
+        assert started == experiments[:2]
+        assert len(claims) == 1
+
+        release.set()
+        await wait_until(lambda: len(started) == 3)
+        assert started == experiments
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
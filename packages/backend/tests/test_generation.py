@@ -0,0 +1,81 @@
+"""Tests for answer generation caching."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.generation import AnswerGenerationService
+from app.core.generation_cache import GenerationCache
+from app.models.chunk import Chunk
+
+
+class FakeChatClient:
+    """Chat client answering with a fixed text and counting calls."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def create_chat_completion(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=" An answer. "))],
+            usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=100, total_tokens=1100),
+        )
+
+
+def make_service(client, cache):
+    service = AnswerGenerationService(api_key="test-key", cache=cache)
+    service.client = client
+    return service
+
+
+def make_chunks(*contents):
+    return [Chunk(id=uuid4(), content=content, chunk_index=i) for i, content in enumerate(contents)]
+
+
+async def test_identical_temperature_zero_prompts_generate_once():
+    """Test that concurrent and repeated identical prompts share one generation."""
+    client = FakeChatClient()
+    service = make_service(client, GenerationCache())
+    chunks = make_chunks("alpha", "beta")
+
+    first, second = await asyncio.gather(
+        service.generate_answer("q", chunks),
+        service.generate_answer("q", make_chunks("alpha", "beta")),
+    )
+    assert client.calls == 1
+    assert [first["cached"], second["cached"]].count(True) == 1
+    assert second["answer"] == first["answer"] == "An answer."
+    assert second["tokens_used"] == 1100
+
+    repeat = await service.generate_answer("q", chunks)
+    assert repeat["cached"] and repeat["cost_usd"] == 0.0
+    assert client.calls == 1
+
+    # Different chunk order is a different prompt
+    await service.generate_answer("q", chunks[::-1])
+    assert client.calls == 2
+
+
+async def test_sampling_and_failures_are_not_cached():
+    """Test that temperature > 0 always calls the API and errors are retried."""
+    client = FakeChatClient()
+    cache = GenerationCache()
+    service = make_service(client, cache)
+    chunks = make_chunks("alpha")
+
+    await service.generate_answer("q", chunks, temperature=0.7)
+    result = await service.generate_answer("q", chunks, temperature=0.7)
+    assert client.calls == 2 and not result["cached"]
+
+    client.fail = True
+    result = await service.generate_answer("q", chunks)
+    assert "error" in result
+    client.fail = False
+    result = await service.generate_answer("q", chunks)
+    assert not result["cached"] and result["cost_usd"] > 0
+    assert len(cache._pending) == 1
@@ -0,0 +1,162 @@
+"""Tests for LLM judge verdict caching and listwise judging."""
+
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.evaluation.judge_cache import JudgeVerdictCache
+from app.core.evaluation.llm_evaluator import LLMJudgeEvaluator
+from app.models.chunk import Chunk
+
+
+class FakeJudgeClient:
+    """Chat client returning a fixed verdict and recording the judged prompts."""
+
+    def __init__(self, fail_on: str | None = None, listwise_scores=None, pointwise_verdict=None):
+        self.prompts = []
+        self.fail_on = fail_on
+        self.listwise_scores = listwise_scores
+        self.pointwise_verdict = pointwise_verdict or {"score": 4, "reasoning": "relevant", "key_points": []}
+
+    async def create_chat_completion(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("judge unavailable")
+        if "Retrieved Chunks" in prompt:
+            num_chunks = len(re.findall(r"\*\*\[\d+\]\*\*", prompt))
+            scores = self.listwise_scores or [3] * num_chunks
+            content = json.dumps({"scores": [
+                {"index": index, "score": score, "reasoning": "listwise"}
+                for index, score in enumerate(scores[:num_chunks], start=1)
+            ]})
+        else:
+            content = json.dumps(self.pointwise_verdict)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=0, total_tokens=1000),
+        )
+
+
+def make_evaluator(client, verdicts):
+    evaluator = LLMJudgeEvaluator(api_key="test-key", verdicts=verdicts)
+    evaluator.client = client
+    return evaluator
+
+
+def make_chunk(content):
+    return Chunk(id=uuid4(), content=content, chunk_index=0)
+
+
+async def test_overlapping_cells_judge_each_pair_once():
+    """Test that concurrent cells sharing (query, chunk text) pairs pay once per pair."""
+    client = FakeJudgeClient()
+    evaluator = make_evaluator(client, JudgeVerdictCache())
+    shared = make_chunk("shared text")
+    # Another config's chunk with identical text hits the same verdict
+    cell_a = [shared, make_chunk("only in a")]
+    cell_b = [make_chunk("shared text"), make_chunk("only in b")]
+
+    metrics_a, metrics_b = await asyncio.gather(
+        evaluator.evaluate("What is RAG?", cell_a, top_k=2),
+        evaluator.evaluate("  What is   RAG? ", cell_b, top_k=2),
+    )
+
+    assert len(client.prompts) == 3
+    assert metrics_a["llm_judge_cache_hits"] + metrics_b["llm_judge_cache_hits"] == 1
+    assert metrics_a["llm_eval_cost_usd"] + metrics_b["llm_eval_cost_usd"] == pytest.approx(3 * 0.0015)
+    assert metrics_b["llm_chunk_scores"] == [4, 4]
+    assert metrics_b["llm_chunk_evaluations"][0]["chunk_id"] == str(cell_b[0].id)
+
+
+async def test_new_verdicts_flush_and_failures_are_not_cached():
+    """Test that only successful judgements are handed to flush() and retried otherwise."""
+    client = FakeJudgeClient(fail_on="broken")
+    verdicts = JudgeVerdictCache()
+    evaluator = make_evaluator(client, verdicts)
+    chunks = [make_chunk("fine"), make_chunk("broken")]
+
+    metrics = await evaluator.evaluate("q", chunks, top_k=2)
+    assert metrics["llm_chunk_scores"] == [4, 0]
+    assert metrics["llm_judge_cache_misses"] == 2
+    assert len(verdicts._pending) == 1
+
+    await evaluator.evaluate("q", chunks, top_k=2)
+    assert len(client.prompts) == 3  # "fine" cached, "broken" retried
+
+
+@pytest.mark.parametrize("verdict", [{"reasoning": "no score"}, {"score": 7}, {"score": "high"}])
+async def test_invalid_pointwise_scores_are_not_cached(verdict):
+    """Test that a verdict without a 1-5 integer score is an error, not a cached 0."""
+    client = FakeJudgeClient(pointwise_verdict=verdict)
+    verdicts = JudgeVerdictCache()
+    evaluator = make_evaluator(client, verdicts)
+
+    metrics = await evaluator.evaluate("q", [make_chunk("a")], top_k=1)
+
+    assert "error" in metrics["llm_chunk_evaluations"][0]
+    assert not verdicts._pending
+
+    await evaluator.evaluate("q", [make_chunk("a")], top_k=1)
+    assert len(client.prompts) == 2
+
+
+def test_verdict_key_covers_only_what_the_judge_sees():
+    """Test that the key ignores text beyond the prompt truncation and spacing in the query."""
+    prefix = "a" * LLMJudgeEvaluator.MAX_CHUNK_CHARS
+    key = LLMJudgeEvaluator.verdict_key("q  x", prefix + "tail one", "gpt-4o-mini")
+
+    assert key == LLMJudgeEvaluator.verdict_key(" q x", prefix + "tail two", "gpt-4o-mini")
+    assert key != LLMJudgeEvaluator.verdict_key("Q x", prefix, "gpt-4o-mini")
+    assert key != LLMJudgeEvaluator.verdict_key("q x", prefix, "gpt-4o")
+
+
+async def test_listwise_mode_scores_uncached_chunks_in_one_request():
+    """Test that listwise mode makes one call per cell and reuses its verdicts."""
+    client = FakeJudgeClient(listwise_scores=[5, 1, 3])
+    evaluator = make_evaluator(client, JudgeVerdictCache())
+    chunks = [make_chunk(f"chunk {i}") for i in range(3)]
+
+    metrics = await evaluator.evaluate("q", chunks, top_k=3, mode="listwise")
+    assert len(client.prompts) == 1
+    assert metrics["llm_chunk_scores"] == [5, 1, 3]
+    assert metrics["llm_judge_calls"] == 1
+    assert metrics["llm_eval_cost_usd"] == pytest.approx(0.0015)
+
+    # Only the new chunk is sent in the next request
+    client.listwise_scores = [2]
+    metrics = await evaluator.evaluate("q", [chunks[2], make_chunk("new")], top_k=2, mode="listwise")
+    assert len(client.prompts) == 2
+    assert "chunk 2" not in client.prompts[-1]
+    assert metrics["llm_chunk_scores"] == [3, 2]
+    assert metrics["llm_judge_cache_hits"] == 1
+
+
+async def test_listwise_parse_failure_falls_back_to_pointwise():
+    """Test that an incomplete listwise response is retried per chunk and still billed."""
+    client = FakeJudgeClient(listwise_scores=[5])  # Second chunk missing
+    evaluator = make_evaluator(client, JudgeVerdictCache())
+    chunks = [make_chunk("a"), make_chunk("b")]
+
+    metrics = await evaluator.evaluate("q", chunks, top_k=2, mode="listwise")
+
+    assert metrics["llm_chunk_scores"] == [4, 4]
+    assert metrics["llm_judge_calls"] == 3
+    assert metrics["llm_eval_cost_usd"] == pytest.approx(3 * 0.0015)
+
+
+async def test_listwise_non_integer_scores_fall_back_to_pointwise():
+    """Test that fractional or boolean listwise scores are rejected like pointwise ones."""
+    client = FakeJudgeClient(listwise_scores=[3.7, True])
+    evaluator = make_evaluator(client, JudgeVerdictCache())
+    chunks = [make_chunk("a"), make_chunk("b")]
+
+    metrics = await evaluator.evaluate("q", chunks, top_k=2, mode="listwise")
+
+    assert metrics["llm_chunk_scores"] == [4, 4]
+    assert metrics["llm_judge_calls"] == 3
@@ -0,0 +1,128 @@
+"""Tests for the shared rate-limited OpenAI client."""
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.core import openai_client
+from app.core.openai_client import RateLimitedOpenAI, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sleeps instead of waiting; each sleep advances no real time."""
+    recorded = []
+
+    async def fake_sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr(openai_client.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def rate_limit_error(headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_token_bucket_waits_for_refill():
+    """Test that reservations beyond capacity wait for the refill."""
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=60, clock=clock)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(30) == pytest.approx(30.0)
+
+    clock.now = 30.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_token_bucket_refund_is_capped():
+    """Test that refunds never exceed capacity."""
+    bucket = TokenBucket(per_minute=100, clock=FakeClock())
+
+    bucket.reserve(50)
+    bucket.refund(500)
+
+    assert bucket.available == 100
+
+
+async def test_call_retries_rate_limits_honoring_retry_after(sleeps):
+    """Test that 429s are retried after the server-requested delay."""
+    client = RateLimitedOpenAI(api_key="test-key", max_retries=3, clock=FakeClock())
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise rate_limit_error({"retry-after": "2"})
+        return "ok"
+
+    assert await client.call("gpt-4o-mini", 10, request) == "ok"
+    assert len(attempts) == 3
+    assert len(sleeps) >= 2
+    assert all(seconds >= 2.0 for seconds in sleeps)
+
+
+async def test_call_gives_up_after_max_retries(sleeps):
+    """Test that the last error surfaces once retries are exhausted."""
+    client = RateLimitedOpenAI(api_key="test-key", max_retries=2, clock=FakeClock())
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        raise rate_limit_error()
+
+    with pytest.raises(RateLimitError):
+        await client.call("gpt-4o-mini", 10, request)
+    assert len(attempts) == 3
+
+
+async def test_failed_attempts_refund_their_token_reservation(sleeps):
+    """Test that retried 429s don't drain the token budget of other callers."""
+    client = RateLimitedOpenAI(
+        api_key="test-key",
+        max_retries=3,
+        rate_limits={"tiny-model": {"rpm": 100, "tpm": 1000}},
+        clock=FakeClock(),
+    )
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        if len(attempts) < 4:
+            raise rate_limit_error()
+        return "ok"
+
+    assert await client.call("tiny-model", 400, request) == "ok"
+    # Only the successful attempt's reservation is held (no usage reported)
+    assert client.limiter_for("tiny-model").tokens.available == pytest.approx(600)
+
+
+async def test_call_waits_when_request_budget_is_spent(sleeps):
+    """Test that calls beyond the per-model RPM budget are delayed."""
+    client = RateLimitedOpenAI(
+        api_key="test-key",
+        rate_limits={"tiny-model": {"rpm": 2, "tpm": 1000}},
+        clock=FakeClock(),
+    )
+
+    async def request():
+        return "ok"
+
+    for _ in range(3):
+        await client.call("tiny-model", 1, request)
+
+    # Third request waits for one request's worth of refill (30s at 2 RPM)
+    assert sleeps == [pytest.approx(30.0)]
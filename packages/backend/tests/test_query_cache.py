@@ -0,0 +1,86 @@
+"""Tests for the query-time result cache."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core.query_cache import QueryResultCache, normalize_query_text
+
+
+def test_normalize_query_text_collapses_whitespace_only():
+    """Test that normalization keeps case but ignores spacing."""
+    assert normalize_query_text("  What is\n  RAG? ") == "What is RAG?"
+    assert normalize_query_text(None) is None
+
+
+async def test_concurrent_requests_share_one_computation():
+    """Test single-flight coalescing and subsequent cache hits."""
+    cache = QueryResultCache(max_entries=10, ttl_seconds=60)
+    config_id = uuid4()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return "result"
+
+    results = await asyncio.gather(*[
+        cache.get_or_compute(config_id, (0, 0), ("q", 5), compute) for _ in range(5)
+    ])
+    assert calls == 1
+    assert [value for value, _ in results] == ["result"] * 5
+    assert sum(not hit for _, hit in results) == 1
+
+    assert await cache.get_or_compute(config_id, (0, 0), ("q", 5), compute) == ("result", True)
+    assert calls == 1
+
+
+async def test_ttl_expiry_and_lru_eviction():
+    """Test that entries expire after the TTL and the oldest is evicted first."""
+    now = [0.0]
+    cache = QueryResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    config_id = uuid4()
+
+    async def compute_value(value):
+        return value
+
+    await cache.get_or_compute(config_id, (0, 0), "a", lambda: compute_value(1))
+    await cache.get_or_compute(config_id, (0, 0), "b", lambda: compute_value(2))
+    await cache.get_or_compute(config_id, (0, 0), "a", lambda: compute_value(99))  # touch a
+    await cache.get_or_compute(config_id, (0, 0), "c", lambda: compute_value(3))  # evicts b
+
+    assert await cache.get_or_compute(config_id, (0, 0), "a", lambda: compute_value(99)) == (1, True)
+    assert await cache.get_or_compute(config_id, (0, 0), "b", lambda: compute_value(20)) == (20, False)
+
+    now[0] = 11.0
+    assert await cache.get_or_compute(config_id, (0, 0), "b", lambda: compute_value(21)) == (21, False)
+
+
+async def test_version_change_and_errors():
+    """Test that a new config version misses the cache and failures aren't cached."""
+    cache = QueryResultCache(max_entries=10, ttl_seconds=60)
+    config_id = uuid4()
+    other_config_id = uuid4()
+
+    async def compute_value(value):
+        return value
+
+    await cache.get_or_compute(config_id, (0, 0), "q", lambda: compute_value(1))
+    await cache.get_or_compute(other_config_id, (0, 0), "q", lambda: compute_value(1))
+    # Another process edited config_id's settings
+    assert await cache.get_or_compute(config_id, (0, 1), "q", lambda: compute_value(2)) == (2, False)
+    assert await cache.get_or_compute(config_id, (0, 1), "q", lambda: compute_value(3)) == (2, True)
+    assert await cache.get_or_compute(other_config_id, (0, 0), "q", lambda: compute_value(2)) == (1, True)
+
+    # Local invalidation only frees memory early
+    cache.invalidate(config_id)
+    assert await cache.get_or_compute(config_id, (0, 1), "q", lambda: compute_value(4)) == (4, False)
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_compute(config_id, (0, 1), "s", fail)
+    assert await cache.get_or_compute(config_id, (0, 1), "s", lambda: compute_value(5)) == (5, False)
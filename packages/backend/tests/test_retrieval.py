@@ -2,9 +2,10 @@
 
 import pytest
 from uuid import uuid4
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.retrieval import RetrievalService
+from app.core.retrieval import RetrievalService, RetrievedChunk, fuse_rrf
 from app.models.chunk import Chunk
 from app.models.config import Config
 from app.models.document import Document
@@ -70,6 +71,8 @@ async def test_chunks(
             content="Machine learning is a subset of artificial intelligence",
             embedding=[0.1] * 1536,  # 1536-dim vector for ada-002
             chunk_index=0,
+            embedding_model="text-embedding-ada-002",
+            embedding_dim=1536,
             chunk_metadata={"embedding_model": "text-embedding-ada-002", "embedding_dim": 1536},
         ),
         Chunk(
@@ -78,6 +81,8 @@ async def test_chunks(
             content="Deep learning uses neural networks with multiple layers",
             embedding=[0.2] * 1536,
             chunk_index=1,
+            embedding_model="text-embedding-ada-002",
+            embedding_dim=1536,
             chunk_metadata={"embedding_model": "text-embedding-ada-002", "embedding_dim": 1536},
         ),
         Chunk(
@@ -86,6 +91,8 @@ async def test_chunks(
             content="Natural language processing helps computers understand text",
             embedding=[0.3] * 1536,
             chunk_index=2,
+            embedding_model="text-embedding-ada-002",
+            embedding_dim=1536,
             chunk_metadata={"embedding_model": "text-embedding-ada-002", "embedding_dim": 1536},
         ),
     ]
@@ -119,7 +126,8 @@ async def test_search_dense(
     )
 
     assert len(results) == 2
-    assert all(isinstance(chunk, Chunk) for chunk in results)
+    assert all(isinstance(item.chunk, Chunk) for item in results)
+    assert [item.rank for item in results] == list(range(1, len(results) + 1))
 
 
 @pytest.mark.asyncio
@@ -140,7 +148,8 @@ async def test_search_bm25(
 
     # Should find the chunk about deep learning
     assert len(results) >= 1
-    assert any("neural networks" in chunk.content for chunk in results)
+    assert any("neural networks" in item.chunk.content for item in results)
+    assert all(item.score > 0 for item in results)
 
 
 @pytest.mark.asyncio
@@ -183,7 +192,55 @@ async def test_search_hybrid(
     )
 
     assert len(results) <= 2
-    assert all(isinstance(chunk, Chunk) for chunk in results)
+    assert all(isinstance(item.chunk, Chunk) for item in results)
+    assert [item.rank for item in results] == list(range(1, len(results) + 1))
+
+
+@pytest.mark.asyncio
+async def test_search_dense_batch(
+    db_session: AsyncSession,
+    test_config: Config,
+    test_chunks: list[Chunk],
+):
+    """Test that batched dense search matches per-query search."""
+    retrieval_service = RetrievalService(db_session)
+
+    query_embeddings = [[0.15] * 1536, [0.3] * 1536]
+    batches = await retrieval_service.search_dense_batch(
+        query_embeddings=query_embeddings,
+        config_id=test_config.id,
+        top_k=2,
+    )
+
+    assert len(batches) == 2
+    for query_embedding, batch in zip(query_embeddings, batches):
+        single = await retrieval_service.search_dense(
+            query_embedding=query_embedding,
+            config_id=test_config.id,
+            top_k=2,
+        )
+        assert [item.chunk.id for item in batch] == [item.chunk.id for item in single]
+
+
+@pytest.mark.asyncio
+async def test_search_defers_embeddings_until_loaded(
+    db_session: AsyncSession,
+    test_config: Config,
+    test_chunks: list[Chunk],
+):
+    """Test that search results come without embeddings and load_embeddings fills them in."""
+    retrieval_service = RetrievalService(db_session)
+    db_session.expunge_all()
+
+    results = await retrieval_service.search_dense(
+        query_embedding=[0.15] * 1536,
+        config_id=test_config.id,
+        top_k=3,
+    )
+    assert all("embedding" in inspect(item.chunk).unloaded for item in results)
+
+    await retrieval_service.load_embeddings(item.chunk for item in results)
+    assert all(len(item.chunk.embedding) == 1536 for item in results)
 
 
 @pytest.mark.asyncio
@@ -221,4 +278,29 @@ async def test_search_dense_no_chunks(
             query_embedding=query_embedding,
             config_id=fake_config_id,
             top_k=5,
-        )
\ No newline at end of file
+        )
+
+
+def test_fuse_rrf_matches_hybrid_ordering():
+    """In-memory RRF weights ranks, breaks ties by dense rank and truncates candidates."""
+    chunks = {name: Chunk(id=uuid4(), content=name, chunk_index=i) for i, name in enumerate("abcd")}
+
+    def ranked(*names):
+        return [RetrievedChunk(chunk=chunks[n], score=0.0, rank=r) for r, n in enumerate(names, start=1)]
+
+    dense = ranked("a", "b", "c")
+    sparse = ranked("b", "d")
+
+    fused = fuse_rrf(dense, sparse, top_k=3)
+    # b is found by both methods; a (dense rank 1) outscores d (sparse rank 2)
+    assert [item.chunk.content for item in fused] == ["b", "a", "d"]
+    assert [item.rank for item in fused] == [1, 2, 3]
+    assert [(item.dense_rank, item.sparse_rank) for item in fused] == [(2, 1), (1, None), (None, 2)]
+    assert fused[0].score == pytest.approx(0.5 / 62 + 0.5 / 61)
+
+    # Sparse-only weighting puts the sparse list first, dense-only chunks last
+    fused = fuse_rrf(dense, sparse, top_k=4, dense_weight=0.0, sparse_weight=1.0)
+    assert [item.chunk.content for item in fused][:2] == ["b", "d"]
+
+    # top_k=1 fuses only the top 3 candidates of each list
+    assert len(fuse_rrf(dense, sparse, top_k=1)) == 1
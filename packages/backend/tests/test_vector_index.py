@@ -0,0 +1,90 @@
+"""Tests for the in-memory vector index."""
+
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.vector_index import VectorIndex, VectorIndexRegistry
+
+
+def build_index(embeddings):
+    """Build an index over the given embeddings with generated chunk data."""
+    n = len(embeddings)
+    return VectorIndex(
+        chunk_ids=[uuid4() for _ in range(n)],
+        document_ids=[uuid4()] * n,
+        chunk_indexes=list(range(n)),
+        contents=[f"chunk {i}" for i in range(n)],
+        embeddings=embeddings,
+        config_id=uuid4(),
+    )
+
+
+def test_top_k_matches_brute_force():
+    """Test that argpartition top-k matches a full sort."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(500, 32))
+    query = rng.normal(size=32)
+    index = build_index(embeddings)
+
+    results = index.top_k(query, 10)
+
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+    assert [row for row, _ in results] == list(expected)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_returns_ranked_chunks_with_cosine_scores():
+    """Test that search returns detached chunks with similarity and rank."""
+    index = build_index([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+
+    results = index.search([0.0, 1.0], top_k=2)
+
+    assert [item.chunk.content for item in results] == ["chunk 1", "chunk 2"]
+    assert [item.rank for item in results] == [1, 2]
+    assert results[0].score == pytest.approx(1.0)
+    assert results[1].score == pytest.approx(np.sqrt(0.5))
+
+
+def test_top_k_larger_than_index():
+    """Test that asking for more results than rows returns every row."""
+    index = build_index([[1.0, 0.0], [0.0, 1.0]])
+
+    assert len(index.top_k([1.0, 0.0], 5)) == 2
+    assert build_index(np.empty((0, 2))).top_k([1.0, 0.0], 5) == []
+
+
+async def test_registry_reloads_when_config_version_changes(monkeypatch):
+    """Test that indexes are cached per config until its persisted version changes."""
+    registry = VectorIndexRegistry(max_bytes=10**9)
+    loads = []
+
+    async def fake_load(db, config_id, dim, version):
+        loads.append(version)
+        await asyncio.sleep(0)
+        index = build_index([[1.0, 0.0]])
+        index.version = version
+        return index
+
+    monkeypatch.setattr(registry, "_load", fake_load)
+    config_id = uuid4()
+
+    first, second = await asyncio.gather(
+        registry.get(None, config_id, 2, 0), registry.get(None, config_id, 2, 0)
+    )
+    assert first is second
+    assert loads == [0]
+
+    # Another process changed the chunks and bumped the version
+    reloaded = await registry.get(None, config_id, 2, 1)
+    assert reloaded is not first
+    assert loads == [0, 1]
+    assert await registry.get(None, config_id, 2, 1) is reloaded
+
+    # A late lookup at the old version is served the newer index
+    assert await registry.get(None, config_id, 2, 0) is reloaded
+    assert loads == [0, 1]
@@ -146,6 +146,12 @@ export default function AnswerComparisonView({ configs, className }: Props) {
                                 ${result.generation_cost_usd.toFixed(4)}
                               </Badge>
                             )}
+
+                            {result.generation_cached && (
+                              <Badge variant="outline" className="text-xs">
+                                Cached answer
+                              </Badge>
+                            )}
                           </div>
                         )}
                       </div>
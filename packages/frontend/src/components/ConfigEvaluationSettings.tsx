@@ -1,4 +1,5 @@
 import { Alert, AlertDescription } from '@/components/ui/alert'
+import { Input } from '@/components/ui/input'
 import { Label } from '@/components/ui/label'
 import { Switch } from '@/components/ui/switch'
 import {
@@ -91,6 +92,28 @@ export default function ConfigEvaluationSettings({
                 </SelectContent>
               </Select>
 
+              <Label htmlFor="llm-mode" className="text-sm">
+                Judging
+              </Label>
+              <Select
+                value={settings.llm_judge_mode || 'pointwise'}
+                onValueChange={(value) =>
+                  onChange({ ...settings, llm_judge_mode: value as 'pointwise' | 'listwise' })
+                }
+              >
+                <SelectTrigger id="llm-mode">
+                  <SelectValue />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="pointwise">
+                    Per chunk - one request per retrieved chunk
+                  </SelectItem>
+                  <SelectItem value="listwise">
+                    Listwise - all chunks in one request (cheaper)
+                  </SelectItem>
+                </SelectContent>
+              </Select>
+
               <p className="text-xs text-muted-foreground mt-2">
                 Uses GPT to rate chunk relevance on 1-5 scale. Works without ground truth.
               </p>
@@ -146,6 +169,29 @@ export default function ConfigEvaluationSettings({
                 </Select>
               </div>
 
+              <div className="space-y-2">
+                <Label htmlFor="gen-context-budget" className="text-sm">
+                  Context token budget
+                </Label>
+                <Input
+                  id="gen-context-budget"
+                  type="number"
+                  min={256}
+                  step={256}
+                  placeholder="4000"
+                  value={generationSettings.context_token_budget ?? ''}
+                  onChange={(e) =>
+                    onGenerationChange({
+                      ...generationSettings,
+                      context_token_budget: e.target.value ? Number(e.target.value) : undefined,
+                    })
+                  }
+                />
+                <p className="text-xs text-muted-foreground">
+                  Retrieved chunks beyond this many tokens are truncated or dropped (lowest-ranked first).
+                </p>
+              </div>
+
               <Alert className="bg-purple-50 dark:bg-purple-950 border-purple-200 dark:border-purple-800">
                 <Info className="h-4 w-4" />
                 <AlertDescription className="text-xs">
@@ -220,6 +220,7 @@ export default function CreateConfigModal({
                   <SelectItem value="dense">Dense (Vector Similarity)</SelectItem>
                   <SelectItem value="hybrid">Hybrid (Dense + BM25)</SelectItem>
                   <SelectItem value="bm25">BM25 (Keyword)</SelectItem>
+                  <SelectItem value="okapi_bm25">Okapi BM25 (Keyword, IDF-weighted)</SelectItem>
                 </SelectContent>
               </Select>
             </div>
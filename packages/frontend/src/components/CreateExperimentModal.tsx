@@ -120,6 +120,7 @@ export default function CreateExperimentModal({
       chunks_per_query: Math.round(avgTopK),
       use_llm_judge: true,
       llm_judge_model: firstLLMConfig.evaluation_settings?.llm_judge_model || 'gpt-3.5-turbo',
+      llm_judge_mode: firstLLMConfig.evaluation_settings?.llm_judge_mode || 'pointwise',
     }
   }, [selectedConfigs, selectedQueries, configs])
 
@@ -1,6 +1,11 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import apiClient from '@/api/client'
-import type { Experiment, ExperimentCreate, ExperimentResults } from '@/types/api'
+import type {
+  Experiment,
+  ExperimentCreate,
+  ExperimentProgress,
+  ExperimentResults,
+} from '@/types/api'
 
 export function useExperiments(projectId: string | undefined) {
   return useQuery({
@@ -12,6 +17,13 @@ export function useExperiments(projectId: string | undefined) {
       return response.data
     },
     enabled: !!projectId,
+    refetchInterval: (query) => {
+      // Experiments run in the background; poll while any are in flight
+      const experiments = query.state.data
+      return experiments?.some((e) => e.status === 'pending' || e.status === 'running')
+        ? 3000
+        : false
+    },
   })
 }
 
@@ -62,3 +74,22 @@ export function useExperimentResults(experimentId: string | undefined) {
     },
   })
 }
+
+export function useExperimentProgress(experimentId: string | undefined) {
+  return useQuery({
+    queryKey: ['experiment-progress', experimentId],
+    queryFn: async () => {
+      const response = await apiClient.get<ExperimentProgress>(
+        `/api/experiments/${experimentId}/progress`
+      )
+      return response.data
+    },
+    enabled: !!experimentId,
+    refetchInterval: (query) => {
+      const progress = query.state.data
+      return progress && (progress.status === 'pending' || progress.status === 'running')
+        ? 2000
+        : false
+    },
+  })
+}
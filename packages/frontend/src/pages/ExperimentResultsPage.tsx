@@ -96,6 +96,12 @@ export default function ExperimentResultsPage() {
                 Results update automatically...
               </span>
             )}
+            {results?.llm_judge_cache && (
+              <span className="text-sm text-muted-foreground">
+                LLM judge cache: {(results.llm_judge_cache.hit_rate * 100).toFixed(0)}% hits
+                ({results.llm_judge_cache.hits}/{results.llm_judge_cache.hits + results.llm_judge_cache.misses} verdicts)
+              </span>
+            )}
           </div>
         </div>
 
@@ -194,6 +200,18 @@ export default function ExperimentResultsPage() {
                             Avg Score: {config.avg_score?.toFixed(3) || 'N/A'} • Avg Latency:{' '}
                             {config.avg_latency_ms}ms
                           </CardDescription>
+                          {config.timings && Object.keys(config.timings).length > 0 && (
+                            <p className="text-xs text-muted-foreground mt-1">
+                              {Object.entries(config.timings)
+                                .map(
+                                  ([stage, stats]) =>
+                                    stats.amortized || stats.p50_ms === null || stats.p95_ms === null
+                                      ? `${stage.replace(/_/g, ' ')}: mean ${stats.mean_ms.toFixed(0)}ms (amortized)`
+                                      : `${stage.replace(/_/g, ' ')}: p50 ${stats.p50_ms.toFixed(0)}ms / p95 ${stats.p95_ms.toFixed(0)}ms`
+                                )
+                                .join(' • ')}
+                            </p>
+                          )}
                         </div>
                       </div>
 
@@ -320,7 +338,13 @@ function QueryResultRow({ result, projectId, experimentId }: { result: any; proj
             ? result.score.toFixed(3)
             : 'N/A'}
         </TableCell>
-        <TableCell>{result.latency_ms}ms</TableCell>
+        <TableCell
+          title={Object.entries(result.timings ?? {})
+            .map(([stage, ms]) => `${stage.replace(/_/g, ' ')}: ${ms.toFixed(1)}ms`)
+            .join('\n')}
+        >
+          {result.latency_ms}ms
+        </TableCell>
         <TableCell>{result.chunks.length}</TableCell>
         <TableCell>
           {result.evaluation_cost_usd ? `$${result.evaluation_cost_usd.toFixed(4)}` : '-'}
@@ -47,6 +47,7 @@ interface QueryTimeResult {
     chunk_strategy: string
     chunk_size: number
   }
+  cached?: boolean
 }
 
 interface RunComparison extends QueryTimeResult {
@@ -370,7 +371,9 @@ export default function QueryTimeExperimenterPage() {
             <Card>
               <CardHeader>
                 <CardTitle>Results</CardTitle>
-                <CardDescription>{currentResult.latency_ms}ms</CardDescription>
+                <CardDescription>
+                  {currentResult.latency_ms}ms{currentResult.cached ? ' (cached)' : ''}
+                </CardDescription>
               </CardHeader>
               <CardContent className="space-y-4">
                 {/* Metrics */}
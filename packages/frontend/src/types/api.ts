@@ -44,6 +44,7 @@ export interface DocumentListResponse {
 export interface EvaluationSettings {
   use_llm_judge?: boolean
   llm_judge_model?: string
+  llm_judge_mode?: 'pointwise' | 'listwise'
   use_ragas?: boolean
 }
 
@@ -52,6 +53,7 @@ export interface GenerationSettings {
   model?: string
   temperature?: number
   max_tokens?: number
+  context_token_budget?: number  // Max retrieved-chunk tokens in the prompt
 }
 
 export interface Config {
@@ -62,7 +64,7 @@ export interface Config {
   chunk_size?: number
   chunk_overlap?: number
   embedding_model: string
-  retrieval_strategy: 'dense' | 'hybrid' | 'bm25'
+  retrieval_strategy: 'dense' | 'hybrid' | 'bm25' | 'okapi_bm25'
   top_k: number
   settings?: Record<string, any>
   evaluation_settings?: EvaluationSettings
@@ -125,11 +127,23 @@ export interface Experiment {
   query_ids: string[]
   status: 'pending' | 'running' | 'completed' | 'failed'
   error_message?: string
+  progress_done: number
+  progress_total: number
   created_at: string
   started_at?: string
   completed_at?: string
 }
 
+export interface ExperimentProgress {
+  experiment_id: string
+  status: 'pending' | 'running' | 'completed' | 'failed'
+  done: number
+  total: number
+  percent: number
+  elapsed_seconds?: number
+  eta_seconds?: number
+}
+
 export interface ExperimentCreate {
   name?: string
   config_ids: string[]
@@ -140,6 +154,7 @@ export interface ChunkResult {
   id: string
   content: string
   score?: number
+  rank?: number
 }
 
 export interface Hallucination {
@@ -175,6 +190,17 @@ export interface AnswerMetrics {
   prompt_tokens?: number
   completion_tokens?: number
   prompt_sent?: string  // Full prompt sent to LLM
+  context_packing?: ContextPackingStats
+}
+
+export interface ContextPackingStats {
+  packed_chunks: number
+  packed_tokens: number
+  dropped_tokens: number
+  deduplicated_tokens: number
+  dropped_chunks: number
+  truncated_chunks: number
+  token_budget: number
 }
 
 export interface QueryResult {
@@ -184,19 +210,33 @@ export interface QueryResult {
   chunks: ChunkResult[]
   score?: number
   latency_ms?: number
+  // Wall time in ms per pipeline stage (query_embedding, retrieval, ir_evaluation, llm_judge, ...)
+  timings?: Record<string, number> | null
   metrics?: EvaluationMetrics
   evaluation_cost_usd?: number
   // Answer generation fields
   generated_answer?: string
   generation_cost_usd?: number
+  generation_cached?: boolean | null
   answer_metrics?: AnswerMetrics
 }
 
+export interface StageTimingStats {
+  count: number
+  mean_ms: number
+  // Timed per batch and split evenly across its queries: no percentiles
+  amortized: boolean
+  p50_ms: number | null
+  p95_ms: number | null
+  p99_ms: number | null
+}
+
 export interface ConfigResult {
   config_id: string
   config_name: string
   avg_score?: number
   avg_latency_ms?: number
+  timings?: Record<string, StageTimingStats>
   results: QueryResult[]
 }
 
@@ -209,6 +249,8 @@ export interface BasicMetrics {
   'hit_rate@5'?: number
   diversity?: number
   avg_chunk_length?: number
+  // Other EVALUATION_CUTOFFS, e.g. 'ndcg@10', 'recall@1'
+  [metric: string]: number | undefined
 }
 
 export interface LLMJudgeMetrics {
@@ -222,9 +264,14 @@ export interface LLMJudgeMetrics {
     score: number
     reasoning: string
     key_points?: string[]
+    cached?: boolean
   }>
   llm_judge_model?: string
+  llm_judge_mode?: 'pointwise' | 'listwise'
+  llm_judge_calls?: number
   llm_eval_cost_usd?: number
+  llm_judge_cache_hits?: number
+  llm_judge_cache_misses?: number
 }
 
 export interface EvaluationMetrics {
@@ -237,6 +284,7 @@ export interface CostEstimateRequest {
   chunks_per_query?: number
   use_llm_judge?: boolean
   llm_judge_model?: string
+  llm_judge_mode?: 'pointwise' | 'listwise'
   use_ragas?: boolean
 }
 
@@ -246,9 +294,16 @@ export interface CostEstimateResponse {
   num_api_calls: number
 }
 
+export interface JudgeCacheStats {
+  hits: number
+  misses: number
+  hit_rate: number
+}
+
 export interface ExperimentResults {
   experiment_id: string
   configs: ConfigResult[]
+  llm_judge_cache?: JudgeCacheStats | null
 }
 
 export interface SettingsUpdate {